@@ -0,0 +1,47 @@
+"""Connection reuse across the Routes of a single Client.
+
+Registers N routes, sends requests round-robin across them against a
+local stub server, and reports how many TCP connections were opened and
+the mean latency per request.
+
+Usage:
+    python benchmarks/bench_connection_pool.py [routes] [rounds]
+"""
+import sys
+import time
+
+from inori import Client
+
+from stub import StubServer
+
+
+def run(routes: int = 200, rounds: int = 5) -> dict:
+    """Return connection count and per-request latency for N routes."""
+    with StubServer() as server:
+        client = Client(server.url)
+        nodes = [client.add_route(f'r{i}/items') for i in range(routes)]
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for node in nodes:
+                node.get()
+        elapsed = time.perf_counter() - start
+
+        total = routes * rounds
+        return {
+            'routes': routes,
+            'requests': total,
+            'connections': server.connections,
+            'latency_us': elapsed / total * 1e6,
+        }
+
+
+if __name__ == '__main__':
+    args = [int(i) for i in sys.argv[1:3]]
+    result = run(*args)
+    print(
+        '{routes} routes, {requests} requests: '
+        '{connections} connections, {latency_us:.1f} us/request'.format(
+            **result,
+        ),
+    )
@@ -0,0 +1,79 @@
+"""Cost of building the headers and kwargs of a request.
+
+Compares merging the Client and Route HeaderDicts on every request with
+the merge cached on the Route, for static headers only and with header
+functions.
+
+Usage:
+    python benchmarks/bench_header_merge.py [number]
+"""
+import sys
+import timeit
+from typing import Any, Callable, Dict
+
+from bench_overhead import build_client
+
+from inori import Client
+
+
+def merge_every_time(
+    client: Client, route: Any, metadata: Dict[str, Any],
+) -> Callable[[], Dict[str, Any]]:
+    """Build the headers and kwargs as they were before caching."""
+    def merge() -> Dict[str, Any]:
+        headers = {
+            **client.headers.run_functions(client, metadata),
+            **route._header_dict().run_functions(route, metadata),
+            **{},
+        }
+        return {'headers': headers, **{}, **client.request_kwargs}
+    return merge
+
+
+def merge_cached(
+    client: Client, route: Any, metadata: Dict[str, Any],
+) -> Callable[[], Dict[str, Any]]:
+    """Build the headers and kwargs through the Route's cached merge."""
+    def merge() -> Dict[str, Any]:
+        headers = route._merged().evaluate(client, route, metadata, {})
+        return route._request_kwargs({'headers': headers})
+    return merge
+
+
+def build(header_functions: int) -> Client:
+    """Create a Client with static headers and header functions."""
+    client = build_client(header_functions=header_functions)
+    for i in range(5):
+        client.headers[f'X-Static-{i}'] = 'value'
+    return client
+
+
+def run(number: int = 50000) -> Dict[str, float]:
+    """Return microseconds per operation."""
+    results = {}
+
+    for functions in (0, 2):
+        client = build(functions)
+        route = client.users(userId='1').orders(orderId='2')
+        route.headers['X-Route'] = 'value'
+
+        for name, factory in (
+            ('every request', merge_every_time),
+            ('cached', merge_cached),
+        ):
+            fn = factory(client, route, {})
+            elapsed = timeit.timeit(fn, number=number)
+            key = f'{functions} header functions, {name}_us'
+            results[key] = elapsed / number * 1e6
+
+        results[f'{functions} header functions, route.get_us'] = (
+            timeit.timeit(route.get, number=number // 5) / (number // 5) * 1e6
+        )
+
+    return results
+
+
+if __name__ == '__main__':
+    args = [int(i) for i in sys.argv[1:2]]
+    for name, value in run(*args).items():
+        print(f'{name:>44}: {value:>8.2f}')
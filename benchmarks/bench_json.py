@@ -0,0 +1,80 @@
+"""JSON decoding and encoding, by codec.
+
+Compares requests' Response.json() with inori.codec.decode_response()
+for each JSON library installed.
+
+Usage:
+    python benchmarks/bench_json.py [items] [number]
+"""
+import sys
+import timeit
+from typing import Any, Dict, List
+
+from inori.codec import JSONCodec, PREFERRED, decode_response, get_codec
+
+import requests
+
+
+def payload(items: int) -> List[Dict[str, Any]]:
+    """Build a list of records resembling an API listing."""
+    return [
+        {
+            'id': i,
+            'name': f'Item {i} é',
+            'tags': ['a', 'b', 'c'],
+            'price': i * 1.5,
+            'active': i % 2 == 0,
+        }
+        for i in range(items)
+    ]
+
+
+def response(content: bytes) -> requests.Response:
+    """Build a response holding a JSON body."""
+    rv = requests.Response()
+    rv.status_code = 200
+    rv._content = content
+    rv.encoding = 'utf-8'
+    return rv
+
+
+def time_codec(
+    codec: JSONCodec, content: bytes, data: Any, number: int,
+) -> Dict[str, float]:
+    """Return milliseconds per decode and encode."""
+    decode = timeit.timeit(
+        lambda: decode_response(response(content), codec), number=number,
+    )
+    encode = timeit.timeit(lambda: codec.encode(data), number=number)
+    return {
+        f'{codec.name} decode_ms': decode / number * 1e3,
+        f'{codec.name} encode_ms': encode / number * 1e3,
+    }
+
+
+def run(items: int = 5000, number: int = 20) -> Dict[str, float]:
+    """Return milliseconds per operation."""
+    data = payload(items)
+    content = get_codec('json').encode(data)
+
+    results = {
+        'Response.json()_ms': timeit.timeit(
+            lambda: response(content).json(), number=number,
+        ) / number * 1e3,
+    }
+
+    for name in PREFERRED:
+        try:
+            codec = get_codec(name)
+        except ImportError:
+            continue
+
+        results.update(time_codec(codec, content, data, number))
+
+    return results
+
+
+if __name__ == '__main__':
+    args = [int(i) for i in sys.argv[1:3]]
+    for name, value in run(*args).items():
+        print(f'{name:>24}: {value:>8.2f}')
@@ -0,0 +1,89 @@
+"""Per-request overhead of inori, excluding the network.
+
+Requests go to a session answering instantly with a canned response,
+so the figures are the time spent in inori itself.
+
+Usage:
+    python benchmarks/bench_overhead.py [number]
+"""
+import sys
+import timeit
+from typing import Dict, Optional
+
+from inori import Client
+from inori.profiling import Profiler
+
+import requests
+
+
+class NullSession:
+    """Session answering every request with the same response."""
+
+    def __init__(self):
+        self.response = requests.Response()
+        self.response.status_code = 200
+        self.response._content = b'{"ok": true}'
+
+    def request(self, *args, **kwargs):
+        """Return the canned response."""
+        return self.response
+
+
+def build_client(
+    header_functions: int = 0, profiler: Optional[Profiler] = None,
+) -> Client:
+    """Create a Client with a NullSession and header functions."""
+    client = Client('https://foo.com/v1/')
+    client._session = NullSession()
+    client.settings_.profiler = profiler
+    client.add_route('users/${userId}/orders/${orderId}')
+    client.headers['Accept'] = 'application/json'
+
+    for i in range(header_functions):
+        client.headers(f'X-Header-{i}')(lambda c, m: 'value')
+
+    return client
+
+
+def run(number: int = 20000) -> Dict[str, float]:
+    """Return microseconds per operation."""
+    session = NullSession()
+    client = build_client()
+    headers_client = build_client(header_functions=5)
+    route = client.users(userId='1').orders(orderId='2')
+    headers_route = headers_client.users(userId='1').orders(orderId='2')
+
+    profiled = {}
+    for sample_every in (1, 100):
+        profiled_client = build_client(profiler=Profiler(sample_every))
+        profiled[f'route.get, profiling 1 in {sample_every}'] = (
+            profiled_client.users(userId='1').orders(orderId='2').get
+        )
+
+    cases = {
+        'session.request': lambda: session.request('GET', 'url'),
+        'route.get': route.get,
+        'route.get + 5 header functions': headers_route.get,
+        'bind + route.get': (
+            lambda: client.users(userId='1').orders(orderId='2').get()
+        ),
+        'HeaderDict.run_functions (5)': (
+            lambda: headers_client.headers.run_functions(headers_client, {})
+        ),
+        **profiled,
+    }
+
+    results = {
+        f'{name}_us': timeit.timeit(fn, number=number) / number * 1e6
+        for name, fn in cases.items()
+    }
+    results['overhead_us'] = (
+        results['route.get_us'] - results['session.request_us']
+    )
+    return results
+
+
+if __name__ == '__main__':
+    args = [int(i) for i in sys.argv[1:2]]
+    for name, value in run(*args).items():
+        print(f'{name:>36}: {value:>8.2f}')
@@ -0,0 +1,74 @@
+"""Client.resolve() throughput against thousands of registered paths.
+
+The linear figures match every template's regex in turn, the approach
+Client.resolve() replaced.
+
+Usage:
+    python benchmarks/bench_resolve.py [resources] [number]
+"""
+import random
+import re
+import sys
+import timeit
+from typing import Dict
+
+from bench_route_registration import BASE_URI, synthetic_spec
+
+from inori import Client
+from inori.manifest import load_manifest
+
+
+def linear_matcher(paths):
+    """Compile one regex per template, matched one after the other."""
+    patterns = [
+        re.compile(re.sub(r'\\\$\\{(\w+)\\}', r'(?P<\1>[^/]+)', re.escape(p)))
+        for p in (path.lstrip('/') for path in paths)
+    ]
+
+    def match(path):
+        for pattern in patterns:
+            m = pattern.fullmatch(path)
+            if m:
+                return m.groupdict()
+        return None
+
+    return match
+
+
+def run(resources: int = 200, number: int = 20000) -> Dict[str, float]:
+    """Return URLs resolved per second."""
+    spec = synthetic_spec(resources)
+    client = Client.from_manifest(spec)
+    match = linear_matcher(load_manifest(spec).paths)
+
+    rng = random.Random(0)
+    urls = [
+        f'resource-{rng.randrange(resources)}/{i}/comments/{i}'
+        for i in range(1000)
+    ]
+    for url in urls:
+        client.resolve(url)
+
+    def resolve():
+        for url in urls:
+            client.resolve(BASE_URI + url)
+
+    def linear():
+        for url in urls[:100]:
+            match(url)
+
+    rounds = max(1, number // len(urls))
+    return {
+        f'resolve ({len(spec["paths"])} paths)': (
+            rounds * len(urls) / timeit.timeit(resolve, number=rounds)
+        ),
+        f'linear regex ({len(spec["paths"])} paths)': (
+            100 / timeit.timeit(linear, number=1)
+        ),
+    }
+
+
+if __name__ == '__main__':
+    args = [int(i) for i in sys.argv[1:3]]
+    for name, ops in run(*args).items():
+        print(f'{name:>30}: {ops:>12,.0f} urls/s')
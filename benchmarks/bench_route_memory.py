@@ -0,0 +1,58 @@
+"""Memory held by Route and Client objects.
+
+Usage:
+    python benchmarks/bench_route_memory.py [resources]
+"""
+import sys
+import tracemalloc
+from typing import Dict
+
+from bench_route_registration import BASE_URI, synthetic_spec
+
+from inori import Client
+from inori.manifest import load_manifest
+
+
+def count_routes(route) -> int:
+    """Count a Route and every Route below it."""
+    return 1 + sum(
+        count_routes(child)
+        for child in (*route.callables.values(), *route.children.values())
+    )
+
+
+def run(resources: int = 1000) -> Dict[str, float]:
+    """Return the bytes allocated per Route, bound view and Client."""
+    paths = load_manifest(synthetic_spec(resources)).paths
+    client = Client(BASE_URI)
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    for path in paths:
+        client.add_route(path)
+    after, _ = tracemalloc.get_traced_memory()
+
+    routes = sum(
+        count_routes(getattr(client, f'resource_{i}'))
+        for i in range(resources)
+    )
+
+    views = [client.resource_0(id=str(i)) for i in range(10000)]
+    bound, _ = tracemalloc.get_traced_memory()
+
+    clients = [Client(BASE_URI) for _ in range(1000)]
+    empty, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'routes': routes,
+        'bytes per Route': (after - before) / routes,
+        'bytes per bound view': (bound - after) / len(views),
+        'bytes per empty Client': (empty - bound) / len(clients),
+    }
+
+
+if __name__ == '__main__':
+    args = [int(i) for i in sys.argv[1:2]]
+    for name, value in run(*args).items():
+        print(f'{name:>22}: {value:>10,.0f}')
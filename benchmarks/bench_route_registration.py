@@ -0,0 +1,87 @@
+"""Client construction time and memory for a large OpenAPI spec.
+
+Compares creating every Route with Client.add_route() against
+Client.from_manifest(), which only creates Routes when they are used.
+
+Usage:
+    python benchmarks/bench_route_registration.py [resources]
+"""
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict
+
+from inori import Client
+from inori.manifest import load_manifest
+
+BASE_URI = 'https://foo.com/v1/'
+
+
+def synthetic_spec(resources: int = 200) -> Dict[str, Any]:
+    """Build an OpenAPI spec with 10 paths per resource."""
+    paths = {}
+    for i in range(resources):
+        base = f'/resource-{i}'
+        for path in (
+            base,
+            f'{base}/search',
+            f'{base}/{{id}}',
+            f'{base}/{{id}}/history',
+            f'{base}/{{id}}/owners',
+            f'{base}/{{id}}/owners/{{ownerId}}',
+            f'{base}/{{id}}/tags',
+            f'{base}/{{id}}/tags/{{tag}}',
+            f'{base}/{{id}}/comments',
+            f'{base}/{{id}}/comments/{{commentId}}',
+        ):
+            paths[path] = {'get': {}}
+
+    return {'openapi': '3.0.0', 'servers': [{'url': BASE_URI}], 'paths': paths}
+
+
+def measure(build: Callable[[], Any]) -> Dict[str, float]:
+    """Time a build, and the memory still held by its result."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del result
+    return {'seconds': elapsed, 'bytes': current}
+
+
+def run(resources: int = 200) -> Dict[str, Dict[str, float]]:
+    """Measure eager and lazy construction."""
+    spec = synthetic_spec(resources)
+    paths = load_manifest(spec).paths
+
+    def eager():
+        client = Client(BASE_URI)
+        for path in paths:
+            client.add_route(path)
+        return client
+
+    def lazy():
+        return Client.from_manifest(spec)
+
+    def lazy_one_route():
+        client = Client.from_manifest(spec)
+        client.resource_0(id='1').comments(commentId='2')
+        return client
+
+    return {
+        'add_route': measure(eager),
+        'from_manifest': measure(lazy),
+        'from_manifest + 1 route used': measure(lazy_one_route),
+    }
+
+
+if __name__ == '__main__':
+    args = [int(i) for i in sys.argv[1:2]]
+    for name, result in run(*args).items():
+        print(
+            f'{name:>30}: {result["seconds"] * 1000:>8.1f} ms '
+            f'{result["bytes"] / 1024:>10,.0f} KiB',
+        )
@@ -0,0 +1,45 @@
+"""StringTemplate render and partial-format throughput.
+
+The string.Template figures use the approach StringTemplate replaced:
+safe_substitute followed by building a new Template from the result.
+
+Usage:
+    python benchmarks/bench_string_template.py [number]
+"""
+import string
+import sys
+import timeit
+
+from inori.utils.string_template import StringTemplate
+
+URL = 'https://foo.com/v1/users/${userId}/orders/${orderId}/items'
+
+
+def run(number: int = 100000) -> dict:
+    """Return operations per second for each operation."""
+    template = StringTemplate(URL)
+    bound = template.partial(userId='1', orderId='2')
+    legacy = string.Template(URL)
+
+    def legacy_partial():
+        string.Template(legacy.safe_substitute(userId='1'))
+
+    cases = {
+        'compile': lambda: StringTemplate(URL),
+        'partial': lambda: template.partial(userId='1'),
+        'render': lambda: template.render(userId='1', orderId='2'),
+        'str_bound': lambda: str(bound),
+        'string.Template partial': legacy_partial,
+        'string.Template str': lambda: legacy.safe_substitute(),
+    }
+
+    return {
+        name: number / timeit.timeit(fn, number=number)
+        for name, fn in cases.items()
+    }
+
+
+if __name__ == '__main__':
+    args = [int(i) for i in sys.argv[1:2]]
+    for name, ops in run(*args).items():
+        print(f'{name:>24}: {ops:>12,.0f} ops/s')
@@ -0,0 +1,45 @@
+"""Requests per second against a local stub server, by concurrency.
+
+Usage:
+    python benchmarks/bench_throughput.py [requests]
+"""
+import sys
+import time
+from typing import Dict
+
+from inori import Client
+
+from stub import StubServer
+
+CONCURRENCY = (1, 4, 16, 64)
+
+
+def run(requests: int = 2000, levels=CONCURRENCY) -> Dict[str, float]:
+    """Return requests per second for each concurrency level."""
+    results = {}
+    with StubServer() as server:
+        for level in levels:
+            client = Client(server.url, pool_maxsize=level)
+            client.add_route('items/${itemId}')
+            route = client.items
+
+            # Open the connections before measuring.
+            list(client.gather(
+                [route(itemId='0').get] * level, max_concurrency=level,
+            ))
+
+            calls = [route(itemId=str(i)).get for i in range(requests)]
+            start = time.perf_counter()
+            for result in client.gather(calls, max_concurrency=level):
+                result.response.close()
+            elapsed = time.perf_counter() - start
+
+            results[f'concurrency {level}'] = requests / elapsed
+
+    return results
+
+
+if __name__ == '__main__':
+    args = [int(i) for i in sys.argv[1:2]]
+    for name, value in run(*args).items():
+        print(f'{name:>16}: {value:>10,.0f} requests/s')
@@ -0,0 +1,90 @@
+"""Per-request time by transport, against the local stub server.
+
+Each transport sends the same GET over a warm connection. Raw urllib3 is
+the floor: the difference to it is the overhead of the transport and of
+inori itself.
+
+WSGITransport calls an app in the same process instead. Without sockets,
+its difference to calling the app directly is a steady measure of inori's
+own overhead.
+
+Usage:
+    python benchmarks/bench_transport.py [number]
+"""
+import sys
+import timeit
+from typing import Dict
+
+from inori import Client
+from inori.inprocess import WSGITransport
+from inori.transport import RequestsTransport, Transport, Urllib3Transport
+
+import requests
+
+from stub import StubServer
+
+import urllib3
+
+
+def app(environ, start_response):
+    """WSGI app answering every request with the same body."""
+    start_response('200 OK', [('Content-Type', 'application/json')])
+    return [b'{"ok": true}']
+
+
+def build_route(url: str, transport: Transport):
+    """Create a bound Route sending through a transport."""
+    client = Client(url)
+    client.settings_.transport = transport
+    client.add_route('users/${userId}')
+    client.headers['Accept'] = 'application/json'
+    return client.users(userId='1')
+
+
+def run(number: int = 2000) -> Dict[str, float]:
+    """Return microseconds per request."""
+    with StubServer() as server:
+        url = f'{server.url}users/1'
+        pool = urllib3.PoolManager()
+        session = requests.Session()
+
+        requests_route = build_route(server.url, RequestsTransport())
+        urllib3_route = build_route(server.url, Urllib3Transport())
+        wsgi_route = build_route(server.url, WSGITransport(app))
+        environ = {'REQUEST_METHOD': 'GET', 'PATH_INFO': '/users/1'}
+
+        cases = {
+            'urllib3.request': lambda: pool.request('GET', url).data,
+            'session.get': lambda: session.get(url).content,
+            'route.get, RequestsTransport': (
+                lambda: requests_route.get().content
+            ),
+            'route.get, Urllib3Transport': (
+                lambda: urllib3_route.get().content
+            ),
+            'wsgi app': lambda: app(environ, lambda *args: None),
+            'route.get, WSGITransport': lambda: wsgi_route.get().content,
+        }
+
+        results = {}
+        for name, fn in cases.items():
+            # Open the connection before measuring.
+            fn()
+            seconds = timeit.timeit(fn, number=number)
+            results[f'{name}_us'] = seconds / number * 1e6
+
+    floor = results['urllib3.request_us']
+    for name in ('RequestsTransport', 'Urllib3Transport'):
+        results[f'{name} overhead_us'] = (
+            results[f'route.get, {name}_us'] - floor
+        )
+    results['WSGITransport overhead_us'] = (
+        results['route.get, WSGITransport_us'] - results['wsgi app_us']
+    )
+    return results
+
+
+if __name__ == '__main__':
+    args = [int(i) for i in sys.argv[1:2]]
+    for name, value in run(*args).items():
+        print(f'{name:>36}: {value:>8.2f}')
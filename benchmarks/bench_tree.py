@@ -0,0 +1,62 @@
+"""Route tree build time, and bind/call cost versus tree size.
+
+Usage:
+    python benchmarks/bench_tree.py [number]
+"""
+import sys
+import time
+import timeit
+from typing import Dict
+
+from bench_route_registration import BASE_URI, synthetic_spec
+
+from inori import Client
+from inori.manifest import load_manifest
+
+SIZES = (10, 100, 1000)
+
+
+def call_cases(route):
+    """Get the operations to time on a resource's Route."""
+    bound = route(id='1')
+    return {
+        'call': lambda: route(id='1'),
+        'call_chain': lambda: route(id='1').owners(ownerId='2'),
+        'child': lambda: route.search,
+        'bound_child': lambda: bound.comments,
+        'str_url': lambda: str(bound.url),
+    }
+
+
+def run(number: int = 20000, sizes=SIZES) -> Dict[str, Dict[str, float]]:
+    """Return build time per path and call costs, for each tree size.
+
+    Sizes are numbers of resources, each with 10 paths.
+    """
+    results = {}
+    for size in sizes:
+        paths = load_manifest(synthetic_spec(size)).paths
+        client = Client(BASE_URI)
+
+        start = time.perf_counter()
+        for path in paths:
+            client.add_route(path)
+        build = time.perf_counter() - start
+
+        results[f'{len(paths)} paths'] = {
+            'build_us_per_path': build / len(paths) * 1e6,
+            **{
+                f'{name}_us': timeit.timeit(fn, number=number) / number * 1e6
+                for name, fn in call_cases(client.resource_0).items()
+            },
+        }
+
+    return results
+
+
+if __name__ == '__main__':
+    args = [int(i) for i in sys.argv[1:2]]
+    for size, result in run(*args).items():
+        print(size)
+        for name, value in result.items():
+            print(f'  {name:>20}: {value:>10.2f}')
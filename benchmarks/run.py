@@ -0,0 +1,129 @@
+"""Run every benchmark and store the results for the current commit.
+
+Results are written to benchmarks/results/<commit>.json, so runs on
+different commits can be compared.
+
+Usage:
+    python benchmarks/run.py [--quick] [--only bench_tree,bench_overhead]
+    python benchmarks/run.py --compare OLD.json NEW.json
+"""
+import argparse
+import datetime
+import importlib
+import json
+import os
+import platform
+import subprocess
+import sys
+from typing import Any, Dict, Iterator, List, Tuple
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Smaller arguments used with --quick, by benchmark.
+QUICK: Dict[str, Dict[str, Any]] = {
+    'bench_connection_pool': {'routes': 50, 'rounds': 2},
+    'bench_header_merge': {'number': 5000},
+    'bench_json': {'items': 500, 'number': 5},
+    'bench_overhead': {'number': 2000},
+    'bench_resolve': {'resources': 100, 'number': 2000},
+    'bench_route_memory': {'resources': 100},
+    'bench_route_registration': {'resources': 50},
+    'bench_string_template': {'number': 10000},
+    'bench_throughput': {'requests': 200, 'levels': (1, 8)},
+    'bench_transport': {'number': 300},
+    'bench_tree': {'number': 2000, 'sizes': (10, 100)},
+}
+
+
+def benchmarks() -> List[str]:
+    """Get the names of the benchmark modules."""
+    return sorted(
+        name[:-3] for name in os.listdir(HERE)
+        if name.startswith('bench_') and name.endswith('.py')
+    )
+
+
+def git(*args: str) -> str:
+    """Run a git command in the repository, returning its output."""
+    return subprocess.run(
+        ['git', *args], cwd=HERE, capture_output=True, text=True, check=True,
+    ).stdout.strip()
+
+
+def environment() -> Dict[str, Any]:
+    """Describe the commit and the machine the benchmarks run on."""
+    return {
+        'commit': git('rev-parse', '--short', 'HEAD'),
+        'dirty': bool(git('status', '--porcelain', '--untracked-files=no')),
+        'date': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+    }
+
+
+def run(names: List[str], quick: bool) -> Dict[str, Any]:
+    """Run the benchmarks, returning their results."""
+    sys.path.insert(0, HERE)
+    results = {}
+    for name in names:
+        print(f'Running {name}...', file=sys.stderr)
+        module = importlib.import_module(name)
+        kwargs = QUICK.get(name, {}) if quick else {}
+        results[name] = module.run(**kwargs)
+    return results
+
+
+def flatten(data: Any, prefix: str = '') -> Iterator[Tuple[str, float]]:
+    """Yield every number in nested dicts, with a dotted name."""
+    if isinstance(data, dict):
+        for key, value in data.items():
+            yield from flatten(value, f'{prefix}{key}.')
+    elif isinstance(data, (int, float)):
+        yield prefix.rstrip('.'), data
+
+
+def compare(old_path: str, new_path: str) -> None:
+    """Print the change of every metric between two result files."""
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+
+    print(f'{old["commit"]} -> {new["commit"]}')
+    old_values = dict(flatten(old['results']))
+    for name, value in flatten(new['results']):
+        before = old_values.get(name)
+        if not before:
+            continue
+        change = (value - before) / before * 100
+        print(f'{name:<70} {before:>14,.2f} {value:>14,.2f} {change:>+8.1f}%')
+
+
+def main() -> None:
+    """Parse the arguments and run or compare."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--quick', action='store_true')
+    parser.add_argument('--only', help='Comma-separated benchmark names.')
+    parser.add_argument('--output', default=os.path.join(HERE, 'results'))
+    parser.add_argument('--compare', nargs=2, metavar='RESULTS')
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    names = args.only.split(',') if args.only else benchmarks()
+    report = {**environment(), 'quick': args.quick}
+    report['results'] = run(names, args.quick)
+
+    os.makedirs(args.output, exist_ok=True)
+    suffix = '-dirty' if report['dirty'] else ''
+    path = os.path.join(args.output, f'{report["commit"]}{suffix}.json')
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2, default=list)
+
+    print(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""In-process HTTP stub server used by the benchmarks."""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answer every request with the server's canned body."""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        """Count every new TCP connection."""
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def _respond(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            self.rfile.read(length)
+
+        with self.server.lock:
+            self.server.requests += 1
+
+        body = self.server.body
+        self.send_response(200)
+        self.send_header('Content-Type', self.server.content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = do_DELETE = do_HEAD = _respond  # NOQA N815
+
+    def log_message(self, format, *args):  # NOQA A002
+        """Silence per-request logging."""
+
+
+class StubServer:
+    """Run a ThreadingHTTPServer on a free local port.
+
+    Example:
+        >>> with StubServer() as server:
+        >>>     client = Client(server.url)
+
+    Arguments:
+        body: Bytes returned for every request.
+        content_type: Value of the Content-Type response header.
+
+    Attributes:
+        connections: Number of TCP connections accepted.
+        requests: Number of requests answered.
+    """
+
+    def __init__(
+        self,
+        body: bytes = b'{"ok": true}',
+        content_type: str = 'application/json',
+    ):
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.lock = threading.Lock()
+        self.httpd.connections = 0
+        self.httpd.requests = 0
+        self.httpd.body = body
+        self.httpd.content_type = content_type
+
+        self.thread = threading.Thread(
+            target=self.httpd.serve_forever, daemon=True,
+        )
+
+    @property
+    def url(self) -> str:
+        """Base URI of the server, with a trailing slash."""
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}/'
+
+    @property
+    def connections(self) -> int:  # NOQA D102
+        return self.httpd.connections
+
+    @property
+    def requests(self) -> int:  # NOQA D102
+        return self.httpd.requests
+
+    def reset(self):
+        """Reset the connection and request counters."""
+        with self.httpd.lock:
+            self.httpd.connections = 0
+            self.httpd.requests = 0
+
+    def __enter__(self):
+        """Start serving in a background thread."""
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        """Stop the server and close its socket."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -1,5 +1,7 @@
+from .async_client import AsyncClient
+from .async_route import AsyncRoute
 from .client import Client
 from .route import Route
 from .version import __version__  # NOQA: F401
 
-__all__ = ['Client', 'Route']
+__all__ = ['AsyncClient', 'AsyncRoute', 'Client', 'Route']
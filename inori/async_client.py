@@ -0,0 +1,161 @@
+from typing import Any, Awaitable, Callable, Iterable, Union
+
+from .async_route import AsyncRoute
+from .client import Client, _call
+from .codec import JSONCodec, httpx_codec
+from .fanout import AsyncBatch, run_async
+from .inprocess import APP_BASE_URI, is_asgi
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+
+class AsyncClient(Client):
+    """Client for use with asyncio.
+
+    Routes are added and called the same way as with Client, but requests
+    are awaited. All Routes share one pooled httpx.AsyncClient, so many
+    requests can be in flight on a single event loop.
+
+    Requires httpx, available with: pip install inori[async]
+
+    Example:
+        >>> client = AsyncClient('http://my.service/api/v777')
+        >>> client.add_route('fruits/${fruitId}')
+
+        >>> response = await client.fruits(fruitId='8').get()
+        >>> await client.aclose()
+
+    AsyncClient can be used as an async context manager to close the
+    connection pool when done.
+
+    Example:
+        >>> async with AsyncClient('http://my.service/api/v777') as client:
+        >>>     client.add_route('fruits')
+        >>>     response = await client.fruits.get()
+
+    Arguments:
+        base_uri: Base URI for the API.
+        auth: Authentication handler given to the Client's session.
+        max_connections: Maximum number of open connections.
+        max_keepalive_connections: Maximum number of idle connections
+            kept open.
+        codec: JSON library name, ie: 'orjson', or a JSONCodec. Defaults to
+            the standard library's json, with the options of httpx.
+
+    Attributes:
+        request_kwargs: Dictionary of any arguments to send with every
+            request. Must be accepted by httpx.AsyncClient.request().
+
+        app: Optional ASGI app called instead of the network, see
+            AsyncClient.for_app(). Client.settings_.transport is not used,
+            requests are sent by httpx.
+
+    """
+
+    route_class = AsyncRoute
+
+    _reserved_names = Client._reserved_names | {'aclose'}
+
+    def __init__(
+        self,
+        base_uri: str,
+        auth=None,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        codec: Union[str, JSONCodec, None] = None,
+    ):
+        # Set first: Client.route_paths are checked against them.
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+
+        # ASGI app called instead of the network, see AsyncClient.for_app
+        self.app: Any = None
+
+        if codec is None:
+            codec = httpx_codec()
+        super().__init__(base_uri, auth=auth, codec=codec)
+
+    def new_session(self) -> 'httpx.AsyncClient':
+        """Get a new instance of httpx.AsyncClient.
+
+        The session is configured with the Client's pool settings.
+        """
+        if httpx is None:
+            raise ImportError(
+                'AsyncClient requires httpx: pip install inori[async]',
+            )
+
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+        )
+        if self.app is None:
+            return httpx.AsyncClient(limits=limits)
+
+        return httpx.AsyncClient(
+            limits=limits, transport=httpx.ASGITransport(app=self.app),
+        )
+
+    @classmethod
+    def for_app(
+        cls, app: Any, base_uri: str = APP_BASE_URI, **kwargs: Any,
+    ) -> 'AsyncClient':
+        """Create an AsyncClient calling an ASGI app in the same process.
+
+        Requests are sent to the app by httpx.ASGITransport, on the
+        running event loop. No socket is opened.
+
+        Example:
+            >>> async with AsyncClient.for_app(starlette_app) as client:
+            >>>     client.add_route('fruits')
+            >>>     response = await client.fruits.get()
+
+        Accepts the same arguments as Client.for_app().
+
+        Raises:
+            TypeError: If the app is a WSGI app. Use Client.for_app().
+        """
+        if not is_asgi(app):
+            raise TypeError(
+                'AsyncClient can only call ASGI apps, '
+                'use Client.for_app() for WSGI apps.',
+            )
+
+        client = cls(base_uri, **kwargs)
+        client.app = app
+        return client
+
+    def gather(
+        self,
+        calls: Iterable[Callable[[], Awaitable[Any]]],
+        max_concurrency: int = 10,
+        ordered: bool = True,
+    ) -> AsyncBatch:
+        """Run many requests, on the event loop.
+
+        Accepts the same arguments as Client.gather(). Each call
+        must return an awaitable.
+
+        Returns:
+            AsyncBatch: Async iterable of Result objects.
+        """
+        return AsyncBatch(
+            run_async(_call, calls, max_concurrency, ordered),
+        )
+
+    async def aclose(self) -> None:
+        """Close the connection pool, if it was opened."""
+        if self._session is not None:
+            await self._session.aclose()
+            self._session = None
+
+    async def __aenter__(self) -> 'AsyncClient':
+        """Use the Client as an async context manager."""
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        """Close the connection pool."""
+        await self.aclose()
@@ -0,0 +1,496 @@
+import asyncio
+import contextlib
+import functools
+import inspect
+from typing import (
+    Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Mapping,
+    Optional, Tuple, Type, Union,
+)
+
+from .codec import decode_response, encode_body
+from .download import (
+    CHUNK_SIZE, Download, IDENTITY, MIN_SEGMENT_SIZE, RemoteFile, Segment,
+)
+from .fanout import AsyncBatch, run_async
+from .pagination import Page, Strategy, prefetch_async
+from .profiling import NullProfile, Profile
+from .retry import Retrying
+from .route import Route, _adapt, _outcome, _reserve, child_first
+from .upload import (
+    AsyncUploadBody, Progress, prepare_upload_async, rewinder,
+)
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+
+SEND_KWARGS = ('auth', 'follow_redirects')
+
+# A response, and the profile of its request.
+_Sent = Tuple['httpx.Response', Union[Profile, NullProfile]]
+
+
+async def run_hooks(hooks: Iterable, metadata: Any) -> None:
+    """Run every hook, awaiting the ones that are coroutine functions."""
+    for fn in hooks:
+        result = fn(metadata)
+        if inspect.isawaitable(result):
+            await result
+
+
+async def _attempt_async(
+    send: Callable[[], Awaitable[Any]],
+    retrying: Retrying,
+    exceptions: Tuple[Type[BaseException], ...],
+) -> Tuple[Any, Optional[BaseException]]:
+    """Send a request, returning the response or the exception.
+
+    Exceptions that are not retried, including cancellation, are raised
+    once the attempt is recorded as aborted.
+    """
+    try:
+        return await send(), None
+    except exceptions as e:
+        return None, e
+    except BaseException as e:
+        retrying.abort(e)
+        raise
+
+
+class AsyncRoute(Route):
+    """Route that makes requests without blocking the event loop.
+
+    AsyncRoute objects should be created via AsyncClient.add_route().
+
+    Example:
+        >>> client = AsyncClient('http://foo.bar/v1')
+        >>> client.add_route('fruits/${fruitId}')
+
+        >>> response = await client.fruits(fruitId='8').get()
+
+    Header functions, request hooks and response hooks can be
+    coroutine functions.
+    """
+
+    __slots__ = ()
+
+    async def post(self, *args: Any, **kwargs: Any) -> 'httpx.Response':
+        """Send a POST request."""
+        return await self.request('POST', self, *args, **kwargs)
+
+    async def put(self, *args: Any, **kwargs: Any) -> 'httpx.Response':
+        """Send a PUT request."""
+        return await self.request('PUT', self, *args, **kwargs)
+
+    async def get(self, *args: Any, **kwargs: Any) -> 'httpx.Response':
+        """Send a GET request."""
+        return await self.request('GET', self, *args, **kwargs)
+
+    @child_first
+    async def request_json(
+        self, http_method: str, *args: Any, **kwargs: Any,
+    ) -> Any:
+        """Send an HTTP Request and decode its JSON body.
+
+        Accepts the same arguments as AsyncRoute.request().
+        """
+        response, profile = await self._request(
+            http_method, *args, **kwargs,
+        )
+        data = decode_response(response, self.client.settings_.codec)
+        profile.mark('decode')
+        profile.finish()
+        return data
+
+    @child_first
+    async def get_json(self, *args: Any, **kwargs: Any) -> Any:
+        """Send a GET request and decode its JSON body."""
+        # Not self.request_json, a child Route could hide it.
+        request_json = type(self).request_json
+        return await request_json(self, 'GET', self, *args, **kwargs)
+
+    async def delete(self, *args: Any, **kwargs: Any) -> 'httpx.Response':
+        """Send a DELETE request."""
+        return await self.request('DELETE', self, *args, **kwargs)
+
+    @child_first
+    def map(  # NOQA A003
+        self,
+        http_method: str,
+        items: Iterable[Mapping[str, Any]],
+        max_concurrency: int = 10,
+        ordered: bool = True,
+    ) -> AsyncBatch:
+        """Make one request per item, on the event loop.
+
+        Accepts the same arguments as Route.map().
+
+        Example:
+            >>> batch = client.items.map('GET', [{'itemId': 1}, {'itemId': 2}])
+            >>> responses = [r.response async for r in batch]
+
+        Returns:
+            AsyncBatch: Async iterable of Result objects.
+        """
+        send = functools.partial(self._request_item, http_method)
+        return AsyncBatch(run_async(send, items, max_concurrency, ordered))
+
+    @child_first
+    async def paginate(
+        self,
+        strategy: Strategy,
+        http_method: str = 'GET',
+        pages: bool = False,
+        prefetch: int = 0,
+        **kwargs: Any,
+    ) -> AsyncIterator[Any]:
+        """Iterate over every item of a paginated resource.
+
+        Accepts the same arguments as Route.paginate(). Prefetched pages are
+        requested by a task on the event loop.
+
+        Example:
+            >>> async for user in client.users.paginate(Cursor('meta.next')):
+            >>>     print(user)
+        """
+        page_iter = self._pages_async(strategy, http_method, kwargs)
+        if prefetch:
+            page_iter = prefetch_async(page_iter, prefetch)
+
+        async for page in page_iter:
+            if pages:
+                yield page
+            else:
+                for item in page.items:
+                    yield item
+
+    async def _pages_async(
+        self, strategy: Strategy, http_method: str, kwargs: Dict[str, Any],
+    ) -> AsyncIterator[Page]:
+        page_kwargs = strategy.first(kwargs)
+        number = 0
+
+        while page_kwargs is not None:
+            route, page_kwargs = self._page_request(page_kwargs)
+            response = await route.request(http_method, **page_kwargs)
+
+            items, page_kwargs = strategy.page(response, page_kwargs)
+            yield Page(response, items, number)
+            number += 1
+
+    @child_first
+    @contextlib.asynccontextmanager
+    async def stream(
+        self, http_method: str, *args: Any, **kwargs: Any,
+    ) -> AsyncIterator['httpx.Response']:
+        """Send an HTTP Request without reading the response body.
+
+        Example:
+            >>> async with client.exports.stream('GET') as response:
+            >>>     async for chunk in response.aiter_bytes():
+            >>>         f.write(chunk)
+
+        Accepts the same arguments as AsyncRoute.request().
+        """
+        response = await self.request(
+            http_method, *args, stream=True, **kwargs,
+        )
+        try:
+            yield response
+        finally:
+            await response.aclose()
+
+    @child_first
+    async def download_to(
+        self,
+        path: str,
+        segments: int = 4,
+        min_segment_size: int = MIN_SEGMENT_SIZE,
+        chunk_size: int = CHUNK_SIZE,
+        resume: bool = True,
+        **kwargs: Any,
+    ) -> str:
+        """Download a file, fetching byte ranges concurrently.
+
+        Example:
+            >>> await client.artifacts(artifactId='42').download_to('a.bin')
+
+        Accepts the same arguments as Route.download_to().
+        """
+        headers = {**(kwargs.pop('headers', None) or {}), **IDENTITY}
+
+        head = await self.request('HEAD', self, headers=headers, **kwargs)
+        head.raise_for_status()
+        remote = RemoteFile(head.headers)
+
+        if not remote.segmentable:
+            await self._download_whole(path, chunk_size, headers, kwargs)
+            return path
+
+        download = Download(
+            path, str(self.url), remote, segments, min_segment_size, resume,
+        )
+
+        async def fetch(segment: Segment) -> None:
+            await self._download_segment(
+                download, segment, chunk_size, headers, kwargs,
+            )
+
+        complete = False
+        try:
+            results = run_async(
+                fetch, download.pending(), segments, ordered=False,
+            )
+            # Every segment runs to the end, so a retry resumes from them.
+            errors = [i.exception async for i in results if not i.ok]
+            if errors:
+                raise errors[0]  # type: ignore
+            complete = True
+        finally:
+            download.close(complete)
+
+        return path
+
+    async def _download_segment(
+        self,
+        download: Download,
+        segment: Segment,
+        chunk_size: int,
+        headers: Dict[str, str],
+        kwargs: Dict[str, Any],
+    ) -> None:
+        """Fetch what is left of a segment, writing it to the file."""
+        headers = {**headers, **download.headers(segment)}
+
+        stream = type(self).stream  # Not hidden by a child Route
+        async with stream(
+            self, 'GET', self, headers=headers, **kwargs,
+        ) as response:
+            download.check(segment, response.status_code, response.headers)
+            async for chunk in response.aiter_bytes(chunk_size):
+                download.write(segment, chunk)
+
+    async def _download_whole(
+        self,
+        path: str,
+        chunk_size: int,
+        headers: Dict[str, str],
+        kwargs: Dict[str, Any],
+    ) -> None:
+        """Fetch a file with a single request."""
+        stream = type(self).stream  # Not hidden by a child Route
+        async with stream(
+            self, 'GET', self, headers=headers, **kwargs,
+        ) as response:
+            response.raise_for_status()
+            with open(path, 'wb') as f:
+                async for chunk in response.aiter_bytes(chunk_size):
+                    f.write(chunk)
+
+    async def request(self,
+                      http_method: str,
+                      *args: Any,
+                      headers: Optional[Dict[str, str]] = None,
+                      stream: bool = False,
+                      **kwargs: Any,
+                      ) -> 'httpx.Response':
+        """Send an HTTP Request.
+
+        Accepts the same keyword arguments as httpx.AsyncClient.request().
+
+        Arguments:
+            http_method: HTTP method to use for the request
+            stream: If True, the response body is not read.
+        """
+        response, profile = await self._request(
+            http_method, *args, headers=headers, stream=stream, **kwargs,
+        )
+        profile.finish()
+        return response
+
+    async def _request(self,
+                       http_method: str,
+                       *args: Any,
+                       headers: Optional[Dict[str, str]] = None,
+                       stream: bool = False,
+                       **kwargs: Any,
+                       ) -> _Sent:
+        """Send an HTTP Request, leaving its profile open.
+
+        AsyncRoute.request_json() adds the decode phase to the profile.
+        """
+        local_headers = headers or {}
+        profile = self._profile()
+
+        self._reset_rigs()
+        profile.mark('rig_reset')
+
+        request_metadata = self._request_metadata(
+            http_method, local_headers, kwargs,
+        )
+        profile.mark('metadata')
+
+        evaluated_headers = await self._merged().evaluate_async(
+            self.client, self, request_metadata, local_headers,
+        )
+
+        request_metadata['headers'] = evaluated_headers
+        profile.mark('headers')
+
+        await run_hooks(self.client.hooks['request'], request_metadata)
+        profile.mark('request_hooks')
+
+        evaluated_kwargs = self._request_kwargs(kwargs)
+
+        # Checked before json= is encoded into content.
+        flight = self.client.settings_.single_flight
+        shared = not stream and flight is not None and flight.accepts(
+            http_method, evaluated_kwargs,
+        )
+
+        encode_body(
+            self.client.settings_.codec,
+            evaluated_headers,
+            evaluated_kwargs,
+            'content',
+        )
+        self._prepare_content(http_method, evaluated_headers, evaluated_kwargs)
+        # Taken before the body is read: files rewind to where they are.
+        rewind = rewinder(evaluated_kwargs.get('content'))
+
+        # Arguments httpx only accepts when sending.
+        send_kwargs = {
+            k: evaluated_kwargs.pop(k)
+            for k in SEND_KWARGS if k in evaluated_kwargs
+        }
+
+        url = str(self.url)
+        prepared = self.session.build_request(
+            http_method, url, headers=evaluated_headers, **evaluated_kwargs,
+        )
+        profile.mark('render')
+
+        async def attempt() -> 'httpx.Response':
+            limits = self._rate_limits()
+            delay = _reserve(limits)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            response = await self.session.send(
+                prepared, stream=stream, **send_kwargs,
+            )
+            _adapt(limits, response)
+            return response
+
+        def send() -> Awaitable['httpx.Response']:
+            return self._transmit_async(http_method, attempt, rewind)
+
+        if not shared:
+            send_once = send
+        else:
+            key = flight.key(  # type: ignore
+                http_method, url, evaluated_headers,
+                evaluated_kwargs.get('params'),
+            )
+            send_once = functools.partial(flight.do_async, key, send)
+
+        body = evaluated_kwargs.get('content') or evaluated_kwargs.get('data')
+        with self._measure(http_method, stream, body) as observation:
+            response = observation.response = await send_once()
+        profile.mark('transport')
+
+        response_metadata = self._response_metadata(
+            http_method, response, stream,
+        )
+        profile.attach(response_metadata)
+
+        await run_hooks(self.client.hooks['response'], response_metadata)
+        profile.mark('response_hooks')
+
+        return response, profile
+
+    def _prepare_content(
+        self,
+        http_method: str,
+        headers: Dict[str, str],
+        kwargs: Dict[str, Any],
+    ) -> None:
+        """Prepare the body to be streamed, reporting to upload hooks.
+
+        Streamed bodies of a known size keep their Content-Length.
+        """
+        body = kwargs.get('content')
+        if body is None:
+            return
+
+        progress = self._upload_progress(http_method)
+        content = kwargs['content'] = prepare_upload_async(body, progress)
+
+        if isinstance(content, AsyncUploadBody) and content.len is not None:
+            headers.setdefault('Content-Length', str(content.len))
+
+    def _upload_progress(self, http_method: str) -> Optional[Progress]:
+        """Get a function running the upload hooks, if there are any."""
+        hooks = self.client.hooks.get('upload')
+        if not hooks:
+            return None
+
+        async def progress(sent: int, total: Optional[int]) -> None:
+            metadata = self._upload_metadata(http_method, sent, total)
+            await run_hooks(hooks, metadata)
+
+        return progress
+
+    async def _transmit_async(
+        self,
+        http_method: str,
+        send: Callable[[], Awaitable['httpx.Response']],
+        rewind: Optional[Callable[[], None]],
+    ) -> 'httpx.Response':
+        """Send a request over the network, retrying if configured.
+
+        Same as Route._transmit(): bodies that can't be rewound are sent
+        once.
+        """
+        retrying = self._retrying(http_method, rewind is not None)
+        if retrying is None:
+            return await send()
+
+        exceptions = retrying.policy.exceptions
+        if httpx is not None:
+            exceptions += (httpx.TransportError,)
+
+        while True:
+            retrying.before()
+            response, error = await _attempt_async(
+                send, retrying, exceptions,
+            )
+
+            delay = retrying.after(response, error)
+            if delay is None:
+                return _outcome(response, error)
+
+            await self._on_retry_async(
+                http_method, retrying, response, error, delay,
+            )
+            await asyncio.sleep(delay)
+            rewind()  # type: ignore
+
+    async def _on_retry_async(
+        self,
+        http_method: str,
+        retrying: Retrying,
+        response: Any,
+        error: Optional[BaseException],
+        delay: float,
+    ) -> None:
+        """Run the response hooks for a failed attempt, then discard it."""
+        metadata = self._retry_metadata(
+            http_method, retrying, response, error, delay,
+        )
+        await run_hooks(self.client.hooks['response'], metadata)
+
+        if response is not None:
+            await response.aclose()
@@ -0,0 +1,448 @@
+import hashlib
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from .utils.singleflight import BODY_KWARGS
+
+# Methods whose responses can be cached.
+CACHEABLE_METHODS = frozenset({'GET', 'HEAD'})
+
+# Status codes whose responses can be cached.
+CACHEABLE_STATUS_CODES = frozenset({200, 203, 300, 301, 308, 404, 410})
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """Parse a Cache-Control header into a dict of directives.
+
+    Arguments:
+        value: The header's value.
+
+    Returns:
+        dict: Lowercase directive names, with their value or None.
+    """
+    directives: Dict[str, Optional[str]] = {}
+
+    for part in (value or '').split(','):
+        name, _, argument = part.strip().partition('=')
+        if name:
+            directives[name.lower()] = argument.strip('"') or None
+
+    return directives
+
+
+def _parse_seconds(value: Optional[str]) -> Optional[int]:
+    try:
+        return max(0, int(value))  # type: ignore
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_http_date(value: Optional[str]) -> Optional[float]:
+    """Parse an HTTP date into a timestamp, or None if it is invalid."""
+    try:
+        return parsedate_to_datetime(value).timestamp()  # type: ignore
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+class CacheEntry:
+    """A stored response.
+
+    Attributes:
+        status_code: Status code of the response.
+        headers: Headers of the response.
+        content: Body of the response.
+        vary: Values of the request headers named by the Vary header.
+        expires: Time after which the entry must be revalidated.
+    """
+
+    def __init__(
+        self,
+        response: requests.Response,
+        vary: Dict[str, Optional[str]],
+        expires: float,
+    ):
+        self.status_code = response.status_code
+        self.reason = response.reason
+        self.url = response.url
+        self.encoding = response.encoding
+        self.headers = dict(response.headers)
+        self.content = response.content
+        self.vary = vary
+        self.expires = expires
+
+    @property
+    def size(self) -> int:
+        """Approximate size of the entry, in bytes."""
+        headers = sum(len(k) + len(v) for k, v in self.headers.items())
+        return len(self.content) + headers
+
+    def is_fresh(self) -> bool:
+        """Check if the entry can be used without revalidation."""
+        return time.time() < self.expires
+
+    def matches(self, headers: Mapping[str, str]) -> bool:
+        """Check if the request headers match the ones the entry varies on.
+
+        Arguments:
+            headers: Headers of the new request.
+        """
+        headers = CaseInsensitiveDict(headers)
+        return all(headers.get(k) == v for k, v in self.vary.items())
+
+    def validators(self) -> Dict[str, str]:
+        """Get the headers for a conditional request."""
+        headers = CaseInsensitiveDict(self.headers)
+        rv = {}
+
+        if 'ETag' in headers:
+            rv['If-None-Match'] = headers['ETag']
+        if 'Last-Modified' in headers:
+            rv['If-Modified-Since'] = headers['Last-Modified']
+
+        return rv
+
+    def to_response(self) -> requests.Response:
+        """Build a requests.Response from the entry.
+
+        The response has a `from_cache` attribute set to True.
+        """
+        response = requests.Response()
+        response.status_code = self.status_code
+        response.reason = self.reason
+        response.url = self.url
+        response.encoding = self.encoding
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = self.content
+        response.from_cache = True  # type: ignore
+        return response
+
+
+class MemoryStore:
+    """Least recently used store, held in memory.
+
+    Arguments:
+        max_bytes: Size budget. The least recently used entries are removed
+            when it is exceeded.
+
+    Attributes:
+        evictions: Number of entries removed to stay within the budget.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.evictions = 0
+
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Get an entry, marking it as recently used."""
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+
+            self._entries.move_to_end(key)
+            return item[0]
+
+    def set(self, key: str, entry: CacheEntry) -> None:  # NOQA A003
+        """Store an entry, removing old entries if required."""
+        # Entries can change after being stored, keep the size they had.
+        size = entry.size
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (entry, size)
+            self.size += size
+
+            while self.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        """Remove an entry."""
+        with self._lock:
+            self._remove(key)
+
+    def _remove(self, key: str) -> None:
+        item = self._entries.pop(key, None)
+        if item is not None:
+            self.size -= item[1]
+
+    def __len__(self) -> int:
+        """Count the entries."""
+        return len(self._entries)
+
+
+class DiskStore:
+    """Store entries as files in a directory.
+
+    Arguments:
+        directory: Where the entries are written. Created if required.
+        max_bytes: Size budget. The least recently used files are removed
+            when it is exceeded. If None, there is no budget.
+
+    Attributes:
+        evictions: Number of entries removed to stay within the budget.
+    """
+
+    suffix = '.inori-cache'
+
+    def __init__(self, directory: str, max_bytes: Optional[int] = None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.evictions = 0
+
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        name = hashlib.sha256(key.encode()).hexdigest()
+        return os.path.join(self.directory, name + self.suffix)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Read an entry, marking it as recently used."""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+            os.utime(path)
+        except (OSError, pickle.PickleError, EOFError):
+            return None
+        return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:  # NOQA A003
+        """Write an entry, removing old entries if required."""
+        path = self._path(key)
+        temporary = f'{path}.{threading.get_ident()}.tmp'
+
+        with open(temporary, 'wb') as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, path)
+
+        if self.max_bytes is not None:
+            self._evict()
+
+    def delete(self, key: str) -> None:
+        """Remove an entry."""
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def _evict(self) -> None:
+        """Remove the least recently used files until within budget."""
+        files = []
+        with os.scandir(self.directory) as it:
+            for item in it:
+                if item.name.endswith(self.suffix):
+                    stat = item.stat()
+                    files.append((stat.st_mtime, stat.st_size, item.path))
+
+        size = sum(i[1] for i in files)
+        for _, file_size, path in sorted(files):
+            if size <= self.max_bytes:  # type: ignore
+                break
+            os.remove(path)
+            size -= file_size
+            self.evictions += 1
+
+
+class Cache:
+    """HTTP response cache for a Client.
+
+    Follows Cache-Control, Expires, ETag, Last-Modified and Vary.
+    Stale entries with a validator are revalidated with a conditional
+    request. Only GET and HEAD requests are cached.
+
+    Example:
+        >>> client = Client('http://my.service/api/v777')
+        >>> store = MemoryStore(max_bytes=10 * 1024 * 1024)
+        >>> client.settings_.cache = Cache(store)
+
+    Arguments:
+        store: Where entries are kept. Defaults to a MemoryStore.
+        default_ttl: Seconds a response without freshness information
+            stays fresh. By default such responses are only stored if they
+            can be revalidated.
+        default: If False, only Routes with use_cache set to True use the
+            cache. Otherwise every Route does, unless it opts out.
+
+    Attributes:
+        hits: Requests answered from the cache.
+        misses: Requests sent to the network.
+        revalidations: Stale entries confirmed by a 304 response.
+    """
+
+    def __init__(
+        self, store: Any = None, default_ttl: float = 0, default: bool = True,
+    ):
+        self.store = store if store is not None else MemoryStore()
+        self.default_ttl = default_ttl
+        self.default = default
+
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+
+    @property
+    def evictions(self) -> int:
+        """Entries removed by the store to stay within budget."""
+        return self.store.evictions
+
+    def stats(self) -> Dict[str, int]:
+        """Get the counters as a dict."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'revalidations': self.revalidations,
+            'evictions': self.evictions,
+        }
+
+    @staticmethod
+    def key(http_method: str, url: str, params: Any = None) -> str:
+        """Build the key for a request."""
+        prepared = requests.PreparedRequest()
+        prepared.prepare_url(url, params)
+        return f'{http_method} {prepared.url}'
+
+    def accepts(self, http_method: str, kwargs: Mapping[str, Any]) -> bool:
+        """Check if a request can use the cache.
+
+        Requests with a body are always sent: the key doesn't include it.
+        """
+        if http_method not in CACHEABLE_METHODS or kwargs.get('stream'):
+            return False
+
+        return all(kwargs.get(k) is None for k in BODY_KWARGS)
+
+    def fetch(
+        self,
+        send: Callable[[Dict[str, str]], requests.Response],
+        http_method: str,
+        url: str,
+        headers: Dict[str, str],
+        params: Any = None,
+    ) -> requests.Response:
+        """Get a response from the cache, or by sending the request.
+
+        Arguments:
+            send: Function taking request headers and sending the request.
+            http_method: HTTP method of the request.
+            url: URL of the request.
+            headers: Headers of the request.
+            params: Query parameters of the request.
+        """
+        key = self.key(http_method, url, params)
+        entry, conditional = self._lookup(key, headers)
+
+        if entry is not None and not conditional:
+            self.hits += 1
+            return entry.to_response()
+
+        response = send({**headers, **conditional})
+
+        if entry is not None and response.status_code == 304:
+            self.revalidations += 1
+            self._refresh(key, entry, response)
+            return entry.to_response()
+
+        self.misses += 1
+        self._save(key, headers, response)
+        return response
+
+    def _lookup(
+        self, key: str, headers: Dict[str, str],
+    ) -> Tuple[Optional[CacheEntry], Dict[str, str]]:
+        """Find a usable entry, and the headers to revalidate it with."""
+        request_directives = parse_cache_control(
+            CaseInsensitiveDict(headers).get('Cache-Control'),
+        )
+        if 'no-store' in request_directives:
+            return None, {}
+
+        entry = self.store.get(key)
+        if entry is None or not entry.matches(headers):
+            return None, {}
+
+        if entry.is_fresh() and 'no-cache' not in request_directives:
+            return entry, {}
+
+        validators = entry.validators()
+        return (entry, validators) if validators else (None, {})
+
+    def _refresh(
+        self, key: str, entry: CacheEntry, response: requests.Response,
+    ) -> None:
+        """Update a revalidated entry with the 304 response's headers."""
+        for name in ('Cache-Control', 'Expires', 'ETag', 'Last-Modified'):
+            if name in response.headers:
+                entry.headers[name] = response.headers[name]
+
+        entry.expires = self._expires(CaseInsensitiveDict(entry.headers))
+        self.store.set(key, entry)
+
+    def _save(
+        self,
+        key: str,
+        headers: Dict[str, str],
+        response: requests.Response,
+    ) -> None:
+        """Store a response, if it is allowed to be stored."""
+        if response.status_code not in CACHEABLE_STATUS_CODES:
+            return
+
+        directives = parse_cache_control(response.headers.get('Cache-Control'))
+        vary = response.headers.get('Vary', '')
+        if 'no-store' in directives or vary.strip() == '*':
+            return
+
+        expires = self._expires(response.headers)
+        if expires <= time.time() and not self._has_validator(response):
+            return
+
+        request_headers = CaseInsensitiveDict(headers)
+        vary_values = {
+            name.strip(): request_headers.get(name.strip())
+            for name in vary.split(',') if name.strip()
+        }
+
+        self.store.set(key, CacheEntry(response, vary_values, expires))
+
+    @staticmethod
+    def _has_validator(response: requests.Response) -> bool:
+        headers = response.headers
+        return 'ETag' in headers or 'Last-Modified' in headers
+
+    def _expires(self, headers: Mapping[str, str]) -> float:
+        """Get the time a response stops being fresh."""
+        return time.time() + self._lifetime(headers)
+
+    def _lifetime(self, headers: Mapping[str, str]) -> float:
+        """Get the number of seconds a response stays fresh."""
+        directives = parse_cache_control(headers.get('Cache-Control'))
+        if 'no-cache' in directives:
+            return 0
+
+        max_age = _parse_seconds(directives.get('max-age'))
+        if max_age is not None:
+            return max_age - (_parse_seconds(headers.get('Age')) or 0)
+
+        if 'Expires' in headers:
+            # An invalid date means the response has already expired.
+            expires = parse_http_date(headers['Expires']) or 0
+            date = parse_http_date(headers.get('Date')) or time.time()
+            return expires - date
+
+        return self.default_ttl
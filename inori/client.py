@@ -1,15 +1,31 @@
+import functools
 import logging
 import uuid
-from typing import Any, Dict, List, Union
+import warnings
+from typing import (
+    Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Sequence, Type,
+    TypeVar, Union,
+)
+from urllib.parse import urlsplit
 
 import requests
+from requests.adapters import HTTPAdapter
 
 import shibari
 
+from .codec import JSONCodec, get_codec
+from .fanout import Batch, run_threaded
+from .inprocess import (
+    APP_BASE_URI, ASGITransport, WSGITransport, is_asgi,
+)
 from .logging import Logging
-from .route import Route
+from .manifest import load_manifest
+from .route import Route, _ChildFirst, _MATERIALIZE_LOCK
+from .settings import Settings
 from .utils.headerdict import HeaderDict
-from .utils.sanitize import safe_illegal_character, safe_keyword
+from .utils.trie import PathNode, attribute_name, is_parameter, split_path
+
+C = TypeVar('C', bound='Client')
 
 
 class Client:
@@ -67,6 +83,13 @@ class Client:
 
     Arguments:
         base_uri: Base URI for the API.
+        auth: Authentication handler given to the Client's session.
+        pool_connections: Number of connection pools to cache.
+        pool_maxsize: Maximum number of connections kept per host.
+        pool_block: If True, block when no free connection is available
+            instead of opening a new one.
+        codec: JSON library name, ie: 'orjson', or a JSONCodec. Defaults to
+            the standard library's json.
 
     Attributes:
         headers: Dictionary containing all Client-level headers.
@@ -76,6 +99,9 @@ class Client:
 
         logger: Unique logger instance for each Client instance.
 
+        settings_: inori.settings.Settings, settings of the optional features:
+            cache, retries, rate limits, metrics, transport and codec.
+
     """
 
     rig = shibari.Rig('request')
@@ -83,15 +109,47 @@ class Client:
 
     route_paths: List[str] = []
 
-    def __init__(self, base_uri: str, auth=None):
+    # Class used for every Route created by add_route()
+    route_class = Route
+
+    # Attributes of the class used by the Client itself. Routes can't
+    # hide them, they can hide the other methods.
+    _reserved_names = frozenset({
+        'add_route',
+        'add_routes',
+        'new_session',
+        'rig',
+        'route_class',
+        'route_paths',
+    })
+
+    def __init__(
+        self,
+        base_uri: str,
+        auth=None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        codec: Union[str, JSONCodec, None] = None,
+    ):
         self.base_uri = base_uri
         self.auth = auth
 
-        for route in self.route_paths:
-            self.add_route(route)
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+
+        # Created on first use, see Client._get_session
+        self._session: Union[requests.Session, None] = None
+
+        # Paths whose Routes have not been created yet
+        self._pending = PathNode()
 
         self.headers = HeaderDict()
 
+        # Kept apart from Route names, see inori.settings.Settings
+        self.settings_ = Settings(_codec(codec))
+
         # Keyword args that will be sent on every request made by a Route.
         self.request_kwargs: Dict[str, Any] = {}
 
@@ -107,14 +165,282 @@ class Client:
             "response": [
                 self.logging.log_response,
             ],
+            "upload": [],
         }
 
+        self.add_routes(self.route_paths)
+
+    def _get_session(self) -> requests.Session:
+        """Get the session shared by every Route of the Client.
+
+        The session is created with Client.new_session() the first time
+        it is needed, so that all Routes draw from the same connection pool.
+        It is kept private, so that an API can have a Route named session.
+        """
+        if self._session is None:
+            self._session = self.new_session()
+            self._session.auth = self.auth
+        return self._session
+
     def new_session(self) -> requests.Session:
         """Get a new instance of requests.Session.
 
-        Route objects will call this method during init.
+        The session's adapters are configured with the Client's
+        pool settings.
         """
-        return requests.Session()
+        session = requests.Session()
+
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+
+        return session
+
+    def gather(
+        self,
+        calls: Iterable[Callable[[], Any]],
+        max_concurrency: int = 10,
+        ordered: bool = True,
+    ) -> Batch:
+        """Run many requests, on a thread pool.
+
+        Example:
+            >>> batch = client.gather([client.foo.get, client.bar.get])
+            >>> responses = [r.response for r in batch]
+
+        Arguments:
+            calls: An iterable of functions taking no arguments,
+                each making one request.
+            max_concurrency: Maximum number of requests in flight at once.
+            ordered: If True, results are yielded in the order of the calls.
+                Else they are yielded as they complete.
+
+        Returns:
+            Batch: Iterable of Result objects.
+        """
+        return Batch(
+            run_threaded(_call, calls, max_concurrency, ordered),
+        )
+
+    def __getattr__(self, name: str) -> Route:
+        """Create Routes added with Client.add_routes() on first use."""
+        route = self._materialize(name)
+        if route is None:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'",
+            )
+        return route
+
+    def _materialize(self, name: str) -> Optional[Route]:
+        """Create the pending top-level Route with a name, if any."""
+        pending = self.__dict__.get('_pending')
+        piece = pending.find(name) if pending is not None else None
+        if piece is None:
+            return None
+
+        with _MATERIALIZE_LOCK:
+            if name in self.__dict__:
+                return self.__dict__[name]
+
+            node = pending.pop(piece)  # type: ignore
+            route = self.route_class(
+                self,
+                url=f'{self.base_uri}{piece}',
+                trailing_slash=node.trailing_slash,
+            )
+            if node.children:
+                route._pending = node
+
+            setattr(self, name, route)
+            return route
+
+    def add_routes(
+        self, paths: Iterable[str], trailing_slash: bool = False,
+    ) -> None:
+        """Register many paths, without creating their Route objects.
+
+        The paths are kept in a trie. Each Route is created the first time
+        it, or a Route below it, is used.
+
+        Example:
+            >>> client.add_routes(['fruits/${fruitId}', 'fruits/latest'])
+            >>> client.fruits(fruitId='8').get()
+
+        Arguments:
+            paths: URI strings.
+            trailing_slash: Add a trailing slash to the Route URIs.
+
+        Raises:
+            ValueError: Same as Client.add_route().
+        """
+        for path in paths:
+            pieces = split_path(path)
+            name = attribute_name(pieces[0])
+            self._check_name(name)
+            self._check_child_names(pieces)
+            # Routes hiding a method are created now, as __getattr__
+            # is never called for them.
+            if name in self.__dict__ or hasattr(type(self), name):
+                self.add_route(path, trailing_slash)
+            else:
+                self._pending.insert(pieces, trailing_slash)
+
+    @classmethod
+    def from_manifest(
+        cls: Type[C], source: Any, base_uri: Optional[str] = None, **kwargs,
+    ) -> C:
+        """Create a Client from an OpenAPI spec or a JSON route manifest.
+
+        Example:
+            >>> client = Client.from_manifest('openapi.json')
+            >>> client.pets(petId='1').get()
+
+        Arguments:
+            source: Path to a JSON file, or the decoded document.
+                See inori.manifest.load_manifest().
+            base_uri: Base URI for the API. Defaults to the one in the
+                document.
+            kwargs: Given to the Client.
+
+        Returns:
+            Client: A Client whose Routes are created on first use.
+        """
+        manifest = load_manifest(source)
+
+        uri = base_uri or manifest.base_uri
+        if uri is None:
+            raise ValueError('No base_uri given and none found in manifest.')
+
+        client = cls(uri, **kwargs)
+        client.add_routes(manifest.paths)
+        return client
+
+    @classmethod
+    def for_app(
+        cls: Type[C], app: Any, base_uri: str = APP_BASE_URI, **kwargs,
+    ) -> C:
+        """Create a Client calling a WSGI or ASGI app in the same process.
+
+        Requests never reach the network: the app is called directly.
+        Headers, hooks, auth and every Route feature work as usual.
+
+        Example:
+            >>> client = Client.for_app(flask_app)
+            >>> client.add_route('fruits')
+            >>> response = client.fruits.get()
+
+        Arguments:
+            app: A WSGI app, or an ASGI app.
+            base_uri: Base URI for the API. Its host is the one the app
+                sees.
+            kwargs: Given to the Client.
+
+        Returns:
+            Client: A Client whose transport calls the app.
+        """
+        client = cls(base_uri, **kwargs)
+        if is_asgi(app):
+            client.settings_.transport = ASGITransport(app)
+        else:
+            client.settings_.transport = WSGITransport(app)
+        return client
+
+    def resolve(self, url: str) -> Optional[Route]:
+        """Find the Route matching a URL, with the values it contains.
+
+        The Route tree is walked one path segment at a time, so the cost
+        depends on the depth of the URL, not on the number of Routes.
+        Query strings are ignored. Parameters must be whole segments.
+
+        Example:
+            >>> client.add_route('fruits/${fruitId}/seeds')
+            >>> client.resolve('https://foo.com/v1/fruits/8/seeds')
+            Route: <https://foo.com/v1/fruits/8/seeds>
+
+        Arguments:
+            url: An absolute URL, or a path relative to the base URI.
+
+        Returns:
+            Route: The equivalent of client.fruits(fruitId='8').seeds,
+                or None if no Route matches.
+        """
+        segments = self._segments(url)
+        if not segments:
+            return None
+
+        route = self._top_route(segments[0])
+        found = route and route._match(segments, 1, {})
+        if not found:
+            return None
+
+        route, kwargs = found
+        return route._bind(kwargs) if kwargs else route
+
+    def _segments(self, url: str) -> Optional[List[str]]:
+        """Split a URL into the segments after the base URI."""
+        base = urlsplit(self.base_uri)
+        parts = urlsplit(url)
+        if parts.netloc and parts.netloc != base.netloc:
+            return None
+
+        path = parts.path
+        if path.startswith(base.path):
+            path = path[len(base.path):]
+        elif parts.netloc:
+            return None
+
+        return split_path(path)
+
+    def _top_route(self, piece: str) -> Optional[Route]:
+        """Get the top-level Route created for a piece of path."""
+        route = getattr(self, attribute_name(piece), None)
+        if not isinstance(route, Route):
+            return None
+
+        # Different pieces can share an attribute name, ie: a-b and a_b
+        url = f'{self.base_uri}{piece}'
+        return route if str(route.url) in (url, f'{url}/') else None
+
+    def _check_name(self, name: str) -> None:
+        """Check a top-level Route can use a name.
+
+        Routes can hide the methods of the Client, ie: resolve, except
+        the ones it uses itself.
+
+        Raises:
+            ValueError: If the name belongs to the Client, ie: headers.
+        """
+        if name in self.__dict__:
+            taken = not isinstance(self.__dict__[name], Route)
+        else:
+            taken = name in self._reserved_names
+
+        if taken:
+            raise ValueError(
+                f"'{name}' is an attribute of {type(self).__name__}, "
+                'it cannot be the name of a Route.',
+            )
+
+    def _check_child_names(self, pieces: Sequence[str]) -> None:
+        """Warn about pieces of path hidden by an attribute of Route.
+
+        They are only reachable with Route.children, ie: children['get'].
+        Methods a child Route hides, ie: stream, are left out.
+        """
+        attributes = _hiding(self.route_class)
+        for piece in pieces[1:]:
+            name = attribute_name(piece)
+            if name in attributes and not is_parameter(piece):
+                warnings.warn(
+                    f"'{name}' is an attribute of {self.route_class.__name__}"
+                    f", use route.children['{piece}'] to get the Route for "
+                    f"'{piece}'.",
+                    stacklevel=3,
+                )
 
     def add_route(self, path: str, trailing_slash: bool = False) -> Route:
         """Take a path string and create Route objects from it.
@@ -128,20 +454,31 @@ class Client:
 
         Returns:
             The last Route that was created.
+
+        Pieces below the first one named like a Route attribute, ie:
+        get or headers, are reachable with Route.children, and a warning
+        is issued.
+
+        Raises:
+            ValueError: If the first piece of the path is the name of a
+                Client attribute, ie: headers or add_route.
         """
         # Remove empty strings from list of pieces.
-        pieces = [i for i in path.split('/') if i != '']
+        pieces = split_path(path)
 
         # Ensure first piece is safe to use as a python variable.
-        route_name: str = safe_keyword(pieces[0])
-        route_name = safe_illegal_character(route_name)
+        route_name: str = attribute_name(pieces[0])
+        self._check_name(route_name)
+        self._check_child_names(pieces)
 
         # Check if a Route already exists.
-        existing_route: Union[Route, None] = getattr(self, route_name, None)
+        existing_route: Union[Route, None] = (
+            self.__dict__.get(route_name) or self._materialize(route_name)
+        )
 
         # Create new Route if none exists
         if not existing_route:
-            r = Route(
+            r = self.route_class(
                 self,
                 url=f'{self.base_uri}{pieces[0]}',
                 trailing_slash=trailing_slash,
@@ -161,33 +498,41 @@ class Client:
             # Identify piece
 
             # Callable
-            if item.startswith('${') and item.endswith('}'):
-                kwarg = item[2:-1]
-
+            if is_parameter(item):
                 # Check if callable already in the last Route.
-                new_route = last_route.callables.get(kwarg)
+                new_route = last_route.callables.get(item[2:-1])
                 if not new_route:
-                    new_route = Route(
-                        self,
-                        f"{last_route.url}/{item}",
-                        trailing_slash,
-                    )
-                    last_route.callables[kwarg] = new_route
+                    new_route = last_route._add_child(item, trailing_slash)
 
             # Children
             else:
-                nested_route_name: str = safe_keyword(item)
-                nested_route_name = safe_illegal_character(nested_route_name)
-
                 # Check if route already exists
-                new_route = getattr(last_route, nested_route_name, None)
+                new_route = last_route.children.get(item)
                 if not new_route:
-                    new_route = Route(
-                        self, f"{last_route.url}/{item}",
-                    )
-                    last_route.children[item] = new_route
-                    setattr(last_route, nested_route_name, new_route)
+                    new_route = last_route._add_child(item)
 
             routes.append(new_route)
 
         return routes[-1]
+
+
+def _codec(codec: Union[str, JSONCodec, None]) -> JSONCodec:
+    """Get the codec given to a Client, by name or as is."""
+    if codec is None or isinstance(codec, str):
+        return get_codec(codec)
+    return codec
+
+
+@functools.lru_cache(maxsize=None)
+def _hiding(cls: type) -> FrozenSet[str]:
+    """Names of the attributes of a Route class hiding child Routes."""
+    return frozenset(
+        name
+        for i in cls.__mro__
+        for name, value in vars(i).items()
+        if not isinstance(value, _ChildFirst)
+    )
+
+
+def _call(fn: Callable[[], Any]) -> Any:
+    return fn()
@@ -0,0 +1,168 @@
+import json
+from typing import Any, Callable, Dict, Optional
+
+from requests.exceptions import InvalidJSONError
+
+# Libraries tried by fastest_codec(), fastest first.
+PREFERRED = ('orjson', 'ujson', 'json')
+
+# Attribute of a response holding its decoded body.
+_DECODED = '_inori_json'
+
+_MISSING = object()
+
+
+class JSONCodec:
+    """Encode and decode JSON bodies with a JSON library.
+
+    Arguments:
+        name: Name of the library.
+        decode: Function taking bytes and returning the decoded object.
+        encode: Function taking an object and returning bytes.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        decode: Callable[[bytes], Any],
+        encode: Callable[[Any], bytes],
+    ):
+        self.name = name
+        self.decode = decode
+        self.encode = encode
+
+    def __repr__(self) -> str:
+        """Show the library used."""
+        return f'JSONCodec({self.name!r})'
+
+
+def _stdlib() -> JSONCodec:
+    # Same options as requests uses for json= bodies.
+    def encode(value: Any) -> bytes:
+        return json.dumps(value, allow_nan=False).encode('utf-8')
+
+    # json.loads() detects the encoding of bytes itself.
+    return JSONCodec('json', json.loads, encode)
+
+
+def httpx_codec() -> JSONCodec:
+    """Get the standard library's json, with the options httpx uses.
+
+    Default codec of AsyncClient, so json= bodies are sent as httpx would.
+    """
+    def encode(value: Any) -> bytes:
+        return json.dumps(
+            value, ensure_ascii=False, separators=(',', ':'), allow_nan=False,
+        ).encode('utf-8')
+
+    return JSONCodec('json', json.loads, encode)
+
+
+def _orjson() -> JSONCodec:
+    import orjson
+
+    # Keys are converted to str, as json does. NaN is still sent as null.
+    def encode(value: Any) -> bytes:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+    return JSONCodec('orjson', orjson.loads, encode)
+
+
+def _ujson() -> JSONCodec:
+    import ujson
+
+    def encode(value: Any) -> bytes:
+        return ujson.dumps(value, ensure_ascii=False).encode('utf-8')
+
+    return JSONCodec('ujson', ujson.loads, encode)
+
+
+_FACTORIES: Dict[str, Callable[[], JSONCodec]] = {
+    'json': _stdlib,
+    'orjson': _orjson,
+    'ujson': _ujson,
+}
+
+
+def get_codec(name: Optional[str] = None) -> JSONCodec:
+    """Get a JSONCodec by library name.
+
+    orjson and ujson are faster, but don't encode every value like the
+    standard library does, ie: orjson sends NaN as null where json raises.
+
+    Arguments:
+        name: One of 'orjson', 'ujson' or 'json'. If None, the standard
+            library's json is used, as requests does.
+
+    Raises:
+        ImportError: If the library is not installed.
+        ValueError: If the library is not supported.
+    """
+    factory = _FACTORIES.get(name or 'json')
+    if factory is None:
+        raise ValueError(
+            f'Unsupported JSON library "{name}", use one of {PREFERRED}.',
+        )
+    return factory()
+
+
+def fastest_codec() -> JSONCodec:
+    """Get a JSONCodec for the fastest JSON library installed.
+
+    Libraries are tried in the order of PREFERRED.
+    """
+    for name in PREFERRED:
+        try:
+            return _FACTORIES[name]()
+        except ImportError:
+            continue
+    raise ImportError('No JSON library available.')  # pragma: no cover
+
+
+def decode_response(response: Any, codec: JSONCodec) -> Any:
+    """Decode the JSON body of a response from its bytes.
+
+    The result is kept on the response, so the body is only decoded once
+    no matter how many times it is asked for.
+    """
+    decoded = response.__dict__.get(_DECODED, _MISSING)
+    if decoded is _MISSING:
+        decoded = codec.decode(response.content)
+        setattr(response, _DECODED, decoded)
+    return decoded
+
+
+def encode_body(
+    codec: JSONCodec,
+    headers: Dict[str, str],
+    kwargs: Dict[str, Any],
+    body_key: str = 'data',
+) -> None:
+    """Encode a json= argument into a request body.
+
+    Follows requests: json is ignored if a body is already given, and
+    Content-Type is only set if the request doesn't set it.
+
+    Arguments:
+        codec: Codec encoding the body.
+        headers: Headers of the request, updated in place.
+        kwargs: Keyword arguments of the request, updated in place.
+        body_key: Argument taking the encoded bytes.
+
+    Raises:
+        InvalidJSONError: If the body can't be encoded, for requests.
+    """
+    body = kwargs.pop('json', None)
+    if body is None or kwargs.get(body_key) is not None:
+        return
+
+    try:
+        kwargs[body_key] = codec.encode(body)
+    except ValueError as e:
+        # requests raises InvalidJSONError, httpx lets ValueError through.
+        if body_key != 'data':
+            raise
+        raise InvalidJSONError(e) from e
+
+    if not any(k.lower() == 'content-type' for k in headers):
+        headers['Content-Type'] = 'application/json'
@@ -0,0 +1,389 @@
+import json
+import math
+import mmap
+import os
+import re
+import threading
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+# Size of the chunks read from each segment's response.
+CHUNK_SIZE = 256 * 1024
+
+# Segments are never made smaller than this, in bytes.
+MIN_SEGMENT_SIZE = 1024 * 1024
+
+# The state is saved after this many bytes are written, across segments.
+CHECKPOINT_BYTES = 8 * 1024 * 1024
+
+# Suffix of the sidecar file interrupted downloads resume from.
+STATE_SUFFIX = '.inori-download'
+
+# Ranges apply to the encoded body, it must not be compressed.
+IDENTITY = {'Accept-Encoding': 'identity'}
+
+_CONTENT_RANGE = re.compile(r'bytes (\d+)-(\d+)/(\d+|\*)')
+
+
+class DownloadError(Exception):
+    """Raised when a download can't be completed consistently.
+
+    ie: the resource changed between segments, or the server ignored
+    the requested range.
+    """
+
+
+class Segment:
+    """Byte range of a download, from start to end inclusive.
+
+    Attributes:
+        done: Bytes of the segment already written.
+    """
+
+    __slots__ = ('start', 'end', 'done')
+
+    def __init__(self, start: int, end: int, done: int = 0):
+        self.start = start
+        self.end = end
+        self.done = done
+
+    @property
+    def size(self) -> int:
+        """Number of bytes in the segment."""
+        return self.end - self.start + 1
+
+    @property
+    def complete(self) -> bool:
+        """True once every byte of the segment is written."""
+        return self.done >= self.size
+
+    @property
+    def offset(self) -> int:
+        """Position in the file of the next byte to write."""
+        return self.start + self.done
+
+    def range_header(self) -> str:
+        """Get the Range header requesting the bytes not written yet."""
+        return f'bytes={self.offset}-{self.end}'
+
+    def __repr__(self) -> str:
+        """Show the range and progress."""
+        return f'Segment({self.start}, {self.end}, done={self.done})'
+
+
+def plan_segments(
+    size: int, segments: int, min_segment_size: int = MIN_SEGMENT_SIZE,
+) -> List[Segment]:
+    """Split a file into byte ranges of about equal size.
+
+    Arguments:
+        size: Size of the file, in bytes.
+        segments: Maximum number of segments.
+        min_segment_size: Segments are not made smaller than this.
+    """
+    if size <= 0:
+        return []
+
+    count = max(1, min(segments, size // min_segment_size))
+    length = math.ceil(size / count)
+
+    return [
+        Segment(start, min(start + length, size) - 1)
+        for start in range(0, size, length)
+    ]
+
+
+class RemoteFile:
+    """What a HEAD request says about the file to download.
+
+    Attributes:
+        size: Content-Length, or None if it is not known.
+        etag: ETag header, if any.
+        last_modified: Last-Modified header, if any.
+        ranges: True if the server accepts byte ranges.
+    """
+
+    def __init__(self, headers: Mapping[str, str]):
+        length = headers.get('Content-Length')
+        self.size = int(length) if length and length.isdigit() else None
+        self.etag = headers.get('ETag')
+        self.last_modified = headers.get('Last-Modified')
+        self.ranges = headers.get('Accept-Ranges', '').lower() == 'bytes'
+
+    @property
+    def validator(self) -> Optional[str]:
+        """Value for an If-Range header, if the file has a strong one."""
+        if self.etag and not self.etag.startswith('W/'):
+            return self.etag
+        return self.last_modified
+
+    @property
+    def segmentable(self) -> bool:
+        """True if the file can be fetched in byte ranges."""
+        return self.ranges and self.size is not None
+
+
+class DownloadState:
+    """Progress of a download, saved next to the file to resume it.
+
+    Arguments:
+        url: URL of the file.
+        size: Size of the file.
+        etag: ETag of the file, if any.
+        last_modified: Last-Modified of the file, if any.
+        segments: The byte ranges of the file.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        size: int,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        segments: List[Segment],
+    ):
+        self.url = url
+        self.size = size
+        self.etag = etag
+        self.last_modified = last_modified
+        self.segments = segments
+
+    def matches(self, url: str, remote: RemoteFile) -> bool:
+        """Check if the state is for the same version of a file."""
+        return (self.url, self.size, self.etag, self.last_modified) == (
+            url, remote.size, remote.etag, remote.last_modified,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the state as a JSON serializable dict."""
+        return {
+            'url': self.url,
+            'size': self.size,
+            'etag': self.etag,
+            'last_modified': self.last_modified,
+            'segments': [[i.start, i.end, i.done] for i in self.segments],
+        }
+
+    @classmethod
+    def load(cls, path: str) -> Optional['DownloadState']:
+        """Read a saved state, or None if it is missing or invalid."""
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            return cls(
+                data['url'],
+                data['size'],
+                data['etag'],
+                data['last_modified'],
+                [Segment(*i) for i in data['segments']],
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save(self, path: str) -> None:
+        """Write the state, replacing the previous one atomically."""
+        temporary = f'{path}.{threading.get_ident()}.tmp'
+        with open(temporary, 'w') as f:
+            json.dump(self.to_dict(), f)
+        os.replace(temporary, path)
+
+
+class FileWriter:
+    """Write chunks at any position of a preallocated file.
+
+    Uses os.pwrite(), so threads write without seeking or locking. Where
+    pwrite is not available, the file is written through an mmap.
+
+    Arguments:
+        path: The file to write.
+        size: Size to allocate.
+        truncate: If True, existing content is discarded.
+    """
+
+    def __init__(self, path: str, size: int, truncate: bool = True):
+        flags = os.O_RDWR | os.O_CREAT | getattr(os, 'O_BINARY', 0)
+        if truncate:
+            flags |= os.O_TRUNC
+        self.fd = os.open(path, flags, 0o644)
+
+        if os.fstat(self.fd).st_size != size:
+            self._allocate(size)
+
+        self._map: Optional[mmap.mmap] = None
+        if not hasattr(os, 'pwrite') and size:
+            self._map = mmap.mmap(self.fd, size)
+
+    def _allocate(self, size: int) -> None:
+        """Reserve the space up front, so a full disk fails early."""
+        os.ftruncate(self.fd, size)
+        if hasattr(os, 'posix_fallocate') and size:
+            try:
+                os.posix_fallocate(self.fd, 0, size)
+            except OSError:
+                # Not supported by the filesystem, the file stays sparse.
+                pass
+
+    def write(self, offset: int, data: Any) -> None:
+        """Write data at an offset."""
+        if self._map is not None:
+            self._map[offset:offset + len(data)] = data
+            return
+
+        view = memoryview(data)
+        while view:
+            written = os.pwrite(self.fd, view, offset)
+            view = view[written:]
+            offset += written
+
+    def close(self) -> None:
+        """Close the file."""
+        if self._map is not None:
+            self._map.close()
+        os.close(self.fd)
+
+
+def parse_content_range(value: Optional[str]) -> Optional[Tuple[int, int]]:
+    """Get the first and last byte of a Content-Range header."""
+    match = _CONTENT_RANGE.fullmatch((value or '').strip())
+    if match is None:
+        return None
+    return int(match.group(1)), int(match.group(2))
+
+
+class Download:
+    """A segmented download into a file.
+
+    Segments are written straight to their place in the file. Progress is
+    saved in a sidecar file, so an interrupted download resumes from
+    the bytes already written.
+
+    Arguments:
+        path: Where the file is written.
+        url: URL of the file.
+        remote: The file, as described by the HEAD request.
+        segments: Maximum number of segments fetched at once.
+        min_segment_size: Segments are not made smaller than this.
+        resume: If True, continue from a previous state for the same
+            version of the file.
+
+    Attributes:
+        resumed: Bytes already written by a previous attempt.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        url: str,
+        remote: RemoteFile,
+        segments: int = 4,
+        min_segment_size: int = MIN_SEGMENT_SIZE,
+        resume: bool = True,
+    ):
+        self.path = path
+        self.remote = remote
+        self.state_path = f'{path}{STATE_SUFFIX}'
+
+        size = remote.size or 0
+
+        state = self._previous(url) if resume else None
+        if state is None:
+            state = DownloadState(
+                url, size, remote.etag, remote.last_modified,
+                plan_segments(size, segments, min_segment_size),
+            )
+
+        self.state = state
+        self.resumed = sum(i.done for i in state.segments)
+        self.writer = FileWriter(path, size, truncate=not self.resumed)
+
+        self._lock = threading.Lock()
+        self._unsaved = 0
+        self.save()
+
+    def _previous(self, url: str) -> Optional[DownloadState]:
+        """Get the state of a previous attempt at the same file."""
+        if not os.path.exists(self.path):
+            return None
+
+        state = DownloadState.load(self.state_path)
+        if state is None or not state.matches(url, self.remote):
+            return None
+        return state
+
+    def pending(self) -> List[Segment]:
+        """Get the segments not fully written yet."""
+        return [i for i in self.state.segments if not i.complete]
+
+    def headers(self, segment: Segment) -> Dict[str, str]:
+        """Get the headers requesting what is left of a segment."""
+        headers = {'Range': segment.range_header()}
+
+        # The server sends the whole file if it changed, instead of a range.
+        validator = self.remote.validator
+        if validator is not None:
+            headers['If-Range'] = validator
+
+        return headers
+
+    def check(self, segment: Segment, status_code: int, headers: Any) -> None:
+        """Verify a response is the requested range of the same file.
+
+        Raises:
+            DownloadError: If it is not.
+        """
+        if status_code != 206:
+            raise DownloadError(
+                f'Expected a partial response for {segment!r}, '
+                f'got {status_code}. The file may have changed.',
+            )
+
+        etag = headers.get('ETag')
+        if self.remote.etag and etag and etag != self.remote.etag:
+            raise DownloadError(
+                f'ETag changed from {self.remote.etag} to {etag}.',
+            )
+
+        received = parse_content_range(headers.get('Content-Range'))
+        if received != (segment.offset, segment.end):
+            raise DownloadError(
+                f'Expected bytes {segment.offset}-{segment.end}, '
+                f'got {headers.get("Content-Range")}.',
+            )
+
+    def write(self, segment: Segment, chunk: Any) -> None:
+        """Write a chunk of a segment, saving progress now and then."""
+        size = len(chunk)
+        if size > segment.size - segment.done:
+            raise DownloadError(f'Received too many bytes for {segment!r}.')
+
+        self.writer.write(segment.offset, chunk)
+        segment.done += size
+
+        with self._lock:
+            self._unsaved += size
+            due = self._unsaved >= CHECKPOINT_BYTES or segment.complete
+        if due:
+            self.save()
+
+    def save(self) -> None:
+        """Save the progress to the sidecar file."""
+        with self._lock:
+            self._unsaved = 0
+            self.state.save(self.state_path)
+
+    def close(self, complete: bool) -> None:
+        """Close the file. The sidecar file is removed once complete.
+
+        Raises:
+            DownloadError: If complete but some segments are not.
+        """
+        self.writer.close()
+
+        if not complete:
+            self.save()
+            return
+
+        if self.pending():
+            self.save()
+            raise DownloadError('Some segments were not received in full.')
+
+        os.remove(self.state_path)
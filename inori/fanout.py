@@ -0,0 +1,267 @@
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import (
+    Any, AsyncIterator, Callable, Deque, Iterable, Iterator, List, Optional,
+)
+
+
+class Result:
+    """The outcome of a single request made by a fan-out.
+
+    Arguments:
+        index: Position of the item in the iterable that was given.
+        item: The item the request was made for.
+        response: The response, if the request succeeded.
+        exception: The exception raised, if the request failed.
+        elapsed: Time taken by the request, in seconds.
+    """
+
+    def __init__(
+        self,
+        index: int,
+        item: Any,
+        response: Any = None,
+        exception: Optional[BaseException] = None,
+        elapsed: float = 0.0,
+    ):
+        self.index = index
+        self.item = item
+        self.response = response
+        self.exception = exception
+        self.elapsed = elapsed
+
+    @property
+    def ok(self) -> bool:
+        """True if the request did not raise an exception."""
+        return self.exception is None
+
+    def __repr__(self):  # NOQA
+        outcome = self.response if self.ok else repr(self.exception)
+        return f'Result: <{self.index}: {outcome}>'
+
+
+class Stats:
+    """Aggregate numbers for a fan-out, updated as results arrive."""
+
+    def __init__(self):
+        self.total = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.started: Optional[float] = None
+        self.elapsed = 0.0
+
+    def record(self, result: Result) -> None:
+        """Count a result."""
+        if self.started is None:
+            self.started = time.perf_counter()
+
+        self.total += 1
+        if result.ok:
+            self.succeeded += 1
+        else:
+            self.failed += 1
+
+        self.elapsed = time.perf_counter() - self.started
+
+    @property
+    def throughput(self) -> float:
+        """Requests completed per second."""
+        if not self.elapsed:
+            return 0.0
+        return self.total / self.elapsed
+
+    def __repr__(self):  # NOQA
+        return (
+            f'Stats: <{self.total} requests, {self.failed} failed, '
+            f'{self.throughput:.1f} requests/s>'
+        )
+
+
+def _timed(fn: Callable[[Any], Any], index: int, item: Any) -> Result:
+    """Run fn(item), capturing the response or the exception."""
+    start = time.perf_counter()
+    try:
+        response = fn(item)
+    except Exception as e:
+        return Result(index, item, exception=e, elapsed=_since(start))
+    return Result(index, item, response=response, elapsed=_since(start))
+
+
+async def _timed_async(
+    fn: Callable[[Any], Any], index: int, item: Any,
+) -> Result:
+    """Await fn(item), capturing the response or the exception."""
+    start = time.perf_counter()
+    try:
+        response = await fn(item)
+    except Exception as e:
+        return Result(index, item, exception=e, elapsed=_since(start))
+    return Result(index, item, response=response, elapsed=_since(start))
+
+
+def _since(start: float) -> float:
+    return time.perf_counter() - start
+
+
+class _Window:
+    """Keep at most `size` items of an iterable in flight.
+
+    Arguments:
+        items: The items to start.
+        size: Maximum number of items in flight.
+        start: Function taking an index and an item, returning a future.
+    """
+
+    def __init__(
+        self,
+        items: Iterable[Any],
+        size: int,
+        start: Callable[[int, Any], Any],
+    ):
+        self.source = enumerate(items)
+        self.start = start
+        self.pending: Deque = deque()
+
+        for _ in range(size):
+            if not self.submit():
+                break
+
+    def submit(self) -> bool:
+        """Start the next item, if there is one."""
+        for index, item in self.source:
+            self.pending.append(self.start(index, item))
+            return True
+        return False
+
+    def take(self, done: Iterable[Any]) -> None:
+        """Remove finished futures, starting one new item for each."""
+        for future in done:
+            self.pending.remove(future)
+            self.submit()
+
+
+def run_threaded(
+    fn: Callable[[Any], Any],
+    items: Iterable[Any],
+    max_concurrency: int,
+    ordered: bool,
+) -> Iterator[Result]:
+    """Call fn for every item on a thread pool.
+
+    At most max_concurrency items are in flight at once, items are only
+    taken from the iterable as workers become free.
+
+    Arguments:
+        fn: Function taking one item.
+        items: The items to call fn with.
+        max_concurrency: Maximum number of calls running at once.
+        ordered: If True, results are yielded in the order of the items.
+            Else they are yielded as they complete.
+    """
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        window = _Window(
+            items,
+            max_concurrency,
+            lambda index, item: executor.submit(_timed, fn, index, item),
+        )
+
+        while window.pending:
+            if ordered:
+                done = [window.pending[0]]
+            else:
+                done, _ = wait(window.pending, return_when=FIRST_COMPLETED)
+
+            window.take(done)
+            for future in done:
+                yield future.result()
+
+
+async def run_async(
+    fn: Callable[[Any], Any],
+    items: Iterable[Any],
+    max_concurrency: int,
+    ordered: bool,
+) -> AsyncIterator[Result]:
+    """Await fn for every item on the running event loop.
+
+    Accepts the same arguments as run_threaded().
+    """
+    window = _Window(
+        items,
+        max_concurrency,
+        lambda index, item: asyncio.ensure_future(
+            _timed_async(fn, index, item),
+        ),
+    )
+
+    while window.pending:
+        waiting = [window.pending[0]] if ordered else window.pending
+        done, _ = await asyncio.wait(waiting, return_when=FIRST_COMPLETED)
+
+        window.take(done)
+        for task in done:
+            yield task.result()
+
+
+class Batch:
+    """Results of a fan-out, streamed as they become available.
+
+    Requests are only made while the Batch is iterated over.
+    A failed request does not stop the others, its exception is stored in
+    the Result.
+
+    Example:
+        >>> batch = client.items.map('GET', ({'itemId': i} for i in ids))
+        >>> for result in batch:
+        >>>     if result.ok:
+        >>>         print(result.response.json())
+        >>> print(batch.stats.throughput)
+
+    Attributes:
+        stats: Aggregate numbers for the results received so far.
+    """
+
+    def __init__(self, results: Iterator[Result]):
+        self._results = results
+        self.stats = Stats()
+
+    def __iter__(self) -> Iterator[Result]:
+        """Make the requests, yielding each Result."""
+        self.stats.started = time.perf_counter()
+        for result in self._results:
+            self.stats.record(result)
+            yield result
+
+    def results(self) -> List[Result]:
+        """Make all the requests and return every Result."""
+        return list(self)
+
+
+class AsyncBatch(Batch):
+    """Results of a fan-out made on the event loop.
+
+    Example:
+        >>> batch = client.items.map('GET', ({'itemId': i} for i in ids))
+        >>> async for result in batch:
+        >>>     print(result.response.json())
+    """
+
+    def __init__(self, results: AsyncIterator[Result]):
+        self._results = results
+        self.stats = Stats()
+
+    def __iter__(self):  # NOQA D105
+        raise TypeError('AsyncBatch must be used with async for.')
+
+    async def __aiter__(self) -> AsyncIterator[Result]:
+        """Make the requests, yielding each Result."""
+        self.stats.started = time.perf_counter()
+        async for result in self._results:
+            self.stats.record(result)
+            yield result
+
+    async def results(self) -> List[Result]:
+        """Make all the requests and return every Result."""
+        return [result async for result in self]
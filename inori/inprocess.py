@@ -0,0 +1,309 @@
+import asyncio
+import http
+import inspect
+import io
+import sys
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import unquote, unquote_to_bytes, urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers, requote_uri
+
+from .transport import (
+    Transport, apply_auth, check_kwargs, encode_data, encode_params,
+)
+from .upload import BYTES_LIKE, iter_chunks
+
+# Keyword arguments of Route.request() the in-process transports accept.
+# There is no network, timeout is ignored.
+IN_PROCESS_KWARGS = frozenset(('params', 'data', 'timeout', 'stream'))
+
+# Base URI used by Client.for_app() when none is given.
+APP_BASE_URI = 'http://testserver/'
+
+# Address the app sees requests coming from.
+CLIENT_ADDRESS = ('127.0.0.1', 50000)
+
+_DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def is_asgi(app: Any) -> bool:
+    """Check if an app is an ASGI app, rather than a WSGI one."""
+    if inspect.iscoroutinefunction(app):
+        return True
+    # Apps can be objects with an async __call__, ie: Starlette.
+    return inspect.iscoroutinefunction(type(app).__call__)
+
+
+class _Request:
+    """A request rendered for an app: URL parts, headers and body."""
+
+    def __init__(
+        self,
+        client: Any,
+        http_method: str,
+        url: str,
+        headers: Dict[str, str],
+        kwargs: Dict[str, Any],
+    ):
+        self.http_method = http_method.upper()
+        # Quoted like requests does, ie: non-ASCII characters of the path.
+        self.url = requote_uri(encode_params(url, kwargs.get('params')))
+
+        headers = apply_auth(client.auth, http_method, self.url, headers)
+        self.headers: CaseInsensitiveDict = CaseInsensitiveDict(headers)
+        self.body = _read(encode_data(kwargs.get('data'), self.headers))
+
+        self.parts = urlsplit(self.url)
+        self.headers.setdefault('Host', self.parts.netloc)
+        self.port = self.parts.port or _DEFAULT_PORTS[self.parts.scheme]
+
+
+def _read(body: Any) -> bytes:
+    """Read a whole body, apps get it in one piece."""
+    if body is None:
+        return b''
+    if isinstance(body, bytes):
+        return body
+    if isinstance(body, BYTES_LIKE):
+        return bytes(body)
+    return b''.join(bytes(i) for i in iter_chunks(body))
+
+
+def _response(
+    request: _Request,
+    status: int,
+    reason: str,
+    headers: Iterable[Tuple[str, str]],
+    content: bytes,
+) -> requests.Response:
+    """Build a requests.Response from what the app sent."""
+    response = requests.Response()
+    response.status_code = status
+    response.reason = reason
+    response.url = request.url
+
+    merged: CaseInsensitiveDict = CaseInsensitiveDict()
+    for name, value in headers:
+        # Repeated headers are joined, as urllib3 does.
+        previous = merged.get(name)
+        merged[name] = value if previous is None else f'{previous}, {value}'
+    response.headers = merged
+
+    response.encoding = get_encoding_from_headers(merged)
+    response._content = content
+    response._content_consumed = True
+    response.raw = io.BytesIO(content)
+    return response
+
+
+class WSGITransport(Transport):
+    """Send requests to a WSGI app, in the same process.
+
+    No socket is opened: the app is called with an environ built from the
+    request. Responses are requests.Response objects.
+
+    Bodies are read in full before calling the app, and responses are
+    read in full before being returned, even when streamed. Redirects
+    are returned, not followed.
+
+    Arguments:
+        app: The WSGI app.
+    """
+
+    def __init__(self, app: Callable[..., Iterable[bytes]]):
+        self.app = app
+
+    def send(
+        self,
+        client: Any,
+        http_method: str,
+        url: str,
+        headers: Dict[str, str],
+        **kwargs: Any,
+    ) -> requests.Response:
+        """Call the app with a request.
+
+        Raises:
+            TypeError: For keyword arguments the transport can't send.
+        """
+        check_kwargs(self, kwargs, IN_PROCESS_KWARGS)
+        request = _Request(client, http_method, url, headers, kwargs)
+
+        started: List[Any] = []
+        written: List[bytes] = []
+
+        def start_response(
+            status: str, response_headers: List[Tuple[str, str]],
+            exc_info: Any = None,
+        ) -> Callable[[bytes], None]:
+            started[:] = [status, response_headers]
+            return written.append
+
+        result = self.app(self.environ(request), start_response)
+        try:
+            written.extend(result)
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+
+        status, response_headers = started
+        code, _, reason = status.partition(' ')
+        return _response(
+            request, int(code), reason, response_headers, b''.join(written),
+        )
+
+    @staticmethod
+    def environ(request: _Request) -> Dict[str, Any]:
+        """Build the WSGI environ of a request, see PEP 3333."""
+        parts = request.parts
+        environ = {
+            'REQUEST_METHOD': request.http_method,
+            'SCRIPT_NAME': '',
+            # Native strings holding the bytes of the path, as latin-1.
+            'PATH_INFO': unquote_to_bytes(parts.path).decode('latin-1'),
+            'QUERY_STRING': parts.query,
+            'SERVER_NAME': parts.hostname or '',
+            'SERVER_PORT': str(request.port),
+            'SERVER_PROTOCOL': 'HTTP/1.1',
+            'REMOTE_ADDR': CLIENT_ADDRESS[0],
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': parts.scheme,
+            'wsgi.input': io.BytesIO(request.body),
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+        }
+
+        if request.body:
+            environ['CONTENT_LENGTH'] = str(len(request.body))
+
+        for name, value in request.headers.items():
+            key = name.upper().replace('-', '_')
+            if key not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+                key = f'HTTP_{key}'
+            environ[key] = value
+
+        return environ
+
+
+class ASGITransport(Transport):
+    """Send requests to an ASGI app, in the same process.
+
+    No socket is opened: the app is called with an HTTP scope built from
+    the request, on an event loop owned by the transport. Calls are made
+    one at a time. Lifespan events are not sent.
+
+    For use with Client. AsyncClient.for_app() calls ASGI apps with httpx
+    instead, on the running event loop.
+
+    Bodies and responses are read in full, even when streamed. Redirects
+    are returned, not followed.
+
+    Arguments:
+        app: The ASGI app.
+    """
+
+    def __init__(self, app: Callable[..., Any]):
+        self.app = app
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    def send(
+        self,
+        client: Any,
+        http_method: str,
+        url: str,
+        headers: Dict[str, str],
+        **kwargs: Any,
+    ) -> requests.Response:
+        """Call the app with a request.
+
+        Raises:
+            TypeError: For keyword arguments the transport can't send.
+        """
+        check_kwargs(self, kwargs, IN_PROCESS_KWARGS)
+        request = _Request(client, http_method, url, headers, kwargs)
+
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+            return self._loop.run_until_complete(self._call(request))
+
+    async def _call(self, request: _Request) -> requests.Response:
+        messages = [
+            {'type': 'http.request', 'body': request.body, 'more_body': False},
+        ]
+        sent: List[Dict[str, Any]] = []
+        complete = asyncio.Event()
+
+        async def receive() -> Dict[str, Any]:
+            if messages:
+                return messages.pop()
+            # Nothing more to read, until the response is sent.
+            await complete.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message: Dict[str, Any]) -> None:
+            sent.append(message)
+            if not message.get('more_body', False):
+                complete.set()
+
+        await self.app(self.scope(request), receive, send)
+        complete.set()
+
+        return self._response(request, sent)
+
+    @staticmethod
+    def _response(
+        request: _Request, sent: List[Dict[str, Any]],
+    ) -> requests.Response:
+        start = next(i for i in sent if i['type'] == 'http.response.start')
+        status = start['status']
+        headers = [
+            (k.decode('latin-1'), v.decode('latin-1'))
+            for k, v in start.get('headers', [])
+        ]
+        content = b''.join(
+            i.get('body', b'') for i in sent
+            if i['type'] == 'http.response.body'
+        )
+
+        try:
+            reason = http.HTTPStatus(status).phrase
+        except ValueError:
+            reason = ''
+        return _response(request, status, reason, headers, content)
+
+    @staticmethod
+    def scope(request: _Request) -> Dict[str, Any]:
+        """Build the ASGI HTTP scope of a request."""
+        parts = request.parts
+        return {
+            'type': 'http',
+            'asgi': {'version': '3.0', 'spec_version': '2.3'},
+            'http_version': '1.1',
+            'method': request.http_method,
+            'scheme': parts.scheme,
+            'path': unquote(parts.path),
+            'raw_path': parts.path.encode('latin-1'),
+            'query_string': parts.query.encode('latin-1'),
+            'root_path': '',
+            'headers': [
+                (k.lower().encode('latin-1'), v.encode('latin-1'))
+                for k, v in request.headers.items()
+            ],
+            'client': CLIENT_ADDRESS,
+            'server': (parts.hostname, request.port),
+        }
+
+    def close(self) -> None:
+        """Close the transport's event loop."""
+        with self._lock:
+            if self._loop is not None:
+                self._loop.close()
+                self._loop = None
@@ -1,18 +1,27 @@
-from typing import Dict
+import logging
+from collections import ChainMap
+from typing import Mapping, Optional
 
 
 class Logging:
     """Convenience class to control logging hooks for the Client.
 
+    Messages are only formatted when the logger is enabled for INFO, so
+    the hooks cost nothing when logging is off.
+
     request_message: String that will be formatted with
         request_metadata and sent to the logger when a request is made.
 
     response_message: String that will be formatted with
         response_metadata and sent to the logger after a request is made.
+
+    max_body_length: If set, request and response bodies longer than this
+        are truncated in the logged messages.
     """
 
-    def __init__(self, logger):
+    def __init__(self, logger, max_body_length: Optional[int] = None):
         self.logger = logger
+        self.max_body_length = max_body_length
 
         # Default logger messages
         self.request_message = (
@@ -28,28 +37,57 @@ class Logging:
             '\n Body: {text}'
         )
 
-    def log_request(self, metadata: Dict[str, str]) -> str:
+    def truncate(self, body: object) -> str:
+        """Shorten a body to max_body_length characters.
+
+        Arguments:
+            body: The body to shorten.
+
+        Returns: The body as a string.
+        """
+        text = str(body)
+        limit = self.max_body_length
+
+        if limit is None or len(text) <= limit:
+            return text
+        return f'{text[:limit]}... ({len(text)} characters)'
+
+    def _format(self, message: str, metadata: Mapping, body_key: str) -> str:
+        """Format a message, only reading the metadata the message uses."""
+        if self.max_body_length is not None and body_key in metadata:
+            body = self.truncate(metadata[body_key])
+            metadata = ChainMap({body_key: body}, metadata)
+
+        return message.format_map(metadata)
+
+    def log_request(self, metadata: Mapping[str, str]) -> Optional[str]:
         """Log request info.
 
         Arguments:
             metadata: The content of the metadata will be formatted into
             self.request_message.
 
-        Returns: The formatted message.
+        Returns: The formatted message, or None if the logger is disabled.
         """
-        message = self.request_message.format(**metadata)
+        if not self.logger.isEnabledFor(logging.INFO):
+            return None
+
+        message = self._format(self.request_message, metadata, 'data')
         self.logger.info(message)
         return message
 
-    def log_response(self, metadata: Dict[str, str]) -> str:
+    def log_response(self, metadata: Mapping[str, str]) -> Optional[str]:
         """Log response info.
 
         Arguments:
             metadata: The content of the metadata will be formatted into
             self.response_message.
 
-        Returns: The formatted message.
+        Returns: The formatted message, or None if the logger is disabled.
         """
-        message = self.response_message.format(**metadata)
+        if not self.logger.isEnabledFor(logging.INFO):
+            return None
+
+        message = self._format(self.response_message, metadata, 'text')
         self.logger.info(message)
         return message
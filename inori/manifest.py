@@ -0,0 +1,79 @@
+import json
+import os
+import re
+from typing import Any, List, Mapping, Optional, Union
+
+# OpenAPI path parameters, ie: {petId}, but not ${petId}
+PARAMETER = re.compile(r'(?<!\$){([^}]+)}')
+
+
+class Manifest:
+    """The routes described by a document.
+
+    Attributes:
+        base_uri: Base URI for the API, if the document has one.
+        paths: Paths using the Client.add_route() template syntax.
+    """
+
+    def __init__(self, base_uri: Optional[str], paths: List[str]):
+        self.base_uri = base_uri
+        self.paths = paths
+
+
+def template_path(path: str) -> str:
+    """Convert an OpenAPI path to the Client.add_route() template syntax.
+
+    Example:
+        >>> template_path('/pets/{pet-id}')
+        '/pets/${pet_id}'
+    """
+    return PARAMETER.sub(
+        lambda m: '${' + re.sub(r'\W', '_', m.group(1)) + '}', path,
+    )
+
+
+def _with_slash(uri: str) -> str:
+    return uri if uri.endswith('/') else f'{uri}/'
+
+
+def _base_uri(document: Mapping[str, Any]) -> Optional[str]:
+    """Find the base URI in a manifest, an OpenAPI 3 or a Swagger 2 spec."""
+    if 'base_uri' in document:
+        return document['base_uri']
+
+    servers = document.get('servers') or [{}]
+    url = servers[0].get('url', '')
+    if '://' in url:
+        return _with_slash(url)
+
+    if 'host' in document:
+        scheme = (document.get('schemes') or ['https'])[0]
+        base_path = document.get('basePath', '/').strip('/')
+        return _with_slash(f'{scheme}://{document["host"]}/{base_path}')
+
+    return None
+
+
+def load_manifest(source: Union[str, os.PathLike, Mapping, List]) -> Manifest:
+    """Read the routes from an OpenAPI spec or a JSON route manifest.
+
+    Route manifests are either a list of paths, or an object:
+
+    Example:
+        {"base_uri": "https://foo.com/v1/", "paths": ["pets/${petId}"]}
+
+    Arguments:
+        source: Path to a JSON file, or the decoded document.
+
+    Returns:
+        Manifest: The base URI and the paths found.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding='utf-8') as f:
+            source = json.load(f)
+
+    if isinstance(source, list):
+        return Manifest(None, [template_path(p) for p in source])
+
+    paths = [template_path(p) for p in source.get('paths', [])]
+    return Manifest(_base_uri(source), paths)
@@ -0,0 +1,459 @@
+import bisect
+import contextlib
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import urlencode
+
+from . import upload
+
+# Upper bounds of the latency histogram buckets, in seconds.
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class Histogram:
+    """Count observations in buckets.
+
+    Arguments:
+        buckets: Upper bounds of the buckets, in increasing order.
+            A last bucket holds the values above every bound.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Count a value."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """Get each upper bound with the number of values up to it."""
+        rv = []
+        total = 0
+        for bound, count in zip((*self.buckets, float('inf')), self.counts):
+            total += count
+            rv.append((bound, total))
+        return rv
+
+
+class Series:
+    """Measurements for one route template and HTTP method.
+
+    Each Series has its own lock, requests to different Routes do not
+    contend.
+
+    Attributes:
+        requests: Requests completed, with or without a response.
+        statuses: Responses, by status class, ie: '2xx'.
+        errors: Requests that raised, by exception name.
+        bytes_in: Size of the response bodies.
+        bytes_out: Size of the request bodies.
+        latency: Histogram of request durations, in seconds.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.requests = 0
+        self.statuses: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.latency = Histogram(buckets)
+        self.lock = threading.Lock()
+
+    def record(
+        self,
+        elapsed: float,
+        response: Any = None,
+        error: Optional[BaseException] = None,
+        bytes_in: int = 0,
+        bytes_out: int = 0,
+    ) -> None:
+        """Count a completed request."""
+        with self.lock:
+            self.requests += 1
+            self.latency.observe(elapsed)
+            self.bytes_in += bytes_in
+            self.bytes_out += bytes_out
+
+            if error is not None:
+                name = type(error).__name__
+                self.errors[name] = self.errors.get(name, 0) + 1
+            else:
+                status = f'{response.status_code // 100}xx'
+                self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get a copy of the measurements."""
+        with self.lock:
+            return {
+                'requests': self.requests,
+                'statuses': dict(self.statuses),
+                'errors': dict(self.errors),
+                'bytes_in': self.bytes_in,
+                'bytes_out': self.bytes_out,
+                'latency': {
+                    'count': self.latency.count,
+                    'sum': self.latency.sum,
+                    'buckets': self.latency.cumulative(),
+                },
+            }
+
+
+class Observation:
+    """A request being measured. The response is set once received.
+
+    bytes_out is the size of the request body, measured before it is sent,
+    or None if it is not known.
+    """
+
+    __slots__ = ('response', 'stream', 'bytes_out')
+
+    def __init__(self, stream: bool = False, bytes_out: Optional[int] = 0):
+        self.response: Any = None
+        self.stream = stream
+        self.bytes_out = bytes_out
+
+
+def body_size(body: Any) -> int:
+    """Get the size of a request body, or 0 if it is not known."""
+    if isinstance(body, (bytes, bytearray, str)):
+        return len(body)
+    return 0
+
+
+def response_size(response: Any, stream: bool) -> int:
+    """Get the size of a response body without reading a streamed one."""
+    length = response.headers.get('Content-Length')
+    if length is not None and length.isdigit():
+        return int(length)
+    if stream:
+        return 0
+    return len(response.content)
+
+
+def sent_size(body: Any) -> Optional[int]:
+    """Get the size of a request body before it is sent, if it is known.
+
+    Forms are measured as they are encoded. Bodies read as they are sent,
+    ie: generators, give None.
+    """
+    if body is None:
+        return 0
+    if isinstance(body, dict):
+        body = urlencode(body, doseq=True)
+    if isinstance(body, str):
+        return len(body.encode('utf-8'))
+
+    # UploadBody knows its size.
+    size = getattr(body, 'len', None)
+    return size if size is not None else upload.body_size(body)
+
+
+def request_size(response: Any) -> int:
+    """Get the size of the request body that got a response."""
+    request = getattr(response, 'request', None)
+    if request is None:
+        return 0
+    # requests.PreparedRequest has body, a read httpx.Request has _content.
+    body = getattr(request, 'body', None)
+    if body is None:
+        body = getattr(request, '_content', None)
+    return body_size(body)
+
+
+def requests_pools(session: Any) -> Dict[str, Dict[str, int]]:
+    """Describe the connection pools of a requests.Session."""
+    pools: Dict[str, Dict[str, int]] = {}
+    adapters = getattr(session, 'adapters', {})
+
+    for adapter in {id(a): a for a in adapters.values()}.values():
+        manager = getattr(adapter, 'poolmanager', None)
+        if manager is not None:
+            pools.update(urllib3_pools(manager))
+
+    return pools
+
+
+def urllib3_pools(manager: Any) -> Dict[str, Dict[str, int]]:
+    """Describe the connection pools of a urllib3.PoolManager."""
+    pools: Dict[str, Dict[str, int]] = {}
+
+    for key in manager.pools.keys():
+        pool = manager.pools.get(key)
+        if pool is None or pool.pool is None:
+            continue
+
+        maxsize = pool.pool.maxsize
+        pools[f'{pool.scheme}://{pool.host}:{pool.port}'] = {
+            'in_use': maxsize - pool.pool.qsize(),
+            'max_size': maxsize,
+            'opened': pool.num_connections,
+        }
+
+    return pools
+
+
+def httpx_pools(session: Any) -> Dict[str, Dict[str, int]]:
+    """Describe the connection pool of an httpx.AsyncClient."""
+    pool = getattr(getattr(session, '_transport', None), '_pool', None)
+    if pool is None:
+        return {}
+
+    connections = list(pool.connections)
+    return {
+        'all': {
+            'in_use': sum(1 for c in connections if not c.is_idle()),
+            'max_size': pool._max_connections,
+            'opened': len(connections),
+        },
+    }
+
+
+def pool_stats(session: Any) -> Dict[str, Dict[str, int]]:
+    """Describe the connection pools of a session, if it can be read.
+
+    Accepts a requests.Session, an httpx.AsyncClient, or a transport
+    with a urllib3.PoolManager, ie: Urllib3Transport.
+    """
+    if session is None:
+        return {}
+    if hasattr(session, 'adapters'):
+        return requests_pools(session)
+    if hasattr(session, 'poolmanager'):
+        return urllib3_pools(session.poolmanager)
+    return httpx_pools(session)
+
+
+class Metrics:
+    """Collect request metrics for a Client.
+
+    Requests are counted per route template, ie: /users/${userId}, and
+    per HTTP method. Rendered URLs are never used, so the number of
+    series is bounded by the number of Routes.
+
+    Example:
+        >>> client = Client('http://my.service/api/v777')
+        >>> client.settings_.metrics = Metrics()
+        >>> client.settings_.metrics.snapshot()
+        >>> print(client.settings_.metrics.prometheus())
+
+    Arguments:
+        buckets: Upper bounds of the latency histogram buckets, in seconds.
+
+    Attributes:
+        in_flight: Requests currently being sent.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.in_flight = 0
+
+        self._series: Dict[Tuple[str, str], Series] = {}
+        self._lock = threading.Lock()
+        self._flight_lock = threading.Lock()
+        self._session: Any = None
+
+    def series(self, route: str, http_method: str) -> Series:
+        """Get the Series for a route template and method."""
+        key = (route, http_method)
+        series = self._series.get(key)
+        if series is None:
+            with self._lock:
+                series = self._series.setdefault(key, Series(self.buckets))
+        return series
+
+    @contextlib.contextmanager
+    def measure(
+        self,
+        route: str,
+        http_method: str,
+        session: Any = None,
+        stream: bool = False,
+        bytes_out: Optional[int] = None,
+    ) -> Iterator[Observation]:
+        """Measure a request.
+
+        Example:
+            >>> with metrics.measure(template, 'GET') as observation:
+            >>>     observation.response = send()
+
+        Arguments:
+            route: The route template.
+            http_method: HTTP method of the request.
+            session: The session sending the request. Its connection pools
+                are reported by snapshot().
+            stream: If True, the response body is not read to be measured.
+            bytes_out: Size of the request body, see sent_size(). If None,
+                it is read from the request of the response, when there is
+                one.
+        """
+        self._session = session
+        observation = Observation(stream, bytes_out)
+
+        with self._flight_lock:
+            self.in_flight += 1
+
+        start = time.perf_counter()
+        try:
+            yield observation
+        except Exception as e:
+            self._record(route, http_method, start, error=e)
+            raise
+        else:
+            self._record(route, http_method, start, observation)
+        finally:
+            with self._flight_lock:
+                self.in_flight -= 1
+
+    def _record(
+        self,
+        route: str,
+        http_method: str,
+        start: float,
+        observation: Optional[Observation] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        elapsed = time.perf_counter() - start
+        series = self.series(route, http_method)
+
+        response = observation and observation.response
+        if response is None:
+            series.record(elapsed, error=error)
+            return
+
+        bytes_out = observation.bytes_out  # type: ignore
+        if bytes_out is None:
+            bytes_out = request_size(response)
+
+        series.record(
+            elapsed,
+            response,
+            bytes_in=response_size(response, observation.stream),
+            bytes_out=bytes_out,
+        )
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get a copy of every measurement.
+
+        Returns:
+            dict: The series, the requests in flight and the connection
+                pools of the Client's session.
+        """
+        with self._lock:
+            items = list(self._series.items())
+
+        return {
+            'routes': [
+                {'route': route, 'method': method, **series.snapshot()}
+                for (route, method), series in items
+            ],
+            'in_flight': self.in_flight,
+            'pools': pool_stats(self._session),
+        }
+
+    def prometheus(self, prefix: str = 'inori') -> str:
+        """Render the measurements in the Prometheus text format."""
+        return render_prometheus(self.snapshot(), prefix)
+
+
+def _escape(value: str) -> str:
+    return (
+        value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    )
+
+
+def _labels(**labels: Any) -> str:
+    return ','.join(f'{k}="{_escape(str(v))}"' for k, v in labels.items())
+
+
+def _bound(value: float) -> str:
+    return '+Inf' if value == float('inf') else repr(value)
+
+
+def _route_lines(
+    prefix: str, series: Dict[str, Any],
+) -> Iterator[Tuple[str, str]]:
+    """Render the lines of one series, with the metric each belongs to."""
+    base = {'route': series['route'], 'method': series['method']}
+    labels = _labels(**base)
+
+    for status, count in series['statuses'].items():
+        status_labels = _labels(**base, status=status)
+        yield 'requests_total', (
+            f'{prefix}_requests_total{{{status_labels}}} {count}'
+        )
+
+    for error, count in series['errors'].items():
+        error_labels = _labels(**base, error=error)
+        yield 'request_errors_total', (
+            f'{prefix}_request_errors_total{{{error_labels}}} {count}'
+        )
+
+    for name, field in (
+        ('response_bytes_total', 'bytes_in'),
+        ('request_bytes_total', 'bytes_out'),
+    ):
+        yield name, f'{prefix}_{name}{{{labels}}} {series[field]}'
+
+    latency = series['latency']
+    histogram = f'{prefix}_request_duration_seconds'
+    for bound, count in latency['buckets']:
+        bucket = _labels(**base, le=_bound(bound))
+        yield 'request_duration_seconds', (
+            f'{histogram}_bucket{{{bucket}}} {count}'
+        )
+    yield 'request_duration_seconds', (
+        f'{histogram}_sum{{{labels}}} {latency["sum"]}'
+    )
+    yield 'request_duration_seconds', (
+        f'{histogram}_count{{{labels}}} {latency["count"]}'
+    )
+
+
+# Name, type and help of every metric, in rendering order.
+METRIC_TYPES = (
+    ('requests_total', 'counter', 'Responses by status class.'),
+    ('request_errors_total', 'counter', 'Requests that raised, by error.'),
+    ('response_bytes_total', 'counter', 'Size of the response bodies.'),
+    ('request_bytes_total', 'counter', 'Size of the request bodies.'),
+    ('request_duration_seconds', 'histogram', 'Request duration.'),
+)
+
+
+def render_prometheus(snapshot: Dict[str, Any], prefix: str = 'inori') -> str:
+    """Render a snapshot in the Prometheus text format.
+
+    Arguments:
+        snapshot: The result of Metrics.snapshot().
+        prefix: Prefix of every metric name.
+    """
+    grouped: Dict[str, List[str]] = {name: [] for name, _, _ in METRIC_TYPES}
+    for series in snapshot['routes']:
+        for name, line in _route_lines(prefix, series):
+            grouped[name].append(line)
+
+    lines = []
+    for name, kind, description in METRIC_TYPES:
+        lines.append(f'# HELP {prefix}_{name} {description}')
+        lines.append(f'# TYPE {prefix}_{name} {kind}')
+        lines.extend(grouped[name])
+
+    lines.append(f'# TYPE {prefix}_requests_in_flight gauge')
+    lines.append(f'{prefix}_requests_in_flight {snapshot["in_flight"]}')
+
+    for field in ('in_use', 'max_size', 'opened'):
+        lines.append(f'# TYPE {prefix}_pool_connections_{field} gauge')
+        for host, pool in snapshot['pools'].items():
+            lines.append(
+                f'{prefix}_pool_connections_{field}{{{_labels(pool=host)}}} '
+                f'{pool[field]}',
+            )
+
+    return '\n'.join(lines) + '\n'
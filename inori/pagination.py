@@ -0,0 +1,316 @@
+import asyncio
+import queue
+import threading
+from typing import (
+    Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple,
+)
+from urllib.parse import urljoin
+
+# Items of a page, and the request kwargs for the next page.
+PageResult = Tuple[List[Any], Optional[Dict[str, Any]]]
+
+
+def get_field(data: Any, field: Optional[str]) -> Any:
+    """Get a value from decoded JSON using a dotted path.
+
+    Arguments:
+        data: Decoded JSON.
+        field: Path to the value, ie: 'meta.next'. If None, data is returned.
+
+    Returns:
+        The value, or None if the path does not exist.
+    """
+    if field is None:
+        return data
+
+    for key in field.split('.'):
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+
+    return data
+
+
+def with_params(kwargs: Dict[str, Any], **params: Any) -> Dict[str, Any]:
+    """Copy request kwargs, updating the query parameters."""
+    return {**kwargs, 'params': {**(kwargs.get('params') or {}), **params}}
+
+
+class Page:
+    """A single page of results.
+
+    Attributes:
+        response: The response for the page.
+        items: The items found in the response.
+        number: Position of the page, starting at 0.
+    """
+
+    def __init__(self, response: Any, items: List[Any], number: int):
+        self.response = response
+        self.items = items
+        self.number = number
+
+    def __repr__(self):  # NOQA
+        return f'Page: <{self.number}: {len(self.items)} items>'
+
+
+class Strategy:
+    """Base class for pagination strategies.
+
+    A strategy reads a response, returning the items it contains and the
+    request kwargs for the next page.
+
+    Arguments:
+        items_field: Dotted path to the list of items in the JSON body.
+            If None, the body itself is the list.
+    """
+
+    def __init__(self, items_field: Optional[str] = None):
+        self.items_field = items_field
+
+    def first(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Get the request kwargs for the first page."""
+        return kwargs
+
+    def items(self, data: Any) -> List[Any]:
+        """Get the items from the decoded body of a page."""
+        return get_field(data, self.items_field) or []
+
+    def page(self, response: Any, kwargs: Dict[str, Any]) -> PageResult:
+        """Get the items in a response and the kwargs for the next page.
+
+        Arguments:
+            response: The response for the current page.
+            kwargs: The request kwargs used for the current page.
+
+        Returns:
+            tuple: The items, and the kwargs for the next page.
+                The kwargs are None if this is the last page.
+        """
+        raise NotImplementedError
+
+
+class LinkHeader(Strategy):
+    """Follow the URL in the 'next' relation of the Link header.
+
+    The next URL replaces the Route's URL. A relative URL is resolved
+    against the URL of the page it was found in.
+    """
+
+    def page(self, response: Any, kwargs: Dict[str, Any]) -> PageResult:
+        """Find the next URL in the Link header."""
+        items = self.items(response.json())
+        next_url = response.links.get('next', {}).get('url')
+
+        if not next_url:
+            return items, None
+
+        # The next URL already carries its query string.
+        next_url = urljoin(str(response.url), next_url)
+        return items, {**kwargs, 'params': None, 'url': next_url}
+
+
+class Cursor(Strategy):
+    """Send the cursor found in each page as a query parameter.
+
+    Arguments:
+        cursor_field: Dotted path to the cursor in the JSON body.
+        param: Name of the query parameter to send the cursor as.
+        items_field: Dotted path to the list of items in the JSON body.
+    """
+
+    def __init__(
+        self,
+        cursor_field: str = 'next',
+        param: str = 'cursor',
+        items_field: Optional[str] = 'items',
+    ):
+        super().__init__(items_field)
+        self.cursor_field = cursor_field
+        self.param = param
+
+    def page(self, response: Any, kwargs: Dict[str, Any]) -> PageResult:
+        """Find the cursor in the body."""
+        data = response.json()
+        cursor = get_field(data, self.cursor_field)
+
+        if not cursor:
+            return self.items(data), None
+        return self.items(data), with_params(kwargs, **{self.param: cursor})
+
+
+class OffsetLimit(Strategy):
+    """Send increasing offsets until a page is not full.
+
+    Arguments:
+        limit: Number of items requested per page.
+        offset_param: Name of the offset query parameter.
+        limit_param: Name of the limit query parameter.
+        start: Offset of the first page.
+        items_field: Dotted path to the list of items in the JSON body.
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,
+        offset_param: str = 'offset',
+        limit_param: str = 'limit',
+        start: int = 0,
+        items_field: Optional[str] = None,
+    ):
+        super().__init__(items_field)
+        self.limit = limit
+        self.offset_param = offset_param
+        self.limit_param = limit_param
+        self.start = start
+
+    def first(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Request the first offset."""
+        return self._kwargs(kwargs, self.start)
+
+    def _kwargs(self, kwargs: Dict[str, Any], offset: int) -> Dict[str, Any]:
+        params = {self.offset_param: offset, self.limit_param: self.limit}
+        return with_params(kwargs, **params)
+
+    def page(self, response: Any, kwargs: Dict[str, Any]) -> PageResult:
+        """Request the next offset if the page was full."""
+        items = self.items(response.json())
+
+        if len(items) < self.limit:
+            return items, None
+
+        offset = kwargs['params'][self.offset_param] + self.limit
+        return items, self._kwargs(kwargs, offset)
+
+
+class PageNumber(Strategy):
+    """Send increasing page numbers until a page is empty.
+
+    Arguments:
+        param: Name of the page number query parameter.
+        start: Number of the first page.
+        items_field: Dotted path to the list of items in the JSON body.
+    """
+
+    def __init__(
+        self,
+        param: str = 'page',
+        start: int = 1,
+        items_field: Optional[str] = None,
+    ):
+        super().__init__(items_field)
+        self.param = param
+        self.start = start
+
+    def first(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Request the first page number."""
+        return with_params(kwargs, **{self.param: self.start})
+
+    def page(self, response: Any, kwargs: Dict[str, Any]) -> PageResult:
+        """Request the next page number if the page had items."""
+        items = self.items(response.json())
+
+        if not items:
+            return items, None
+
+        number = kwargs['params'][self.param] + 1
+        return items, with_params(kwargs, **{self.param: number})
+
+
+# Marks the end of a prefetched iterator.
+_DONE = object()
+
+
+class _Producer:
+    """Put the values of an iterator into a bounded queue from a thread."""
+
+    def __init__(self, iterator: Iterator[Any], size: int):
+        self.iterator = iterator
+        self.buffer: queue.Queue = queue.Queue(maxsize=size)
+        self.stop = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def put(self, value: Any, error: Optional[Exception] = None) -> None:
+        """Wait for space in the queue, unless the consumer stopped."""
+        while not self.stop.is_set():
+            try:
+                self.buffer.put((value, error), timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def run(self) -> None:
+        """Consume the iterator."""
+        try:
+            for value in self.iterator:
+                if self.stop.is_set():
+                    return
+                self.put(value)
+        except Exception as e:
+            self.put(_DONE, e)
+        else:
+            self.put(_DONE)
+
+
+def _unpack(entry: Tuple[Any, Optional[Exception]]) -> Any:
+    """Get a value from the queue, raising the producer's exception."""
+    value, error = entry
+    if error is not None:
+        raise error
+    return value
+
+
+def prefetch(iterator: Iterator[Any], size: int) -> Iterator[Any]:
+    """Consume an iterator in a background thread, up to size values ahead.
+
+    Values are handed over through a bounded queue, so at most size values
+    are held in memory. Exceptions are raised in the consuming thread.
+    Closing the returned generator stops the background thread.
+
+    Arguments:
+        iterator: The iterator to consume.
+        size: Maximum number of values fetched ahead of the consumer.
+    """
+    producer = _Producer(iterator, size)
+    producer.thread.start()
+
+    try:
+        while True:
+            value = _unpack(producer.buffer.get())
+            if value is _DONE:
+                return
+            yield value
+    finally:
+        producer.stop.set()
+
+
+async def _produce_async(
+    iterator: AsyncIterator[Any], buffer: asyncio.Queue,
+) -> None:
+    try:
+        async for value in iterator:
+            await buffer.put((value, None))
+    except Exception as e:
+        await buffer.put((_DONE, e))
+    else:
+        await buffer.put((_DONE, None))
+
+
+async def prefetch_async(
+    iterator: AsyncIterator[Any], size: int,
+) -> AsyncIterator[Any]:
+    """Consume an async iterator in a task, up to size values ahead.
+
+    Accepts the same arguments as prefetch().
+    """
+    buffer: asyncio.Queue = asyncio.Queue(maxsize=size)
+    task = asyncio.ensure_future(_produce_async(iterator, buffer))
+
+    try:
+        while True:
+            value = _unpack(await buffer.get())
+            if value is _DONE:
+                return
+            yield value
+    finally:
+        task.cancel()
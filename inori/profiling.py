@@ -0,0 +1,178 @@
+import itertools
+import threading
+import time
+from typing import Any, Dict, MutableMapping, Optional, Union
+
+# Phases of Route.request(), in order. Route.request_json() adds 'decode'
+# once the response hooks have run.
+PHASES = (
+    'rig_reset',
+    'metadata',
+    'headers',
+    'request_hooks',
+    'render',
+    'transport',
+    'response_hooks',
+)
+
+
+class PhaseStats:
+    """Aggregated timings of one phase, in nanoseconds."""
+
+    __slots__ = ('count', 'total', 'max')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def add(self, elapsed: int) -> None:
+        """Count a timing."""
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+
+    def as_dict(self) -> Dict[str, int]:
+        """Get the timings as a dict."""
+        return {
+            'count': self.count,
+            'total_ns': self.total,
+            'mean_ns': self.total // self.count if self.count else 0,
+            'max_ns': self.max,
+        }
+
+
+class Profile:
+    """Timings of a single request.
+
+    Each call to mark() ends a phase, which started when the previous
+    phase ended.
+
+    Attributes:
+        phases: Nanoseconds spent in each phase.
+    """
+
+    __slots__ = ('phases', '_profiler', '_route', '_last')
+
+    def __init__(self, profiler: 'Profiler', route: Any):
+        self.phases: Dict[str, int] = {}
+        self._profiler = profiler
+        self._route = route
+        self._last = time.perf_counter_ns()
+
+    def mark(self, phase: str) -> None:
+        """End a phase."""
+        now = time.perf_counter_ns()
+        self.phases[phase] = now - self._last
+        self._last = now
+
+    def attach(self, metadata: MutableMapping[str, Any]) -> None:
+        """Expose the timings in the response metadata."""
+        metadata['profile'] = self.phases
+
+    def finish(self) -> None:
+        """Add the timings to the Profiler."""
+        self._profiler.record(str(self._route), self.phases)
+
+
+class NullProfile:
+    """Stand-in for Profile when a request is not profiled."""
+
+    __slots__ = ()
+
+    def mark(self, phase: str) -> None:
+        """Do nothing."""
+
+    def attach(self, metadata: MutableMapping[str, Any]) -> None:
+        """Do nothing."""
+
+    def finish(self) -> None:
+        """Do nothing."""
+
+
+NO_PROFILE = NullProfile()
+
+
+class Profiler:
+    """Time the phases of requests, splitting library overhead from I/O.
+
+    Timings are taken with time.perf_counter_ns(). Profiled requests get
+    a 'profile' key in their response metadata, and the timings are
+    aggregated per route template.
+
+    Example:
+        >>> client = Client('http://my.service/api/v777')
+        >>> client.settings_.profiler = Profiler(sample_every=100)
+        >>> client.settings_.profiler.stats()
+
+    Arguments:
+        sample_every: Profile 1 request out of this many. Requests that
+            are not sampled cost a counter increment.
+
+    Attributes:
+        sampled: Number of requests profiled.
+    """
+
+    def __init__(self, sample_every: int = 1):
+        if sample_every < 1:
+            raise ValueError('sample_every must be at least 1.')
+
+        self.sample_every = sample_every
+        self.sampled = 0
+
+        self._counter = itertools.count()
+        self._stats: Dict[str, Dict[str, PhaseStats]] = {}
+        self._lock = threading.Lock()
+
+    def start(self, route: Any) -> Union[Profile, NullProfile]:
+        """Start profiling a request, if it is sampled.
+
+        Arguments:
+            route: The route template. Only converted to a string if the
+                request is sampled.
+
+        Returns:
+            Profile: Or NO_PROFILE if the request is not sampled.
+        """
+        if next(self._counter) % self.sample_every:
+            return NO_PROFILE
+        return Profile(self, route)
+
+    def record(self, route: str, phases: Dict[str, int]) -> None:
+        """Add the timings of a request."""
+        with self._lock:
+            self.sampled += 1
+            stats = self._stats.setdefault(route, {})
+            for phase, elapsed in phases.items():
+                phase_stats = stats.get(phase)
+                if phase_stats is None:
+                    phase_stats = stats[phase] = PhaseStats()
+                phase_stats.add(elapsed)
+
+    def stats(
+        self, route: Optional[str] = None,
+    ) -> Dict[str, Dict[str, Dict[str, int]]]:
+        """Get the aggregated timings.
+
+        Arguments:
+            route: If given, only this route template is returned.
+
+        Returns:
+            dict: Timings by route template, then by phase.
+        """
+        with self._lock:
+            return {
+                name: {
+                    phase: phase_stats.as_dict()
+                    for phase, phase_stats in stats.items()
+                }
+                for name, stats in self._stats.items()
+                if route is None or name == route
+            }
+
+    def reset(self) -> None:
+        """Drop the aggregated timings."""
+        with self._lock:
+            self.sampled = 0
+            self._stats = {}
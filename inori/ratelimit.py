@@ -0,0 +1,226 @@
+import threading
+import time
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from .retry import parse_retry_after
+
+# Status codes whose Retry-After header pauses the limiter.
+THROTTLED_STATUS_CODES = frozenset({429, 503})
+
+# Prefixes of the headers APIs use to announce their limits.
+HEADER_PREFIXES = ('X-RateLimit-', 'RateLimit-')
+
+# Reset values above this are timestamps, below it a number of seconds.
+_EPOCH_THRESHOLD = 1e9
+
+
+def parse_reset(value: Optional[str]) -> Optional[float]:
+    """Parse a rate limit reset header into seconds from now.
+
+    Both a number of seconds and a Unix timestamp are accepted.
+
+    Returns:
+        float: The number of seconds until the limit resets, or None.
+    """
+    try:
+        reset = float(value)  # type: ignore
+    except (TypeError, ValueError):
+        return None
+
+    if reset > _EPOCH_THRESHOLD:
+        reset -= time.time()
+    return max(0.0, reset)
+
+
+def _limit_header(headers: Mapping[str, str], name: str) -> Optional[str]:
+    for prefix in HEADER_PREFIXES:
+        value = headers.get(prefix + name)
+        if value is not None:
+            return value
+    return None
+
+
+def _throttled_for(
+    status_code: int, headers: Mapping[str, str],
+) -> Optional[float]:
+    """Get the Retry-After of a throttled response, in seconds."""
+    if status_code not in THROTTLED_STATUS_CODES:
+        return None
+    return parse_retry_after(headers.get('Retry-After'))
+
+
+def parse_limit_headers(
+    headers: Mapping[str, str],
+) -> Optional[Tuple[int, float]]:
+    """Read the remaining requests and the seconds until the limit resets.
+
+    Returns:
+        tuple: The remaining requests and the seconds until the reset,
+            or None if the headers are missing or invalid.
+    """
+    reset = parse_reset(_limit_header(headers, 'Reset'))
+    try:
+        remaining = int(_limit_header(headers, 'Remaining'))  # type: ignore
+    except (TypeError, ValueError):
+        return None
+
+    return None if reset is None else (remaining, reset)
+
+
+class RateLimit:
+    """Token bucket keeping requests under a rate.
+
+    Requests wait just long enough to conform. The limiter also follows
+    what the API reports: a Retry-After header on a 429 or 503 response,
+    or X-RateLimit-Remaining reaching 0, pauses it until the limit resets.
+    A low X-RateLimit-Remaining spreads the remaining requests until the
+    reset.
+
+    Example:
+        >>> client = Client('http://my.service/api/v777')
+        >>> client.settings_.rate_limit = RateLimit(500)
+        >>> search = client.add_route('search')
+        >>> search.settings_.rate_limit = RateLimit(50)
+
+    Arguments:
+        rate: Requests allowed per second.
+        burst: Requests that can be sent at once after being idle.
+            Defaults to rate, with a minimum of 1.
+        adapt: If True, follow the rate limit headers of responses.
+
+    Attributes:
+        acquired: Number of requests that went through the limiter.
+        delayed: Number of requests that had to wait.
+        waited: Total time spent waiting, in seconds.
+        max_wait: Longest single wait, in seconds.
+    """
+
+    def __init__(
+        self, rate: float, burst: Optional[float] = None, adapt: bool = True,
+    ):
+        if rate <= 0:
+            raise ValueError('rate must be greater than 0.')
+
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self.adapt = adapt
+
+        self.acquired = 0
+        self.delayed = 0
+        self.waited = 0.0
+        self.max_wait = 0.0
+
+        self.tokens = self.burst
+        self._updated = time.monotonic()
+
+        # Set from response headers.
+        self._paused_until = 0.0
+        self._adapted_rate: Optional[float] = None
+        self._adapted_until = 0.0
+
+        self._lock = threading.Lock()
+
+    def current_rate(self) -> float:
+        """Get the rate in effect, after adapting to response headers."""
+        if self._adapted_rate is not None:
+            if time.monotonic() < self._adapted_until:
+                return self._adapted_rate
+            self._adapted_rate = None
+        return self.rate
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self.tokens = min(
+                self.burst, self.tokens + elapsed * self.current_rate(),
+            )
+            self._updated = now
+
+    def reserve(self) -> float:
+        """Take a token, returning how long to wait before sending.
+
+        The token is reserved even if it is not available yet, so
+        concurrent callers queue up behind each other.
+
+        Returns:
+            float: Seconds to wait before sending the request.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= 1
+
+            wait = max(0.0, self._paused_until - now)
+            if self.tokens < 0:
+                wait += -self.tokens / self.current_rate()
+
+            self._count(wait)
+            return wait
+
+    def _count(self, wait: float) -> None:
+        self.acquired += 1
+        if wait > 0:
+            self.delayed += 1
+            self.waited += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def update(self, status_code: int, headers: Mapping[str, str]) -> None:
+        """Adapt to the rate limit headers of a response.
+
+        Arguments:
+            status_code: Status code of the response.
+            headers: Headers of the response.
+        """
+        if not self.adapt:
+            return
+
+        retry_after = _throttled_for(status_code, headers)
+        if retry_after is not None:
+            self.pause(retry_after)
+            return
+
+        limit = parse_limit_headers(headers)
+        if limit is None:
+            return
+
+        remaining, reset = limit
+        if remaining <= 0:
+            self.pause(reset)
+        elif reset > 0:
+            self._slow_down(remaining / reset, reset)
+
+    def pause(self, seconds: float) -> None:
+        """Stop handing out tokens for a number of seconds."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+
+            until = now + seconds
+            self._paused_until = max(self._paused_until, until)
+
+            # Tokens do not accumulate while paused.
+            self._updated = max(self._updated, self._paused_until)
+            self.tokens = min(self.tokens, 1.0)
+
+    def _slow_down(self, rate: float, seconds: float) -> None:
+        """Use a lower rate for a number of seconds."""
+        if rate >= self.rate:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._adapted_rate = rate
+            self._adapted_until = now + seconds
+
+            # Spread the remaining requests, instead of sending them at once.
+            self.tokens = min(self.tokens, 1.0)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the counters as a dict."""
+        return {
+            'acquired': self.acquired,
+            'delayed': self.delayed,
+            'waited': self.waited,
+            'max_wait': self.max_wait,
+        }
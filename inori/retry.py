@@ -0,0 +1,354 @@
+import random
+import threading
+import time
+from typing import Any, Iterable, Optional, Tuple, Type
+
+import requests
+
+from .cache import parse_http_date
+
+# Methods that can be sent again without changing the result.
+IDEMPOTENT_METHODS = frozenset({
+    'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE', 'TRACE',
+})
+
+# Status codes worth retrying.
+RETRY_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+# Exceptions worth retrying.
+RETRY_EXCEPTIONS: Tuple[Type[BaseException], ...] = (
+    requests.ConnectionError,
+    requests.Timeout,
+    ConnectionError,
+    TimeoutError,
+)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while a circuit is open."""
+
+
+class RetryPolicy:
+    """How failed requests are retried.
+
+    The delay between attempts grows exponentially, with full jitter.
+    A Retry-After header replaces the delay.
+
+    Example:
+        >>> client = Client('http://my.service/api/v777')
+        >>> client.settings_.retry = RetryPolicy(total=3, backoff_factor=0.5)
+
+    Arguments:
+        total: Maximum number of retries. 0 disables retries.
+        backoff_factor: Delay before the first retry, in seconds.
+            Doubles with every retry.
+        max_backoff: Longest delay between attempts, in seconds.
+        jitter: If True, each delay is a random value up to the backoff.
+        status_codes: Response status codes to retry.
+        methods: HTTP methods that can be retried.
+        exceptions: Exceptions to retry.
+        respect_retry_after: If True, wait as long as the Retry-After
+            header says, up to max_backoff.
+    """
+
+    def __init__(
+        self,
+        total: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30.0,
+        jitter: bool = True,
+        status_codes: Iterable[int] = RETRY_STATUS_CODES,
+        methods: Iterable[str] = IDEMPOTENT_METHODS,
+        exceptions: Tuple[Type[BaseException], ...] = RETRY_EXCEPTIONS,
+        respect_retry_after: bool = True,
+    ):
+        self.total = total
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.status_codes = frozenset(status_codes)
+        self.methods = frozenset(m.upper() for m in methods)
+        self.exceptions = exceptions
+        self.respect_retry_after = respect_retry_after
+
+    def is_failure(
+        self, response: Any, error: Optional[BaseException],
+    ) -> bool:
+        """Check if an attempt failed in a way worth retrying."""
+        if error is not None:
+            return True
+        return response.status_code in self.status_codes
+
+    def can_retry(self, http_method: str, attempt: int) -> bool:
+        """Check if another attempt is allowed.
+
+        Arguments:
+            http_method: HTTP method of the request.
+            attempt: Number of the attempt that failed, starting at 0.
+        """
+        return http_method.upper() in self.methods and attempt < self.total
+
+    def backoff(self, attempt: int, response: Any = None) -> float:
+        """Get the delay before the next attempt, in seconds.
+
+        Arguments:
+            attempt: Number of the attempt that failed, starting at 0.
+            response: The response of the failed attempt, if there was one.
+        """
+        retry_after = self.retry_after(response)
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+
+        delay = min(self.max_backoff, self.backoff_factor * 2 ** attempt)
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def retry_after(self, response: Any) -> Optional[float]:
+        """Read the Retry-After header of a response, in seconds."""
+        if response is None or not self.respect_retry_after:
+            return None
+        return parse_retry_after(response.headers.get('Retry-After'))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header, either seconds or an HTTP date.
+
+    Returns:
+        float: The number of seconds to wait, or None.
+    """
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    date = parse_http_date(value)
+    return None if date is None else max(0.0, date - time.time())
+
+
+class RetryBudget:
+    """Token bucket capping the ratio of retries to requests.
+
+    Every request adds `ratio` tokens, every retry takes one. A minimum
+    number of retries per second is always allowed, so low traffic can
+    still retry.
+
+    Example:
+        >>> client.settings_.retry_budget = RetryBudget(ratio=0.2)
+
+    Arguments:
+        ratio: Retries allowed per request.
+        min_per_second: Retries always allowed per second.
+        max_tokens: Most retries that can be saved up.
+    """
+
+    def __init__(
+        self,
+        ratio: float = 0.2,
+        min_per_second: float = 1.0,
+        max_tokens: float = 100.0,
+    ):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+
+        self.tokens = max_tokens
+        self.exhausted = 0
+
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _add(self, tokens: float) -> None:
+        now = time.monotonic()
+        tokens += (now - self._updated) * self.min_per_second
+        self._updated = now
+        self.tokens = min(self.max_tokens, self.tokens + tokens)
+
+    def deposit(self) -> None:
+        """Count a request."""
+        with self._lock:
+            self._add(self.ratio)
+
+    def withdraw(self) -> bool:
+        """Take a token for a retry.
+
+        Returns:
+            bool: False if the budget is exhausted.
+        """
+        with self._lock:
+            self._add(0)
+            if self.tokens < 1:
+                self.exhausted += 1
+                return False
+
+            self.tokens -= 1
+            return True
+
+
+class CircuitBreaker:
+    """Fail fast while an upstream keeps failing.
+
+    closed: Requests are sent. After failure_threshold failures in a row,
+        the circuit opens.
+    open: Requests raise CircuitOpenError without being sent. After
+        recovery_timeout seconds, the circuit becomes half-open.
+    half-open: One trial request is sent. If it succeeds the circuit closes,
+        else it opens again.
+
+    Example:
+        >>> breaker = CircuitBreaker(failure_threshold=5)
+        >>> client.settings_.circuit_breaker = breaker
+
+    Arguments:
+        failure_threshold: Consecutive failures that open the circuit.
+        recovery_timeout: Seconds the circuit stays open.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(
+        self, failure_threshold: int = 5, recovery_timeout: float = 30.0,
+    ):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+
+        self.failures = 0
+        self._state = self.CLOSED
+        self._opened = 0.0
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def copy(self) -> 'CircuitBreaker':
+        """Get a new, closed, CircuitBreaker with the same settings."""
+        return type(self)(self.failure_threshold, self.recovery_timeout)
+
+    @property
+    def state(self) -> str:
+        """Current state of the circuit."""
+        if self._state == self.OPEN and self._recovered():
+            return self.HALF_OPEN
+        return self._state
+
+    def _recovered(self) -> bool:
+        return time.monotonic() - self._opened >= self.recovery_timeout
+
+    def before_call(self) -> None:
+        """Check if a request can be sent.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or a half-open trial
+                request is already in flight.
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+
+            if self._state == self.OPEN and self._recovered():
+                self._state = self.HALF_OPEN
+                self._trial = False
+
+            if self._state == self.HALF_OPEN and not self._trial:
+                self._trial = True
+                return
+
+        raise CircuitOpenError(f'Circuit is {self.state}')
+
+    def release(self) -> None:
+        """Let another trial request through, after one was abandoned.
+
+        ie: the trial was cancelled before it got an outcome.
+        """
+        with self._lock:
+            self._trial = False
+
+    def record(self, failed: bool) -> None:
+        """Record the outcome of a request."""
+        with self._lock:
+            if not failed:
+                self.failures = 0
+                self._state = self.CLOSED
+                return
+
+            self.failures += 1
+            threshold = self.failures >= self.failure_threshold
+            if self._state == self.HALF_OPEN or threshold:
+                self._state = self.OPEN
+                self._opened = time.monotonic()
+
+
+class Retrying:
+    """Decide, attempt after attempt, if a request is sent again.
+
+    Arguments:
+        http_method: HTTP method of the request.
+        policy: The RetryPolicy to follow.
+        budget: Optional RetryBudget shared by the Client.
+        breaker: Optional CircuitBreaker of the Route.
+    """
+
+    def __init__(
+        self,
+        http_method: str,
+        policy: RetryPolicy,
+        budget: Optional[RetryBudget] = None,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.http_method = http_method
+        self.policy = policy
+        self.budget = budget
+        self.breaker = breaker
+        self.attempt = 0
+
+        if budget is not None:
+            budget.deposit()
+
+    def before(self) -> None:
+        """Call before each attempt. Raises CircuitOpenError."""
+        if self.breaker is not None:
+            self.breaker.before_call()
+
+    def abort(self, error: BaseException) -> None:
+        """Call when an attempt raises an exception that isn't retried.
+
+        The breaker counts it as a failure, so a half-open trial doesn't
+        stay in flight forever. Cancellations, and other exceptions not
+        derived from Exception, only end the trial.
+        """
+        if self.breaker is None:
+            return
+        if isinstance(error, Exception):
+            self.breaker.record(True)
+        else:
+            self.breaker.release()
+
+    def after(
+        self, response: Any, error: Optional[BaseException],
+    ) -> Optional[float]:
+        """Call after each attempt.
+
+        Returns:
+            float: Seconds to wait before the next attempt, or None if the
+                attempt's outcome is final.
+        """
+        failed = self.policy.is_failure(response, error)
+        if self.breaker is not None:
+            self.breaker.record(failed)
+
+        if not failed or not self.policy.can_retry(
+            self.http_method, self.attempt,
+        ):
+            return None
+
+        if self.budget is not None and not self.budget.withdraw():
+            return None
+
+        delay = self.policy.backoff(self.attempt, response)
+        self.attempt += 1
+        return delay
+
+
+# Used when a Route has a CircuitBreaker but no RetryPolicy.
+NO_RETRY = RetryPolicy(total=0)
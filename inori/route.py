@@ -1,12 +1,35 @@
+import contextlib
 import copy
-from typing import Any, Dict, Mapping, Optional, TYPE_CHECKING, TypeVar, Union
+import functools
+import threading
+import time
+from types import MappingProxyType, MethodType
+from typing import (
+    Any, Callable, ContextManager, Dict, Iterable, Iterator, List, Mapping,
+    Optional, Sequence, TYPE_CHECKING, Tuple, Type, TypeVar, Union,
+)
+from urllib.parse import unquote
 
 import requests
 
 import shibari
 
-from .utils.headerdict import HeaderDict
+from .codec import decode_response, encode_body
+from .download import (
+    CHUNK_SIZE, Download, IDENTITY, MIN_SEGMENT_SIZE, RemoteFile, Segment,
+)
+from .fanout import Batch, run_threaded
+from .metrics import Observation, sent_size
+from .pagination import Page, Strategy, prefetch as prefetch_pages
+from .profiling import NO_PROFILE, NullProfile, Profile
+from .ratelimit import RateLimit
+from .retry import NO_RETRY, Retrying
+from .settings import RouteSettings
+from .upload import Progress, prepare_upload, rewinder, summarize
+from .utils.headerdict import HeaderDict, MergedHeaders
+from .utils.metadata import Metadata
 from .utils.string_template import StringTemplate
+from .utils.trie import PathNode, attribute_name, is_parameter
 
 if TYPE_CHECKING:
     from .client import Client
@@ -14,6 +37,48 @@ if TYPE_CHECKING:
 
 T = TypeVar('T', bound='Route')
 
+# Stands in for the body of streamed responses in response metadata.
+STREAMED_BODY = '<streamed>'
+
+# Held while Routes are created from a path trie.
+_MATERIALIZE_LOCK = threading.RLock()
+
+# Shared by every Route without callables, children or arguments.
+_NO_ROUTES: Mapping[str, Any] = MappingProxyType({})
+
+# Shared by every Route without headers.
+_NO_HEADERS = HeaderDict()
+
+# Read by every Route without settings.
+_NO_SETTINGS = RouteSettings()
+
+
+class _ChildFirst:
+    """Method of Route hidden by a child Route of the same name.
+
+    Child Routes used to be set as attributes of their parent, so they hid
+    its methods. Methods added since keep that order: a child named stream
+    is returned instead of Route.stream().
+    """
+
+    def __init__(self, fn: Callable):
+        functools.update_wrapper(self, fn)
+        self.fn = fn
+        self.name = fn.__name__
+
+    def __get__(self, route: Optional['Route'], owner: type = None) -> Any:
+        """Get the child Route with the name, else the bound method."""
+        if route is None:
+            return self.fn
+
+        child = route._child(self.name)
+        return MethodType(self.fn, route) if child is None else child
+
+
+def child_first(fn: Callable) -> Any:
+    """Let a child Route named like the method hide it."""
+    return _ChildFirst(fn)
+
 
 class Route:
     """Representation of a single route in an API.
@@ -35,8 +100,31 @@ class Route:
     Attributes:
         headers: Dictionary containing all the Route-level headers
 
+    Calling a Route returns a bound view of the callable Route.
+    A bound view shares headers, callables and children with the Route
+    it was created from, only the values for the URL template differ.
+
+    Settings overriding the ones of the Client, ie: retry or rate_limit,
+    are in Route.settings_, see inori.settings.RouteSettings.
+
+    Children are attributes of their Route, named after their piece of
+    path, ie: all_things for all-things. A child hides the methods of
+    Route added since children were attributes, ie: stream or map. Children
+    named like the other attributes, ie: get or headers, are reached with
+    Route.children, keyed by piece of path:
+
+    Example:
+        >>> client.add_route('jobs/get')
+        >>> client.jobs.children['get'].post()
+
     """
 
+    __slots__ = (
+        'client', 'trailing_slash', 'url', 'prev_kwargs', '_parent',
+        '_headers', '_merged_headers', '_callables', '_children', '_aliases',
+        '_settings', '_pending', '_template', '__weakref__',
+    )
+
     rig = shibari.Rig('request')
     bind = rig.bind
 
@@ -46,38 +134,117 @@ class Route:
         self.client = client
         self.trailing_slash = trailing_slash
 
-        _url = StringTemplate(url)
-        if trailing_slash:
-            _url = StringTemplate(f'{url}/')
+        # Compiled once, bound views only substitute values into it.
+        self.url = StringTemplate(f'{url}/' if trailing_slash else url)
 
-        self.url: Union[str, StringTemplate] = _url
+        # Created on first use, see Route.headers
+        self._headers: Optional[HeaderDict] = None
 
-        self.headers = HeaderDict()
+        # Client and Route headers, merged on first use.
+        self._merged_headers: Optional[MergedHeaders] = None
 
-        self.callables: Dict[str, Route] = {}
-        self.children: Dict[str, Route] = {}
+        # Shared empty mappings until a Route is added below this one.
+        # Children are keyed by piece of path, ie: all-things
+        self._callables: Mapping[str, Route] = _NO_ROUTES
+        self._children: Mapping[str, Route] = _NO_ROUTES
+
+        # Pieces of the children whose attribute name differs,
+        # ie: all_things for all-things
+        self._aliases: Mapping[str, str] = _NO_ROUTES
 
         # Parameters from parent Route
         # ie: in /foo/${barId}/${bazId}, bazId stores barId's value
         # This gets overwritten if new values are given
-        self.prev_kwargs: Mapping[str, str] = {}
+        self.prev_kwargs: Mapping[str, str] = _NO_ROUTES  # type: ignore
+
+        # Created on first use, see Route.settings_
+        self._settings: Optional[RouteSettings] = None
+
+        # The Route this Route was added under. None for top-level Routes.
+        self._parent: Optional[Route] = None
+
+        # Paths below this Route whose Routes have not been created yet.
+        self._pending: Optional[PathNode] = None
+
+        # The Route a bound view was created from. None for Routes
+        # created by Client.add_route()
+        self._template: Optional[Route] = None
+
+    @property
+    def session(self) -> requests.Session:
+        """The Client's shared session."""
+        return self.client._get_session()
+
+    @property
+    def _origin(self) -> 'Route':
+        """The Route created by Client.add_route() this Route is a view of."""
+        return self._template or self
+
+    @property
+    def settings_(self) -> RouteSettings:
+        """Settings of the Route, shared with its bound views."""
+        origin = self._origin
+        if origin._settings is None:
+            origin._settings = RouteSettings()
+        return origin._settings
+
+    @property
+    def headers(self) -> HeaderDict:
+        """Dictionary containing all the Route-level headers."""
+        template = self._origin
+        if template._headers is None:
+            template._headers = HeaderDict()
+        return template._headers
+
+    @headers.setter
+    def headers(self, value: HeaderDict) -> None:
+        self._origin._headers = value
+
+    @property
+    def callables(self) -> Mapping[str, 'Route']:
+        """Routes taking an argument, keyed by the argument's name."""
+        template = self._origin
+        template._materialize()
+        return template._callables
 
-        self.session = self.client.new_session()
-        self.session.auth = self.client.auth
+    @callables.setter
+    def callables(self, value: Mapping[str, 'Route']) -> None:
+        self._origin._callables = value
+
+    @property
+    def children(self) -> Mapping[str, 'Route']:
+        """Routes below this Route, keyed by piece of path.
+
+        Children of a bound view are bound with the same arguments.
+        """
+        template = self._origin
+        template._materialize()
+        if template is self:
+            return template._children
+        return _BoundRoutes(template._children, self.prev_kwargs)
+
+    @children.setter
+    def children(self, value: Mapping[str, 'Route']) -> None:
+        self._origin._children = value
 
     def __repr__(self):  # NOQA
         return f"Route: <{str(self.url)}>"
 
     def __deepcopy__(self, memodict):
-        """Copy in such a way as to avoid copying the client object."""
-        new = type(self)(self.client, str(self.url), self.trailing_slash)
-        new.callables = copy.deepcopy(self.callables)
-        new.children = copy.deepcopy(self.children)
-        new.prev_kwargs = copy.deepcopy(self.prev_kwargs)
+        """Copy in such a way as to avoid copying the client object.
 
-        for k, v in new.children.items():
-            setattr(new, k, v)
+        A bound view is copied as a view of a copy of its template, bound
+        with the same arguments, so its children are bound too.
+        """
+        if self._template is not None:
+            template = copy.deepcopy(self._template, memodict)
+            return template._bind(self.prev_kwargs)
 
+        new = type(self)(self.client, str(self.url), self.trailing_slash)
+        new.callables = _copy_routes(self.callables, new, memodict)
+        new.children = _copy_routes(self.children, new, memodict)
+        new._aliases = dict(self._aliases) or _NO_ROUTES
+        new.prev_kwargs = dict(self.prev_kwargs)
         return new
 
     def __call__(self, **kwargs: str) -> T:  # NOQA C90
@@ -86,7 +253,8 @@ class Route:
         This argument will be placed into the URL of the callable.
 
         Returns:
-            Route: A Route object with the url formatted by the argument.
+            Route: A bound view of the callable Route,
+            with the url formatted by the argument.
         """
         if len(kwargs) < 1:
             raise ValueError('Expected one keyword argument, got zero.')
@@ -106,34 +274,135 @@ class Route:
         # Ensure all known arguments are preserved.
         next_kwargs: Mapping[str, str] = {**self.prev_kwargs, **kwargs}
 
-        # Always make a copy of the callable.
-        # Else multiple calls to the same same Route will overwrite each other.
-        copied_route = copy.deepcopy(next_route)
-        # Update url with known arguments.
-        copied_route.prev_kwargs = next_kwargs
-        copied_route.url = copied_route.url.format(**next_kwargs)
+        return next_route._bind(next_kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        """Get a child Route by attribute name.
+
+        Bound views read the attributes they do not set from their
+        template. Children are bound with the same arguments.
+        """
+        try:
+            template = object.__getattribute__(self, '_template')
+        except AttributeError:
+            # Not initialised, ie: while being copied.
+            raise AttributeError(name) from None
+
+        if template is not None and name in _DELEGATED:
+            return getattr(template, name)
+
+        route = self._child(name)
+        if route is None:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'",
+            )
+
+        return route
+
+    def _child(self, name: str) -> Optional['Route']:
+        """Get a child Route by attribute name, bound like this Route."""
+        children = self.children
+        return children.get(self._origin._aliases.get(name, name))
+
+    def _materialize(self) -> None:
+        """Create the Routes for the path trie waiting below this Route."""
+        if self._pending is None:
+            return
+
+        with _MATERIALIZE_LOCK:
+            pending = self._pending
+            if pending is None:
+                return
+
+            for piece, node in pending:
+                route = self._add_child(piece, node.trailing_slash)
+                if node.children:
+                    route._pending = node
+
+            # Cleared last, so other threads wait for every child.
+            self._pending = None
+
+    def _match(
+        self, segments: Sequence[str], index: int, kwargs: Dict[str, str],
+    ) -> Optional[Tuple['Route', Dict[str, str]]]:
+        """Find the Route below this one matching the remaining segments.
+
+        Children are tried before callables. Each step is a dict lookup.
+
+        Returns:
+            tuple: The template Route and the values for its URL, or None.
+        """
+        if index == len(segments):
+            return self, kwargs
+
+        segment = segments[index]
+
+        child = self.children.get(segment)
+        if child is not None:
+            found = child._match(segments, index + 1, kwargs)
+            if found:
+                return found
+
+        for name, route in self.callables.items():
+            values = {**kwargs, name: unquote(segment)}
+            found = route._match(segments, index + 1, values)
+            if found:
+                return found
+
+        return None
+
+    def _is_segment(self, segment: str) -> bool:
+        """Check if a URL segment is the last piece of this Route's URL.
+
+        Pieces sharing an attribute name, ie: a-b and a_b, are told apart.
+        """
+        return str(self.url).rstrip('/').endswith(f'/{segment}')
+
+    def _add_child(self, piece: str, trailing_slash: bool = False) -> 'Route':
+        """Create the Route for a piece of path below this Route."""
+        route = self.client.route_class(
+            self.client, f'{self.url}/{piece}', trailing_slash,
+        )
+        route._parent = self
+
+        if is_parameter(piece):
+            if self._callables is _NO_ROUTES:
+                self._callables = {}
+            self._callables[piece[2:-1]] = route  # type: ignore
+        else:
+            if self._children is _NO_ROUTES:
+                self._children = {}
+            self._children[piece] = route  # type: ignore
+            self._alias(piece)
+
+        return route
 
-        # Callable might have it's own callables.
-        # Add info about used arguments
-        for subcallable in copied_route.callables.values():
-            subcallable.url = subcallable.url.format(**next_kwargs)
+    def _alias(self, piece: str) -> None:
+        """Map the attribute name of a child's piece of path to it."""
+        name = attribute_name(piece)
+        if name == piece:
+            return
 
-        # Children of this callable should know about the last arguments.
-        for _, child_route in copied_route.children.items():
-            copied_route._update_url(next_kwargs)
+        if self._aliases is _NO_ROUTES:
+            self._aliases = {}
+        self._aliases[name] = piece  # type: ignore
 
-            for callable_route in child_route.callables.values():
-                callable_route.url = callable_route.url.format(**next_kwargs)
+    def _bind(self: T, kwargs: Mapping[str, str]) -> T:
+        """Create a view of this Route with arguments for the URL.
 
-        return copied_route
+        Nothing is copied, the view refers back to the template Route.
+        Attributes other than the URL and arguments are read from the
+        template.
+        """
+        template = self._origin
 
-    def _update_url(self, new_kwargs: str) -> None:
-        """Update this Route and it's children's urls with new values."""
-        self.url = self.url.format(**new_kwargs)
-        self.prev_kwargs = new_kwargs
+        bound = object.__new__(type(template))
+        bound._template = template
+        bound.client = template.client
+        bound.prev_kwargs = MappingProxyType(dict(kwargs))
+        bound.url = template.url.partial(kwargs)
 
-        for _, child_route in self.children.items():
-            child_route._update_url(new_kwargs)
+        return bound
 
     def post(self, *args: Any, **kwargs: Any) -> requests.Response:
         """Send a POST request."""
@@ -147,10 +416,289 @@ class Route:
         """Send a GET request."""
         return self.request('GET', self, *args, **kwargs)
 
+    @child_first
+    def request_json(self, http_method: str, *args: Any, **kwargs: Any) -> Any:
+        """Send an HTTP Request and decode its JSON body.
+
+        The body is decoded from bytes with the Client's codec.
+
+        Example:
+            >>> fruits = client.fruits.request_json('GET')
+
+        Accepts the same arguments as Route.request().
+        """
+        response, profile = self._request(http_method, *args, **kwargs)
+        data = decode_response(response, self.client.settings_.codec)
+        profile.mark('decode')
+        profile.finish()
+        return data
+
+    @child_first
+    def get_json(self, *args: Any, **kwargs: Any) -> Any:
+        """Send a GET request and decode its JSON body."""
+        # Not self.request_json, a child Route could hide it.
+        return type(self).request_json(self, 'GET', self, *args, **kwargs)
+
     def delete(self, *args: Any, **kwargs: Any) -> requests.Response:
         """Send a DELETE request."""
         return self.request('DELETE', self, *args, **kwargs)
 
+    @child_first
+    @contextlib.contextmanager
+    def stream(
+        self, http_method: str, *args: Any, **kwargs: Any,
+    ) -> Iterator[requests.Response]:
+        """Send an HTTP Request without reading the response body.
+
+        The body is read by iterating over the response, so memory use
+        stays bounded. The response is closed when the context exits.
+
+        Response hooks receive the status code and headers, the body
+        is not available to them.
+
+        Example:
+            >>> with client.exports.stream('GET') as response:
+            >>>     for chunk in response.iter_content(chunk_size=65536):
+            >>>         f.write(chunk)
+
+        Accepts the same arguments as Route.request().
+        """
+        response = self.request(http_method, *args, stream=True, **kwargs)
+        try:
+            yield response
+        finally:
+            response.close()
+
+    @child_first
+    def download_to(
+        self,
+        path: str,
+        segments: int = 4,
+        min_segment_size: int = MIN_SEGMENT_SIZE,
+        chunk_size: int = CHUNK_SIZE,
+        resume: bool = True,
+        **kwargs: Any,
+    ) -> str:
+        """Download a file, fetching byte ranges concurrently.
+
+        A HEAD request gets the size of the file. If the server accepts
+        byte ranges, the file is split into segments fetched at the same
+        time over the Client's connection pool, and written straight to
+        their place in the file. Otherwise the file is fetched with a
+        single request.
+
+        Progress is saved next to the file, in path + '.inori-download'.
+        Calling download_to() again after an interruption only fetches the
+        missing bytes, if the file's ETag and Last-Modified are unchanged.
+
+        Example:
+            >>> client.artifacts(artifactId='42').download_to('artifact.bin')
+
+        Arguments:
+            path: Where the file is written.
+            segments: Maximum number of segments fetched at once.
+            min_segment_size: Segments are not made smaller than this.
+            chunk_size: Size of the chunks read from each response.
+            resume: If False, a previous attempt is ignored.
+
+        Accepts the same keyword arguments as Route.request().
+
+        Raises:
+            DownloadError: If the file changed during the download.
+
+        Returns:
+            str: The path of the file.
+        """
+        headers = {**(kwargs.pop('headers', None) or {}), **IDENTITY}
+
+        head = self.request('HEAD', self, headers=headers, **kwargs)
+        head.raise_for_status()
+        remote = RemoteFile(head.headers)
+
+        if not remote.segmentable:
+            self._download_whole(path, chunk_size, headers, kwargs)
+            return path
+
+        download = Download(
+            path, str(self.url), remote, segments, min_segment_size, resume,
+        )
+
+        def fetch(segment: Segment) -> None:
+            self._download_segment(
+                download, segment, chunk_size, headers, kwargs,
+            )
+
+        complete = False
+        try:
+            results = run_threaded(
+                fetch, download.pending(), segments, ordered=False,
+            )
+            # Every segment runs to the end, so a retry resumes from them.
+            errors = [i.exception for i in results if not i.ok]
+            if errors:
+                raise errors[0]  # type: ignore
+            complete = True
+        finally:
+            download.close(complete)
+
+        return path
+
+    def _download_segment(
+        self,
+        download: Download,
+        segment: Segment,
+        chunk_size: int,
+        headers: Dict[str, str],
+        kwargs: Dict[str, Any],
+    ) -> None:
+        """Fetch what is left of a segment, writing it to the file."""
+        headers = {**headers, **download.headers(segment)}
+
+        stream = type(self).stream  # Not hidden by a child Route
+        with stream(self, 'GET', self, headers=headers, **kwargs) as response:
+            download.check(segment, response.status_code, response.headers)
+            for chunk in response.iter_content(chunk_size):
+                download.write(segment, chunk)
+
+    def _download_whole(
+        self,
+        path: str,
+        chunk_size: int,
+        headers: Dict[str, str],
+        kwargs: Dict[str, Any],
+    ) -> None:
+        """Fetch a file with a single request."""
+        stream = type(self).stream  # Not hidden by a child Route
+        with stream(self, 'GET', self, headers=headers, **kwargs) as response:
+            response.raise_for_status()
+            with open(path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size):
+                    f.write(chunk)
+
+    @child_first
+    def paginate(
+        self,
+        strategy: Strategy,
+        http_method: str = 'GET',
+        pages: bool = False,
+        prefetch: int = 0,
+        **kwargs: Any,
+    ) -> Iterator[Any]:
+        """Iterate over every item of a paginated resource.
+
+        Pages are requested as the iterator is consumed.
+
+        Example:
+            >>> from inori.pagination import Cursor
+            >>> for user in client.users.paginate(Cursor('meta.next')):
+            >>>     print(user)
+
+        Arguments:
+            strategy: How to find the items and the next page in a response.
+            http_method: HTTP method to use for every page.
+            pages: If True, yield Page objects instead of items.
+            prefetch: Number of pages to request ahead in a background
+                thread, while the current page is being processed.
+            kwargs: Sent with every request. Strategies add their own
+                query parameters.
+
+        Yields:
+            The items of every page, or Page objects.
+        """
+        page_iter = self._pages(strategy, http_method, kwargs)
+        if prefetch:
+            page_iter = prefetch_pages(page_iter, prefetch)
+
+        for page in page_iter:
+            if pages:
+                yield page
+            else:
+                yield from page.items
+
+    def _pages(
+        self, strategy: Strategy, http_method: str, kwargs: Dict[str, Any],
+    ) -> Iterator[Page]:
+        page_kwargs = strategy.first(kwargs)
+        number = 0
+
+        while page_kwargs is not None:
+            route, page_kwargs = self._page_request(page_kwargs)
+            response = route.request(http_method, **page_kwargs)
+
+            items, page_kwargs = strategy.page(response, page_kwargs)
+            yield Page(response, items, number)
+            number += 1
+
+    def _page_request(
+        self, kwargs: Dict[str, Any],
+    ) -> Tuple['Route', Dict[str, Any]]:
+        """Get the Route to request a page with, and the request kwargs.
+
+        A 'url' in kwargs replaces the Route's URL.
+        """
+        kwargs = dict(kwargs)
+        url = kwargs.pop('url', None)
+        if url is None:
+            return self, kwargs
+
+        view = self._bind(self.prev_kwargs)
+        # The URL is not a template, any '$' is literal.
+        view.url = StringTemplate(url.replace('$', '$$'))
+        return view, kwargs
+
+    @child_first
+    def map(  # NOQA A003
+        self,
+        http_method: str,
+        items: Iterable[Mapping[str, Any]],
+        max_concurrency: int = 10,
+        ordered: bool = True,
+    ) -> Batch:
+        """Make one request per item, on a thread pool.
+
+        Each item is a dict. Keys matching the Route's callables are used to
+        call the Route, the other keys are sent as keyword arguments to
+        Route.request().
+
+        Requests share the Client's session, so max_concurrency should not
+        be larger than the Client's pool_maxsize.
+
+        Example:
+            >>> client.add_route('items/${itemId}')
+            >>> batch = client.items.map('GET', [{'itemId': 1}, {'itemId': 2}])
+            >>> responses = [r.response for r in batch]
+
+        Arguments:
+            http_method: HTTP method to use for every request.
+            items: An iterable of dicts, one per request.
+            max_concurrency: Maximum number of requests in flight at once.
+            ordered: If True, results are yielded in the order of the items.
+                Else they are yielded as they complete.
+
+        Returns:
+            Batch: Iterable of Result objects.
+        """
+        send = functools.partial(self._request_item, http_method)
+        return Batch(run_threaded(send, items, max_concurrency, ordered))
+
+    def _request_item(self, http_method: str, item: Mapping[str, Any]) -> Any:
+        route, kwargs = self._bind_item(item)
+        return route.request(http_method, **kwargs)
+
+    def _bind_item(
+        self, item: Mapping[str, Any],
+    ) -> Tuple['Route', Dict[str, Any]]:
+        """Split a dict into a bound Route and kwargs for the request."""
+        route = self
+        kwargs = dict(item)
+
+        while True:
+            name = next((k for k in route.callables if k in kwargs), None)
+            if name is None:
+                return route, kwargs
+
+            route = route(**{name: kwargs.pop(name)})
+
     def request(self,
                 http_method: str,
                 *args: Any,
@@ -164,50 +712,464 @@ class Route:
         Arguments:
             http_method: HTTP method to use for the request
         """
-        self.client.rig.rigs['request'] = {}
-        self.rig.rigs['request'] = {}
+        response, profile = self._request(
+            http_method, *args, headers=headers, **kwargs,
+        )
+        profile.finish()
+        return response
 
+    def _request(self,
+                 http_method: str,
+                 *args: Any,
+                 headers: Optional[Union[Dict[str, str], None]] = None,
+                 **kwargs: Any,
+                 ) -> Tuple[requests.Response, Union[Profile, NullProfile]]:
+        """Send an HTTP Request, leaving its profile open.
+
+        Route.request_json() adds the decode phase to the profile.
+        """
         local_headers = headers or {}
+        profile = self._profile()
 
-        request_metadata = {
-            'http_method': http_method,
-            'headers': local_headers,
-            'route': self.url,
-            'data': kwargs.get('data') or kwargs.get('json'),
-            'params': kwargs.get('params'),
-        }
+        self._reset_rigs()
+        profile.mark('rig_reset')
 
-        evaluated_headers: Dict[str, str] = {
-            **self.client.headers.run_functions(self.client, request_metadata),
-            **self.headers.run_functions(self, request_metadata),
-            **local_headers,
-        }
+        request_metadata = self._request_metadata(
+            http_method, local_headers, kwargs,
+        )
+        profile.mark('metadata')
+
+        evaluated_headers = self._merged().evaluate(
+            self.client, self, request_metadata, local_headers,
+        )
 
         request_metadata['headers'] = evaluated_headers
+        profile.mark('headers')
 
         for fn in self.client.hooks['request']:
             fn(request_metadata)
+        profile.mark('request_hooks')
 
-        evaluated_kwargs: Dict[str, Any] = {
-            **kwargs,
-            **self.client.request_kwargs,
-        }
+        evaluated_kwargs = self._request_kwargs(kwargs)
+        encode_body(
+            self.client.settings_.codec, evaluated_headers, evaluated_kwargs,
+        )
+        self._prepare_upload(http_method, evaluated_kwargs)
+        url = str(self.url)
+        profile.mark('render')
+
+        body = evaluated_kwargs.get('data')
+        stream = evaluated_kwargs.get('stream', False)
+        with self._measure(http_method, stream, body) as observation:
+            response = observation.response = self._send(
+                http_method, url, evaluated_headers, evaluated_kwargs,
+            )
+        profile.mark('transport')
+
+        response_metadata = self._response_metadata(
+            http_method, response, stream,
+        )
+        profile.attach(response_metadata)
+
+        for fn in self.client.hooks['response']:
+            fn(response_metadata)
+        profile.mark('response_hooks')
+
+        return response, profile
+
+    def _profile(self) -> Union[Profile, NullProfile]:
+        """Start profiling the request, if the Client has a Profiler."""
+        profiler = self.client.settings_.profiler
+        if profiler is None:
+            return NO_PROFILE
+        return profiler.start(self._origin.url)
+
+    def _measure(
+        self, http_method: str, stream: bool, body: Any,
+    ) -> ContextManager[Observation]:
+        """Measure a request, if the Client collects metrics.
+
+        The body is measured before it is sent, as not every transport
+        keeps the request it sent.
+        """
+        metrics = self.client.settings_.metrics
+        if metrics is None:
+            return contextlib.nullcontext(Observation(stream))
+
+        # The connection pools are in the session, or the transport.
+        pools = self.client._session or self.client.settings_.transport
+        return metrics.measure(
+            str(self._origin.url), http_method, pools, stream,
+            sent_size(body),
+        )
+
+    def _send(
+        self,
+        http_method: str,
+        url: str,
+        headers: Dict[str, str],
+        kwargs: Dict[str, Any],
+    ) -> requests.Response:
+        """Send the request.
+
+        Duplicate requests in flight are coalesced if the Client has
+        settings_.single_flight set.
+        """
+        def fetch() -> requests.Response:
+            return self._fetch(http_method, url, headers, kwargs)
+
+        flight = self.client.settings_.single_flight
+        if not (flight and flight.accepts(http_method, kwargs)):
+            return fetch()
+
+        key = flight.key(http_method, url, headers, kwargs.get('params'))
+        return flight.do(key, fetch)
+
+    def _fetch(
+        self,
+        http_method: str,
+        url: str,
+        headers: Dict[str, str],
+        kwargs: Dict[str, Any],
+    ) -> requests.Response:
+        """Send the request, through the Client's cache if it is used."""
+        # Taken before the body is read: files rewind to where they are.
+        rewind = rewinder(kwargs.get('data'))
+
+        def send(send_headers: Dict[str, str]) -> requests.Response:
+            def attempt() -> requests.Response:
+                limits = self._rate_limits()
+                _wait(limits)
+                response = self.client.settings_.transport.send(
+                    self.client, http_method, url, send_headers, **kwargs,
+                )
+                _adapt(limits, response)
+                return response
+
+            return self._transmit(http_method, attempt, rewind)
+
+        cache = self.client.settings_.cache
+        if cache is None or not cache.accepts(http_method, kwargs):
+            return send(headers)
+
+        use_cache = (self._origin._settings or _NO_SETTINGS).use_cache
+        if not (cache.default if use_cache is None else use_cache):
+            return send(headers)
+
+        return cache.fetch(
+            send, http_method, url, headers, kwargs.get('params'),
+        )
+
+    def _retrying(
+        self, http_method: str, replayable: bool = True,
+    ) -> Optional[Retrying]:
+        """Get the retry state for a request, if retries or breaker apply.
+
+        Requests whose body can't be sent again are not retried.
+        """
+        settings = self._origin._settings or _NO_SETTINGS
+        config = self.client.settings_
+        policy = settings.retry or config.retry
+        if not replayable:
+            policy = None
+
+        breaker = settings.circuit_breaker
+        if breaker is None and config.circuit_breaker is not None:
+            breaker = config.circuit_breaker.copy()
+            self.settings_.circuit_breaker = breaker
+
+        if policy is None and breaker is None:
+            return None
+
+        return Retrying(
+            http_method, policy or NO_RETRY, config.retry_budget, breaker,
+        )
+
+    def _rate_limits(self) -> List[RateLimit]:
+        """Get the limiters for a request, from the most specific."""
+        limits = []
+
+        route: Optional[Route] = self._origin
+        while route is not None:
+            limit = (route._settings or _NO_SETTINGS).rate_limit
+            if limit is not None:
+                limits.append(limit)
+            route = route._parent
+
+        if self.client.settings_.rate_limit is not None:
+            limits.append(self.client.settings_.rate_limit)
+
+        return limits
+
+    def _transmit(
+        self,
+        http_method: str,
+        send: Callable[[], requests.Response],
+        rewind: Optional[Callable[[], None]],
+    ) -> requests.Response:
+        """Send a request over the network, retrying if configured.
+
+        rewind puts the body back to its start before a retry. If it is
+        None, the body can only be sent once and the request is not
+        retried.
+        """
+        retrying = self._retrying(http_method, rewind is not None)
+        if retrying is None:
+            return send()
 
-        response = self.session.request(
-            http_method,
-            self.url,
-            headers=evaluated_headers,
-            **evaluated_kwargs,
+        while True:
+            retrying.before()
+            response, error = _attempt(
+                send, retrying, retrying.policy.exceptions,
+            )
+
+            delay = retrying.after(response, error)
+            if delay is None:
+                return _outcome(response, error)
+
+            self._on_retry(http_method, retrying, response, error, delay)
+            time.sleep(delay)
+            rewind()  # type: ignore
+
+    def _on_retry(
+        self,
+        http_method: str,
+        retrying: Retrying,
+        response: Any,
+        error: Optional[BaseException],
+        delay: float,
+    ) -> None:
+        """Run the response hooks for a failed attempt, then discard it."""
+        metadata = self._retry_metadata(
+            http_method, retrying, response, error, delay,
         )
+        for fn in self.client.hooks['response']:
+            fn(metadata)
+
+        if response is not None:
+            response.close()
+
+    def _retry_metadata(
+        self,
+        http_method: str,
+        retrying: Retrying,
+        response: Any,
+        error: Optional[BaseException],
+        delay: float,
+    ) -> Metadata:
+        """Describe a failed attempt that is about to be retried."""
+        if response is not None:
+            metadata = self._response_metadata(http_method, response)
+        else:
+            metadata = Metadata({
+                'http_method': http_method,
+                'route': self.url,
+                'status_code': None,
+                'headers': {},
+                'stream': False,
+                'text': '',
+            })
+
+        metadata['error'] = error
+        metadata['attempt'] = retrying.attempt
+        metadata['retry_in'] = delay
+        metadata['circuit_state'] = retrying.breaker and retrying.breaker.state
+        return metadata
 
-        response_metadata = {
+    def _header_dict(self) -> HeaderDict:
+        """Get the Route-level headers, without creating them."""
+        return self._origin._headers or _NO_HEADERS
+
+    def _reset_rigs(self) -> None:
+        """Reset the values bound to the request rigs."""
+        self.client.rig.rigs['request'] = {}
+        self.rig.rigs['request'] = {}
+
+    def _request_metadata(
+        self,
+        http_method: str,
+        headers: Dict[str, str],
+        kwargs: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Describe the request about to be made."""
+        # AsyncRoute sends raw bodies as content.
+        body = kwargs.get('data') or kwargs.get('content')
+        if body is None:
+            body = kwargs.get('json')
+
+        return {
             'http_method': http_method,
+            'headers': headers,
             'route': self.url,
-            'status_code': response.status_code,
-            'text': response.text,
+            'data': summarize(body),
+            'params': kwargs.get('params'),
         }
 
-        for fn in self.client.hooks['response']:
-            fn(response_metadata)
+    def _prepare_upload(
+        self, http_method: str, kwargs: Dict[str, Any],
+    ) -> None:
+        """Prepare the body to be streamed, reporting to upload hooks."""
+        body = kwargs.get('data')
+        if body is not None:
+            kwargs['data'] = prepare_upload(
+                body, self._upload_progress(http_method),
+            )
 
-        return response
+    def _upload_progress(self, http_method: str) -> Optional[Progress]:
+        """Get a function running the upload hooks, if there are any."""
+        hooks = self.client.hooks.get('upload')
+        if not hooks:
+            return None
+
+        def progress(sent: int, total: Optional[int]) -> None:
+            metadata = self._upload_metadata(http_method, sent, total)
+            for fn in hooks:
+                fn(metadata)
+
+        return progress
+
+    def _upload_metadata(
+        self, http_method: str, sent: int, total: Optional[int],
+    ) -> Dict[str, Any]:
+        """Describe the progress of an upload."""
+        return {
+            'http_method': http_method,
+            'route': self.url,
+            'sent': sent,
+            'total': total,
+        }
+
+    def _merged(self) -> MergedHeaders:
+        """Get the Client and Route headers, merged.
+
+        The merge is kept on the template, and redone when either
+        HeaderDict changes.
+        """
+        template = self._origin
+        client_headers = self.client.headers
+        route_headers = self._header_dict()
+
+        merged = template._merged_headers
+        if merged is None or not merged.is_current(
+            client_headers, route_headers,
+        ):
+            merged = MergedHeaders(client_headers, route_headers)
+            template._merged_headers = merged
+
+        return merged
+
+    def _request_kwargs(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge the Client's request_kwargs into the request's kwargs.
+
+        kwargs is the request's own dict, it is updated in place.
+        """
+        client_kwargs = self.client.request_kwargs
+        if client_kwargs:
+            kwargs.update(client_kwargs)
+        return kwargs
+
+    def _response_metadata(
+        self, http_method: str, response: Any, stream: bool = False,
+    ) -> Metadata:
+        """Describe a response.
+
+        The body is only decoded if a hook reads it. When the response
+        is streamed, the body is never read.
+        """
+        metadata = Metadata(
+            {
+                'http_method': http_method,
+                'route': self.url,
+                'status_code': response.status_code,
+                'headers': response.headers,
+                'stream': stream,
+            },
+            text=lambda: response.text,
+        )
+
+        if stream:
+            metadata['text'] = STREAMED_BODY
+
+        return metadata
+
+
+# Slots bound views leave unset, read from their template instead.
+_DELEGATED = frozenset(Route.__slots__)
+
+
+class _BoundRoutes(Mapping[str, Route]):
+    """Routes bound with arguments as they are read, for bound views."""
+
+    __slots__ = ('_routes', '_kwargs')
+
+    def __init__(self, routes: Mapping[str, Route], kwargs: Mapping[str, str]):
+        self._routes = routes
+        self._kwargs = kwargs
+
+    def __getitem__(self, name: str) -> Route:
+        """Get a Route, bound with the arguments."""
+        return self._routes[name]._bind(self._kwargs)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the names of the Routes."""
+        return iter(self._routes)
+
+    def __len__(self) -> int:
+        """Count the Routes."""
+        return len(self._routes)
+
+
+def _attempt(
+    send: Callable[[], Any],
+    retrying: Retrying,
+    exceptions: Tuple[Type[BaseException], ...],
+) -> Tuple[Any, Optional[BaseException]]:
+    """Send a request, returning the response or the exception.
+
+    Exceptions that are not retried are raised, once the attempt is
+    recorded as aborted.
+    """
+    try:
+        return send(), None
+    except exceptions as e:
+        return None, e
+    except BaseException as e:
+        retrying.abort(e)
+        raise
+
+
+def _copy_routes(
+    routes: Mapping[str, Route], parent: Route, memodict: Dict,
+) -> Mapping[str, Route]:
+    """Deep copy callables or children, setting their new parent."""
+    if not routes:
+        return _NO_ROUTES
+
+    copies = {k: copy.deepcopy(v, memodict) for k, v in routes.items()}
+    for route in copies.values():
+        route._parent = parent
+    return copies
+
+
+def _reserve(limits: List[RateLimit]) -> float:
+    """Take a token from every limiter, returning the longest wait."""
+    return max((limit.reserve() for limit in limits), default=0.0)
+
+
+def _wait(limits: List[RateLimit]) -> None:
+    delay = _reserve(limits)
+    if delay > 0:
+        time.sleep(delay)
+
+
+def _adapt(limits: List[RateLimit], response: Any) -> None:
+    """Let the most specific limiter follow the response's headers."""
+    if limits:
+        limits[0].update(response.status_code, response.headers)
+
+
+def _outcome(response: Any, error: Optional[BaseException]) -> Any:
+    """Return the final response, or raise the final exception."""
+    if error is not None:
+        raise error
+    return response
@@ -0,0 +1,136 @@
+from typing import Optional
+
+from .cache import Cache
+from .codec import JSONCodec
+from .metrics import Metrics
+from .profiling import Profiler
+from .ratelimit import RateLimit
+from .retry import CircuitBreaker, RetryBudget, RetryPolicy
+from .transport import RequestsTransport, Transport
+from .utils.singleflight import SingleFlight
+
+
+class Settings:
+    """Settings of a Client's optional features.
+
+    The attributes of a Client are Route names. Settings are kept apart
+    under Client.settings_, so an API can have Routes named config,
+    metrics, cache or rate_limit.
+
+    Example:
+        >>> client = Client('https://api.github.com/')
+        >>> client.settings_.rate_limit = RateLimit(1)
+        >>> client.add_route('rate_limit')
+        >>> response = client.rate_limit.get()
+
+    Arguments:
+        codec: JSON codec of the Client.
+
+    Attributes:
+        cache: Optional inori.cache.Cache. Routes opt out by setting
+            route.settings_.use_cache to False, or in with True when the
+            Cache is created with default=False.
+
+        single_flight: Optional SingleFlight. When set, identical GET, HEAD
+            and OPTIONS requests made at the same time share one response.
+
+        retry: Optional inori.retry.RetryPolicy used by every Route.
+            route.settings_.retry overrides it.
+
+        retry_budget: Optional inori.retry.RetryBudget capping the ratio
+            of retries to requests across the Client.
+
+        circuit_breaker: Optional inori.retry.CircuitBreaker. Every Route
+            gets its own copy, with the same settings.
+
+        rate_limit: Optional inori.ratelimit.RateLimit shared by every
+            Route. route.settings_.rate_limit adds a limit for a Route and
+            the Routes below it.
+
+        metrics: Optional inori.metrics.Metrics collecting latency, status
+            and size per route template.
+
+        profiler: Optional inori.profiling.Profiler timing the phases of
+            requests.
+
+        transport: inori.transport.Transport sending the requests of every
+            Route. Defaults to RequestsTransport, which uses the session.
+
+        codec: inori.codec.JSONCodec used by Route.get_json() and to encode
+            json= bodies.
+
+    """
+
+    # Settings are read on every request. Misspelled ones raise.
+    __slots__ = (
+        'cache',
+        'single_flight',
+        'retry',
+        'retry_budget',
+        'circuit_breaker',
+        'rate_limit',
+        'metrics',
+        'profiler',
+        'transport',
+        'codec',
+    )
+
+    def __init__(self, codec: JSONCodec):
+        # Response cache used by every Route, see inori.cache.Cache
+        self.cache: Optional[Cache] = None
+
+        # Coalesces identical requests in flight, see SingleFlight
+        self.single_flight: Optional[SingleFlight] = None
+
+        # Retry policy for every Route, see inori.retry
+        self.retry: Optional[RetryPolicy] = None
+        self.retry_budget: Optional[RetryBudget] = None
+
+        # Each Route gets its own copy, see inori.retry.CircuitBreaker
+        self.circuit_breaker: Optional[CircuitBreaker] = None
+
+        # Global request rate, see inori.ratelimit.RateLimit
+        self.rate_limit: Optional[RateLimit] = None
+
+        # Per-route measurements, see inori.metrics.Metrics
+        self.metrics: Optional[Metrics] = None
+
+        # Per-phase timings, see inori.profiling.Profiler
+        self.profiler: Optional[Profiler] = None
+
+        # Sends the requests, see inori.transport
+        self.transport: Transport = RequestsTransport()
+
+        # JSON library for bodies, see inori.codec.get_codec
+        self.codec = codec
+
+
+class RouteSettings:
+    """Settings of a Route, overriding the ones of its Client.
+
+    Kept apart from the attributes of the Route, so an API can have child
+    Routes named retry or rate_limit.
+
+    Example:
+        >>> client.add_route('reports').settings_.retry = RetryPolicy(total=0)
+
+    Attributes:
+        use_cache: Use the Client's cache. None follows Cache.default.
+
+        retry: Optional inori.retry.RetryPolicy. None follows the Client.
+
+        circuit_breaker: Created from Client.settings_.circuit_breaker on
+            first use.
+
+        rate_limit: Optional inori.ratelimit.RateLimit for the Route and
+            the Routes below it.
+
+    """
+
+    __slots__ = ('use_cache', 'retry', 'circuit_breaker', 'rate_limit')
+
+    def __init__(self):
+        self.use_cache: Optional[bool] = None
+        self.retry: Optional[RetryPolicy] = None
+        self.circuit_breaker: Optional[CircuitBreaker] = None
+        self.rate_limit: Optional[RateLimit] = None
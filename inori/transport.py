@@ -0,0 +1,448 @@
+import json
+from typing import (
+    AbstractSet, Any, Dict, Iterator, MutableMapping, Optional, TYPE_CHECKING,
+)
+from urllib.parse import urlencode
+
+import requests
+from requests.auth import HTTPBasicAuth
+from requests.utils import get_encoding_from_headers, parse_header_links
+
+import urllib3
+from urllib3._collections import HTTPHeaderDict
+from urllib3.exceptions import (
+    ConnectTimeoutError, HTTPError, MaxRetryError, ReadTimeoutError, SSLError,
+)
+
+from .upload import body_size
+from .version import __version__
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .client import Client
+
+# Keyword arguments of Route.request() Urllib3Transport can send.
+URLLIB3_KWARGS = frozenset(
+    ('params', 'data', 'timeout', 'stream', 'allow_redirects'),
+)
+
+# Headers sent by Urllib3Transport unless the request sets them.
+DEFAULT_HEADERS = {
+    'User-Agent': f'inori/{__version__}',
+    'Accept-Encoding': 'gzip, deflate',
+    'Accept': '*/*',
+    'Connection': 'keep-alive',
+}
+
+# Redirects are followed by urllib3, nothing else is retried.
+# Retries are handled by inori.retry.
+_RETRIES = urllib3.Retry(
+    total=None, connect=0, read=False, status=0, other=0, redirect=30,
+)
+
+
+class Transport:
+    """Sends requests for a Client.
+
+    Route.request() renders the URL, headers and body, then hands them to
+    the Client's transport. Retries, rate limits, caching and hooks
+    happen around the transport, so they work with any of them.
+
+    Subclasses implement send().
+    """
+
+    def send(
+        self,
+        client: 'Client',
+        http_method: str,
+        url: str,
+        headers: Dict[str, str],
+        **kwargs: Any,
+    ) -> Any:
+        """Send a request, returning its response.
+
+        Arguments:
+            client: The Client sending the request.
+            http_method: HTTP method of the request.
+            url: Full URL of the request.
+            headers: Headers of the request.
+
+        Accepts the keyword arguments of requests.Session.request() the
+        transport supports.
+
+        Returns:
+            A requests.Response, or an object with the same attributes.
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Close the connections held by the transport."""
+
+
+class RequestsTransport(Transport):
+    """Send requests with the Client's requests.Session.
+
+    This is the default transport. Every feature of requests is available:
+    adapters, cookies, proxies, files, and any authentication handler.
+    """
+
+    def send(
+        self,
+        client: 'Client',
+        http_method: str,
+        url: str,
+        headers: Dict[str, str],
+        **kwargs: Any,
+    ) -> requests.Response:
+        """Send a request with requests.Session.request()."""
+        return client._get_session().request(
+            http_method, url, headers=headers, **kwargs,
+        )
+
+    def close(self) -> None:
+        """The session belongs to the Client, it is left open."""
+
+
+def apply_auth(
+    auth: Any, http_method: str, url: str, headers: Dict[str, str],
+) -> Dict[str, str]:
+    """Get the headers of a request once an auth handler has run.
+
+    Used by transports that don't send a requests.PreparedRequest.
+    Handlers can only change the headers.
+
+    Arguments:
+        auth: A (username, password) tuple or a requests.auth.AuthBase.
+        http_method: HTTP method of the request.
+        url: Full URL of the request.
+        headers: Headers of the request.
+    """
+    if auth is None:
+        return headers
+    if isinstance(auth, tuple):
+        auth = HTTPBasicAuth(*auth)
+
+    prepared = requests.Request(http_method, url, headers=headers).prepare()
+    return dict(auth(prepared).headers)
+
+
+def encode_params(url: str, params: Any) -> str:
+    """Add query parameters to a URL, the same way requests does."""
+    if not params:
+        return url
+    if isinstance(params, bytes):
+        params = params.decode('utf-8')
+    if not isinstance(params, str):
+        if hasattr(params, 'items'):
+            params = params.items()
+        params = urlencode(
+            [(k, v) for k, v in params if v is not None], doseq=True,
+        )
+
+    separator = '&' if '?' in url else '?'
+    return f'{url}{separator}{params}'
+
+
+def check_kwargs(
+    transport: Transport, kwargs: Dict[str, Any], supported: AbstractSet[str],
+) -> None:
+    """Check a transport can send the keyword arguments of a request.
+
+    Raises:
+        TypeError: For the arguments it can't send.
+    """
+    unsupported = kwargs.keys() - supported
+    if unsupported:
+        raise TypeError(
+            f'{type(transport).__name__} does not support '
+            f'{sorted(unsupported)}, use RequestsTransport.',
+        )
+
+
+def encode_data(data: Any, headers: MutableMapping[str, str]) -> Any:
+    """Encode a data= body like requests, setting its framing headers.
+
+    Forms are URL encoded and str is encoded to UTF-8. Other bodies are
+    returned as they are.
+
+    Arguments:
+        data: The body of the request.
+        headers: Case insensitive headers of the request, updated in place.
+    """
+    if data is None:
+        return None
+
+    if isinstance(data, (dict, list)):
+        data = urlencode(data, doseq=True)
+        headers.setdefault(
+            'Content-Type', 'application/x-www-form-urlencoded',
+        )
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+
+    # UploadBody knows its size, other bodies are measured.
+    size = getattr(data, 'len', None)
+    if size is None:
+        size = body_size(data)
+    if size is not None:
+        headers.setdefault('Content-Length', str(size))
+
+    return data
+
+
+def _timeout(value: Any) -> Any:
+    """Convert a requests timeout to a urllib3.Timeout."""
+    if isinstance(value, tuple):
+        connect, read = value
+        return urllib3.Timeout(connect=connect, read=read)
+    return urllib3.Timeout(connect=value, read=value)
+
+
+def _translate(error: HTTPError) -> requests.RequestException:
+    """Get the requests exception matching a urllib3 one.
+
+    inori.retry and callers catch requests exceptions, whichever the
+    transport.
+    """
+    if isinstance(error, MaxRetryError) and error.reason is not None:
+        error = error.reason  # type: ignore
+
+    if isinstance(error, ConnectTimeoutError):
+        return requests.ConnectTimeout(error)
+    if isinstance(error, ReadTimeoutError):
+        return requests.ReadTimeout(error)
+    if isinstance(error, SSLError):
+        return requests.exceptions.SSLError(error)
+    return requests.ConnectionError(error)
+
+
+class SlimResponse:
+    """Response of Urllib3Transport.
+
+    Has the attributes of requests.Response inori and most callers use,
+    without building a requests.Response.
+
+    Attributes:
+        raw: The urllib3 response.
+        status_code: Status code of the response.
+        reason: Reason phrase of the response.
+        url: Final URL of the response, after redirects.
+    """
+
+    def __init__(self, raw: Any, url: str, stream: bool = False):
+        self.raw = raw
+        self.status_code: int = raw.status
+        self.reason: str = raw.reason
+        self.url = getattr(raw, 'url', None) or url
+
+        self._encoding: Optional[str] = None
+
+        # Read by urllib3 already, unless streamed.
+        self._content: Optional[bytes] = None if stream else raw.data
+
+    @property
+    def headers(self) -> HTTPHeaderDict:
+        """Headers as parsed by urllib3, case insensitive, not copied."""
+        return self.raw.headers
+
+    @property
+    def content(self) -> bytes:
+        """Body of the response, read on first use."""
+        if self._content is None:
+            try:
+                self._content = self.raw.data
+            except HTTPError as error:
+                raise _translate(error) from error
+            finally:
+                self.raw.release_conn()
+        return self._content
+
+    @property
+    def view(self) -> memoryview:
+        """Body of the response, as a memoryview. Slicing doesn't copy."""
+        return memoryview(self.content)
+
+    @property
+    def encoding(self) -> str:
+        """Encoding of the text, from the Content-Type header.
+
+        Defaults to UTF-8. Can be set before reading text.
+        """
+        if self._encoding is None:
+            self._encoding = get_encoding_from_headers(self.headers) or 'utf-8'
+        return self._encoding
+
+    @encoding.setter
+    def encoding(self, value: str) -> None:
+        self._encoding = value
+
+    @property
+    def text(self) -> str:
+        """Body of the response, decoded."""
+        return self.content.decode(self.encoding, errors='replace')
+
+    def json(self, **kwargs: Any) -> Any:
+        """Decode the JSON body of the response."""
+        return json.loads(self.content, **kwargs)
+
+    @property
+    def links(self) -> Dict[str, Dict[str, str]]:
+        """Parsed Link header, by rel or url."""
+        header = self.headers.get('Link')
+        if not header:
+            return {}
+        return {
+            link.get('rel') or link.get('url'): link
+            for link in parse_header_links(header)
+        }
+
+    @property
+    def ok(self) -> bool:
+        """True if the status code is below 400."""
+        return self.status_code < 400
+
+    def raise_for_status(self) -> None:
+        """Raise requests.HTTPError for 4xx and 5xx responses."""
+        if self.ok:
+            return
+
+        kind = 'Client' if self.status_code < 500 else 'Server'
+        raise requests.HTTPError(
+            f'{self.status_code} {kind} Error: {self.reason} '
+            f'for url: {self.url}',
+            response=self,
+        )
+
+    def iter_content(
+        self, chunk_size: Optional[int] = 1, decode_unicode: bool = False,
+    ) -> Iterator[Any]:
+        """Iterate over the body in chunks, reading it as it arrives."""
+        if self._content is not None:
+            view = self.view
+            size = chunk_size or len(view) or 1
+            chunks: Iterator[Any] = (
+                view[i:i + size].tobytes() for i in range(0, len(view), size)
+            )
+        else:
+            chunks = self._stream(chunk_size)
+
+        if not decode_unicode:
+            return chunks
+        return (i.decode(self.encoding, errors='replace') for i in chunks)
+
+    def _stream(self, chunk_size: Optional[int]) -> Iterator[bytes]:
+        try:
+            yield from self.raw.stream(chunk_size, decode_content=True)
+        except HTTPError as error:
+            raise _translate(error) from error
+        finally:
+            self.raw.release_conn()
+
+    def close(self) -> None:
+        """Release the connection. An unread body closes it."""
+        if self._content is None:
+            self.raw.close()
+        self.raw.release_conn()
+
+    def __enter__(self) -> 'SlimResponse':
+        """Use the response as a context manager, closing it on exit."""
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """Close the response."""
+        self.close()
+
+    def __bool__(self) -> bool:
+        """Same as ok."""
+        return self.ok
+
+    def __repr__(self) -> str:
+        """Show the status code."""
+        return f'<SlimResponse [{self.status_code}]>'
+
+
+class Urllib3Transport(Transport):
+    """Send requests straight to a urllib3 pool.
+
+    Skips the adapters, hooks and Response building of requests, for
+    lower overhead per request. Responses are SlimResponse objects.
+
+    Supports the params, data, timeout, stream and allow_redirects
+    keyword arguments. Client.auth is applied, but cookies, proxies and
+    files are not supported: use RequestsTransport for them.
+
+    Example:
+        >>> client = Client('http://my.service/api/v777')
+        >>> client.settings_.transport = Urllib3Transport(maxsize=20)
+
+    Arguments:
+        num_pools: Number of connection pools to cache.
+        maxsize: Maximum number of connections kept per host.
+        block: If True, block when no free connection is available
+            instead of opening a new one.
+
+    Accepts the keyword arguments of urllib3.PoolManager, ie: cert_reqs.
+
+    Attributes:
+        poolmanager: The urllib3.PoolManager sending the requests.
+        headers: Headers sent unless a request sets them.
+    """
+
+    def __init__(
+        self,
+        num_pools: int = 10,
+        maxsize: int = 10,
+        block: bool = False,
+        **pool_kwargs: Any,
+    ):
+        self.poolmanager = urllib3.PoolManager(
+            num_pools=num_pools,
+            maxsize=maxsize,
+            block=block,
+            retries=_RETRIES,
+            **pool_kwargs,
+        )
+        self.headers = dict(DEFAULT_HEADERS)
+
+    def send(
+        self,
+        client: 'Client',
+        http_method: str,
+        url: str,
+        headers: Dict[str, str],
+        **kwargs: Any,
+    ) -> SlimResponse:
+        """Send a request with urllib3.
+
+        Raises:
+            TypeError: For keyword arguments urllib3 can't send.
+        """
+        check_kwargs(self, kwargs, URLLIB3_KWARGS)
+
+        url = encode_params(url, kwargs.get('params'))
+        headers = apply_auth(client.auth, http_method, url, headers)
+        send_headers = HTTPHeaderDict(self.headers)
+        send_headers.update(headers)
+        body = encode_data(kwargs.get('data'), send_headers)
+
+        options = {}
+        if kwargs.get('timeout') is not None:
+            options['timeout'] = _timeout(kwargs['timeout'])
+
+        try:
+            raw = self.poolmanager.urlopen(
+                http_method,
+                url,
+                body=body,
+                headers=send_headers,
+                redirect=kwargs.get('allow_redirects', True),
+                preload_content=not kwargs.get('stream', False),
+                **options,
+            )
+        except HTTPError as error:
+            raise _translate(error) from error
+
+        return SlimResponse(raw, url, kwargs.get('stream', False))
+
+    def close(self) -> None:
+        """Close every connection in the pools."""
+        self.poolmanager.clear()
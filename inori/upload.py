@@ -0,0 +1,272 @@
+import functools
+import inspect
+import mmap
+import os
+from typing import (
+    Any, AsyncIterator, Callable, Iterator, Optional, Union,
+)
+
+# Size of the chunks streamed bodies are sent in.
+CHUNK_SIZE = 64 * 1024
+
+# str and bytes bodies up to this size are kept in the request metadata.
+# Larger bodies are replaced by a BodySummary.
+INLINE_LIMIT = 64 * 1024
+
+# Bodies that can be sent from memory without copying.
+BYTES_LIKE = (bytes, bytearray, memoryview, mmap.mmap)
+
+# Called with the bytes sent so far and the total, if known.
+Progress = Callable[[int, Optional[int]], Any]
+
+
+def body_size(body: Any) -> Optional[int]:
+    """Get the number of bytes left to send in a body, if it is known."""
+    if isinstance(body, memoryview):
+        return body.nbytes
+    if isinstance(body, (bytes, bytearray, str, mmap.mmap)):
+        return len(body)
+
+    try:
+        return os.fstat(body.fileno()).st_size - body.tell()
+    except (AttributeError, OSError, ValueError):
+        return _remaining(body)
+
+
+def _remaining(body: Any) -> Optional[int]:
+    """Measure a seekable body without a file descriptor, ie: io.BytesIO."""
+    try:
+        position = body.tell()
+        end = body.seek(0, os.SEEK_END)
+        body.seek(position)
+    except (AttributeError, OSError, ValueError):
+        return None
+    return end - position
+
+
+class BodySummary:
+    """Stand-in for a request body in the request metadata.
+
+    Attributes:
+        kind: Type of the body, ie: BufferedReader or generator.
+        size: Size of the body in bytes, None if it is not known.
+    """
+
+    __slots__ = ('kind', 'size')
+
+    def __init__(self, kind: str, size: Optional[int]):
+        self.kind = kind
+        self.size = size
+
+    def __eq__(self, other: Any) -> bool:
+        """Compare the kind and size."""
+        if not isinstance(other, BodySummary):
+            return NotImplemented
+        return (self.kind, self.size) == (other.kind, other.size)
+
+    def __repr__(self) -> str:
+        """Describe the body, ie: <BufferedReader: 1024 bytes>."""
+        size = 'unknown size' if self.size is None else f'{self.size} bytes'
+        return f'<{self.kind}: {size}>'
+
+    __str__ = __repr__
+
+
+def summarize(body: Any) -> Any:
+    """Get what the request metadata keeps of a body.
+
+    Form data, JSON bodies and small str or bytes bodies are kept as is.
+    Other bodies are replaced by a BodySummary, so the metadata never
+    holds a file, a stream or a large payload.
+    """
+    if body is None or isinstance(body, (dict, list, tuple)):
+        return body
+
+    size = body_size(body)
+    if isinstance(body, (str, bytes)) and size <= INLINE_LIMIT:  # type: ignore
+        return body
+
+    return BodySummary(type(body).__name__, size)
+
+
+def is_streamable(body: Any) -> bool:
+    """Check if a body can be sent in chunks."""
+    if isinstance(body, (*BYTES_LIKE, Iterator)):
+        return True
+    return hasattr(body, 'read') or hasattr(body, '__aiter__')
+
+
+def iter_chunks(body: Any, chunk_size: int = CHUNK_SIZE) -> Iterator[Any]:
+    """Iterate over a body in chunks.
+
+    Bytes-like bodies yield memoryview slices, so nothing is copied.
+    Files are read one chunk at a time.
+    """
+    if isinstance(body, BYTES_LIKE):
+        view = memoryview(body).cast('B')
+        for start in range(0, len(view), chunk_size):
+            yield view[start:start + chunk_size]
+    elif hasattr(body, 'read'):
+        yield from iter(lambda: body.read(chunk_size), body.read(0))
+    else:
+        yield from body
+
+
+# Rewinds bodies sent from memory, which are read from the start each time.
+def _stay() -> None:
+    pass
+
+
+def rewinder(body: Any) -> Optional[Callable[[], None]]:
+    """Get a function putting a body back where it started, to resend it.
+
+    Files go back to their current position. Bodies sent from memory need
+    nothing.
+
+    Returns:
+        None if the body can only be read once, ie: a generator.
+    """
+    if body is None or isinstance(body, (str, dict, list, tuple, *BYTES_LIKE)):
+        return _stay
+    if isinstance(body, _Upload):
+        return None if body._rewind is None else body.rewind
+
+    try:
+        position = body.tell()
+    except (AttributeError, OSError, ValueError):
+        return None
+    return functools.partial(body.seek, position)
+
+
+class _Upload:
+    """Body sent in chunks, counting the bytes sent."""
+
+    def __init__(
+        self,
+        body: Any,
+        progress: Optional[Progress] = None,
+        chunk_size: int = CHUNK_SIZE,
+    ):
+        self.body = body
+        self.progress = progress
+        self.chunk_size = chunk_size
+
+        self.len = body_size(body)
+        self.sent = 0
+
+        # Read before anything is sent: files rewind to where they are now.
+        self._rewind = rewinder(body)
+
+    def rewind(self) -> None:
+        """Go back to the start of the body, to send it again."""
+        if self._rewind is None:
+            raise ValueError(
+                f'{type(self.body).__name__} bodies can only be sent once.',
+            )
+        self._rewind()
+        self.sent = 0
+
+    def _count(self, chunk: Any) -> Any:
+        self.sent += len(chunk)
+        if self.progress is not None:
+            return self.progress(self.sent, self.len)
+        return None
+
+
+class UploadBody(_Upload):
+    """Request body sent in chunks, reporting progress.
+
+    requests sends it with a Content-Length when the size is known,
+    otherwise with chunked transfer encoding.
+
+    Arguments:
+        body: Bytes-like object, file or iterator of bytes.
+        progress: Called after every chunk with the bytes sent so far and
+            the total, if known.
+        chunk_size: Size of the chunks read from files and bytes-like
+            bodies.
+
+    Attributes:
+        len: Size of the body, read by requests. None if it is not known.
+        sent: Bytes sent so far.
+    """
+
+    def __iter__(self) -> Iterator[Any]:
+        """Yield the chunks of the body."""
+        for chunk in iter_chunks(self.body, self.chunk_size):
+            yield chunk
+            self._count(chunk)
+
+
+class AsyncUploadBody(_Upload):
+    """Request body sent in chunks by httpx, reporting progress.
+
+    Accepts the same arguments as UploadBody, and async iterators.
+    Progress functions can be coroutine functions.
+
+    It is only async iterable: httpx would send an iterable body
+    synchronously.
+    """
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        """Yield the chunks of the body."""
+        if hasattr(self.body, '__aiter__'):
+            chunks: Any = self.body
+        else:
+            chunks = _aiter(iter_chunks(self.body, self.chunk_size))
+
+        async for chunk in chunks:
+            # httpx sends bytes.
+            chunk = bytes(chunk) if isinstance(chunk, memoryview) else chunk
+            yield chunk
+
+            result = self._count(chunk)
+            if inspect.isawaitable(result):
+                await result
+
+
+async def _aiter(iterator: Iterator[Any]) -> AsyncIterator[Any]:
+    for i in iterator:
+        yield i
+
+
+def prepare_upload(
+    body: Any,
+    progress: Optional[Progress] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Any:
+    """Prepare a body to be sent by requests.
+
+    mmap bodies are sent through a memoryview, without copying. If there
+    is a progress function, streamable bodies are wrapped in an
+    UploadBody.
+
+    Raises:
+        TypeError: If the body is an async iterator.
+    """
+    if hasattr(body, '__aiter__'):
+        raise TypeError('Async iterators can only be sent by AsyncClient.')
+
+    if progress is None or not is_streamable(body):
+        return memoryview(body) if isinstance(body, mmap.mmap) else body
+
+    return UploadBody(body, progress, chunk_size)
+
+
+def prepare_upload_async(
+    body: Any,
+    progress: Optional[Progress] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Union[Any, AsyncUploadBody]:
+    """Prepare a body to be sent by httpx.
+
+    httpx doesn't accept mmap and memoryview bodies, they are always
+    wrapped in an AsyncUploadBody. Other streamable bodies are wrapped if
+    there is a progress function.
+    """
+    if not is_streamable(body):
+        return body
+    if progress is None and not isinstance(body, (mmap.mmap, memoryview)):
+        return body
+
+    return AsyncUploadBody(body, progress, chunk_size)
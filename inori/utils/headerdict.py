@@ -1,17 +1,313 @@
-from typing import Dict
+import asyncio
+import inspect
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from typing import (
+    Any, Callable, Dict, Hashable, Iterable, Optional, Set, Tuple,
+)
+
+from .singleflight import SingleFlight
+
+# Time an entry was stored, and its value.
+_Entry = Tuple[float, Any]
+
+# Versions are unique across every HeaderDict.
+_versions = itertools.count(1)
+
+
+class MemoizedHeader:
+    """Header function whose results are reused until they expire.
+
+    Once `refresh_at` of the TTL has elapsed, the cached value is still
+    returned but a new one is computed in the background. Concurrent
+    callers share a single computation.
+
+    Arguments:
+        function: The header function.
+        ttl: Seconds a value is used for. If None, values never expire.
+        cache_key: Function taking the header function's arguments and
+            returning a hashable key. Values are cached per key. If None,
+            a single value is cached.
+        refresh_at: Fraction of the TTL after which the value is refreshed
+            in the background.
+        max_entries: Number of keys cached. The least recently used
+            values are removed when it is exceeded.
+
+    Attributes:
+        hits: Calls answered from the cache.
+        misses: Calls that had to wait for the function.
+        refreshes: Values computed in the background.
+        errors: Background refreshes that raised an exception.
+        evictions: Values removed to stay within max_entries.
+    """
+
+    def __init__(
+        self,
+        function: Callable[..., Any],
+        ttl: Optional[float] = None,
+        cache_key: Optional[Callable[..., Hashable]] = None,
+        refresh_at: float = 0.8,
+        max_entries: int = 1024,
+    ):
+        self.function = function
+        self.ttl = ttl
+        self.cache_key = cache_key
+        self.refresh_at = refresh_at
+        self.max_entries = max_entries
+
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.errors = 0
+        self.evictions = 0
+
+        # Least recently used first.
+        self._entries: 'OrderedDict[Hashable, _Entry]' = OrderedDict()
+        self._refreshing: Set[Hashable] = set()
+
+        # Expired entries are removed at most once per TTL.
+        self._pruned_at = 0.0
+
+        # Background refreshes on the event loop, kept until done.
+        self._tasks: Set[asyncio.Future] = set()
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+
+    def __call__(self, *args: Any) -> Any:
+        """Get the cached value, or compute it.
+
+        Coroutine functions return an awaitable.
+        """
+        if inspect.iscoroutinefunction(self.function):
+            return self._call_async(*args)
+
+        key = self._key(args)
+        entry = self._get(key)
+        if entry is not None:
+            self.hits += 1
+            if self._is_due(entry) and self._start_refresh(key):
+                threading.Thread(
+                    target=self._refresh, args=(key, args), daemon=True,
+                ).start()
+            return entry[1]  # type: ignore
+
+        self.misses += 1
+        return self._flight.do(key, lambda: self._compute(key, args))
+
+    async def _call_async(self, *args: Any) -> Any:
+        key = self._key(args)
+        entry = self._get(key)
+        if entry is not None:
+            self.hits += 1
+            if self._is_due(entry) and self._start_refresh(key):
+                task = asyncio.ensure_future(self._refresh_async(key, args))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+            return entry[1]
+
+        self.misses += 1
+        return await self._flight.do_async(
+            key, lambda: self._compute_async(key, args),
+        )
+
+    def invalidate(self) -> None:
+        """Drop every cached value, ie: after a token was revoked."""
+        with self._lock:
+            self._entries.clear()
+
+    def _key(self, args: Tuple[Any, ...]) -> Hashable:
+        return None if self.cache_key is None else self.cache_key(*args)
+
+    def _age(self, entry: _Entry) -> float:
+        return time.monotonic() - entry[0]
+
+    def _is_usable(self, entry: _Entry) -> bool:
+        return self.ttl is None or self._age(entry) < self.ttl
+
+    def _get(self, key: Hashable) -> Optional[_Entry]:
+        """Get a usable entry, marking it as recently used.
+
+        An expired entry is removed.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            if not self._is_usable(entry):
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return entry
+
+    def _is_due(self, entry: Optional[_Entry]) -> bool:
+        """Check if a usable entry should be refreshed in the background."""
+        if self.ttl is None:
+            return False
+        return self._age(entry) >= self.ttl * self.refresh_at  # type: ignore
+
+    def _start_refresh(self, key: Hashable) -> bool:
+        """Mark a key as refreshing, unless it already is."""
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def _store(self, key: Hashable, value: Any) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (now, value)
+            self._prune(now)
+        return value
+
+    def _prune(self, now: float) -> None:
+        """Remove expired entries, then the least recently used ones."""
+        entries = self._entries
+        if self.ttl is not None and now - self._pruned_at >= self.ttl:
+            self._pruned_at = now
+            expired = [
+                key for key, entry in entries.items()
+                if now - entry[0] >= self.ttl
+            ]
+            for key in expired:
+                del entries[key]
+
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+    def _compute(self, key: Hashable, args: Tuple[Any, ...]) -> Any:
+        return self._store(key, self.function(*args))
+
+    async def _compute_async(
+        self, key: Hashable, args: Tuple[Any, ...],
+    ) -> Any:
+        return self._store(key, await self.function(*args))
+
+    def _refresh(self, key: Hashable, args: Tuple[Any, ...]) -> None:
+        """Compute a new value in the background."""
+        try:
+            self._flight.do(key, lambda: self._compute(key, args))
+            self.refreshes += 1
+        except Exception:
+            # The cached value is used until it expires.
+            self.errors += 1
+        finally:
+            self._refreshing.discard(key)
+
+    async def _refresh_async(
+        self, key: Hashable, args: Tuple[Any, ...],
+    ) -> None:
+        try:
+            await self._flight.do_async(
+                key, lambda: self._compute_async(key, args),
+            )
+            self.refreshes += 1
+        except Exception:
+            self.errors += 1
+        finally:
+            self._refreshing.discard(key)
 
 
 class HeaderDict(dict):
-    """Dict that can store functions via a decorator."""
+    """Dict that can store functions via a decorator.
+
+    Attributes:
+        version: Changes every time the dict is modified. Cached merges
+            of the headers compare it to know if they are stale.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.version = next(_versions)
+
+    def _changed(self) -> None:
+        self.version = next(_versions)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        """Set a header, or a header function."""
+        super().__setitem__(key, value)
+        self._changed()
 
-    def __call__(self, key: str):
+    def __delitem__(self, key: str) -> None:
+        """Remove a header."""
+        super().__delitem__(key)
+        self._changed()
+
+    def __ior__(self, other: Any) -> 'HeaderDict':
+        """Update the headers in place."""
+        self.update(other)
+        return self
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        """Update the headers."""
+        super().update(*args, **kwargs)
+        self._changed()
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        """Set a header, unless it is already set."""
+        self._changed()
+        return super().setdefault(key, default)
+
+    def pop(self, *args: Any) -> Any:
+        """Remove a header and return it."""
+        self._changed()
+        return super().pop(*args)
+
+    def popitem(self) -> Tuple[str, Any]:
+        """Remove the last header and return it."""
+        self._changed()
+        return super().popitem()
+
+    def clear(self) -> None:
+        """Remove every header."""
+        super().clear()
+        self._changed()
+
+    def __reduce__(self) -> Any:
+        """Copy and pickle with a version of their own."""
+        return type(self), (dict(self),)
+
+    def static(self) -> Iterable[Tuple[str, Any]]:
+        """Iterate over the headers that are not functions."""
+        return ((k, v) for k, v in self.items() if not callable(v))
+
+    def functions(self) -> Iterable[Tuple[str, Callable[..., Any]]]:
+        """Iterate over the header functions."""
+        return ((k, v) for k, v in self.items() if callable(v))
+
+    def __call__(
+        self,
+        key: str,
+        ttl: Optional[float] = None,
+        cache_key: Optional[Callable[..., Hashable]] = None,
+    ):
         """Decorator to store a function.
 
+        If ttl or cache_key is given, the function's results are
+        memoized, see MemoizedHeader.
+
+        Example:
+            >>> @client.headers('Authorization', ttl=300)
+            >>> def token(client, request_metadata):
+            >>>     return f'Bearer {mint_token()}'
+
         Arguments:
             key: The name for the key to be inserted
+            ttl: Seconds a result is reused for.
+            cache_key: Function taking the same arguments as the decorated
+                function, returning the key results are cached under.
         """
         def decorator(function):
-            self[key] = function
+            if ttl is None and cache_key is None:
+                self[key] = function
+            else:
+                self[key] = MemoizedHeader(function, ttl, cache_key)
         return decorator
 
     def run_functions(self, *args, **kwargs) -> Dict[str, str]:
@@ -25,3 +321,107 @@ class HeaderDict(dict):
                 rv[k] = v
 
         return rv
+
+    async def run_functions_async(self, *args, **kwargs) -> Dict[str, str]:
+        """Run all functions with the arguments provided.
+
+        Functions can be coroutine functions, their results are awaited.
+        """
+        rv = self.run_functions(*args, **kwargs)
+
+        for k, v in rv.items():
+            if inspect.isawaitable(v):
+                rv[k] = await v
+
+        return rv
+
+
+class MergedHeaders:
+    """Client and Route headers, merged once until either changes.
+
+    Headers that are not functions are merged into a single dict. Only
+    the functions are run for each request.
+
+    Arguments:
+        client_headers: The Client's headers.
+        route_headers: The Route's headers. They override the Client's.
+
+    Attributes:
+        static: The merged headers that are not functions.
+        client_functions: Client header functions the Route doesn't
+            override.
+        route_functions: Route header functions.
+    """
+
+    __slots__ = (
+        'client_version', 'route_version', 'static', 'client_functions',
+        'route_functions',
+    )
+
+    def __init__(self, client_headers: HeaderDict, route_headers: HeaderDict):
+        self.client_version = client_headers.version
+        self.route_version = route_headers.version
+
+        self.static = {
+            k: v for k, v in client_headers.static() if k not in route_headers
+        }
+        self.static.update(route_headers.static())
+
+        self.client_functions = tuple(
+            (k, v) for k, v in client_headers.functions()
+            if k not in route_headers
+        )
+        self.route_functions = tuple(route_headers.functions())
+
+    def is_current(
+        self, client_headers: HeaderDict, route_headers: HeaderDict,
+    ) -> bool:
+        """Check if neither HeaderDict changed since the merge."""
+        if self.client_version != client_headers.version:
+            return False
+        return self.route_version == route_headers.version
+
+    def evaluate(
+        self,
+        client: Any,
+        route: Any,
+        request_metadata: Dict[str, Any],
+        local_headers: Dict[str, str],
+    ) -> Dict[str, Any]:
+        """Run the header functions and merge every header.
+
+        Arguments:
+            client: Passed to the Client's header functions.
+            route: Passed to the Route's header functions.
+            request_metadata: Passed to every header function.
+            local_headers: Headers of the request, they override the rest.
+        """
+        rv = self.static.copy()
+
+        for k, fn in self.client_functions:
+            rv[k] = fn(client, request_metadata)
+        for k, fn in self.route_functions:
+            rv[k] = fn(route, request_metadata)
+
+        rv.update(local_headers)
+        return rv
+
+    async def evaluate_async(
+        self,
+        client: Any,
+        route: Any,
+        request_metadata: Dict[str, Any],
+        local_headers: Dict[str, str],
+    ) -> Dict[str, Any]:
+        """Run the header functions, awaiting coroutine functions.
+
+        Accepts the same arguments as MergedHeaders.evaluate().
+        """
+        rv = self.evaluate(client, route, request_metadata, {})
+
+        for k, v in rv.items():
+            if inspect.isawaitable(v):
+                rv[k] = await v
+
+        rv.update(local_headers)
+        return rv
@@ -0,0 +1,62 @@
+from typing import Any, Callable, Dict, Iterator, MutableMapping, Optional
+
+
+class Metadata(MutableMapping):
+    """Dict-like object where some values are only computed when accessed.
+
+    Values can be given directly, or as a function taking no arguments.
+    A function is called the first time its key is accessed and the result
+    is stored.
+
+    Example:
+        >>> metadata = Metadata({'status_code': 200}, text=lambda: 'Hi')
+        >>> metadata.is_loaded('text')
+        False
+        >>> metadata['text']
+        'Hi'
+    """
+
+    def __init__(
+        self,
+        values: Optional[Dict[str, Any]] = None,
+        **loaders: Callable[[], Any],
+    ):
+        self._values: Dict[str, Any] = dict(values or {})
+        self._loaders: Dict[str, Callable[[], Any]] = loaders
+
+    def is_loaded(self, key: str) -> bool:
+        """Check if the value for a key is available without computing it."""
+        return key in self._values
+
+    def __getitem__(self, key: str) -> Any:
+        """Get a value, computing it if required."""
+        if key in self._values:
+            return self._values[key]
+
+        loader = self._loaders.pop(key)
+        value = self._values[key] = loader()
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        """Set a value, replacing any function for the key."""
+        self._loaders.pop(key, None)
+        self._values[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        """Remove a value or function."""
+        if self._loaders.pop(key, None) is None:
+            del self._values[key]
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over every key, computed or not."""
+        # Keys are copied, reading a value moves it between the dicts.
+        return iter([*self._values, *self._loaders])
+
+    def __len__(self) -> int:
+        """Count every key, computed or not."""
+        return len(self._values) + len(self._loaders)
+
+    def __repr__(self) -> str:
+        """Show computed values, and the keys that have not been computed."""
+        pending = ', '.join(self._loaders)
+        return f'Metadata({self._values!r}, pending=[{pending}])'
@@ -0,0 +1,149 @@
+import asyncio
+import threading
+from typing import (
+    Any, Awaitable, Callable, Dict, Hashable, Iterable, Mapping, Optional,
+    Tuple,
+)
+
+import requests
+
+# Methods safe to share a response between callers.
+COALESCABLE_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+
+# Keyword arguments carrying a request body, for requests and httpx.
+BODY_KWARGS = ('data', 'json', 'content', 'files')
+
+
+class _Call:
+    """A call in flight, waited on by duplicate callers."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+    def result(self) -> Any:
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+class SingleFlight:
+    """Share one request between concurrent callers making the same request.
+
+    While a request is in flight, identical requests wait for it and get
+    the same response instead of being sent.
+
+    Example:
+        >>> client = Client('http://my.service/api/v777')
+        >>> client.settings_.single_flight = SingleFlight()
+
+    Arguments:
+        headers: Names of the request headers that make requests different.
+            If None, every header is used.
+
+    Attributes:
+        calls: Number of requests sent.
+        coalesced: Number of requests that waited on another one.
+    """
+
+    def __init__(self, headers: Optional[Iterable[str]] = None):
+        self.headers = (
+            None if headers is None else {h.lower() for h in headers}
+        )
+
+        self.calls = 0
+        self.coalesced = 0
+
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._tasks: Dict[Hashable, asyncio.Future] = {}
+
+    def stats(self) -> Dict[str, int]:
+        """Get the counters as a dict."""
+        return {'calls': self.calls, 'coalesced': self.coalesced}
+
+    def accepts(self, http_method: str, kwargs: Mapping[str, Any]) -> bool:
+        """Check if a request can share its response.
+
+        Requests with a body are never shared: the key doesn't include it.
+        """
+        if http_method not in COALESCABLE_METHODS or kwargs.get('stream'):
+            return False
+
+        return all(kwargs.get(k) is None for k in BODY_KWARGS)
+
+    def key(
+        self,
+        http_method: str,
+        url: str,
+        headers: Mapping[str, str],
+        params: Any = None,
+    ) -> Tuple:
+        """Build the key identifying a request."""
+        prepared = requests.PreparedRequest()
+        prepared.prepare_url(url, params)
+
+        relevant = tuple(sorted(
+            (k.lower(), str(v)) for k, v in headers.items()
+            if self.headers is None or k.lower() in self.headers
+        ))
+
+        return http_method, prepared.url, relevant
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Call fn, unless a call with the same key is in flight.
+
+        Arguments:
+            key: Identifies the call.
+            fn: Function taking no arguments.
+
+        Returns:
+            The result of fn, or of the call in flight.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+                leader = True
+
+        if leader:
+            self._run(key, call, fn)
+
+        return call.result()
+
+    def _run(self, key: Hashable, call: _Call, fn: Callable[[], Any]) -> None:
+        try:
+            call.value = fn()
+        except BaseException as e:
+            # Waiting callers get the error, the caller gets it raised.
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def do_async(
+        self, key: Hashable, fn: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Await fn, unless a call with the same key is in flight.
+
+        Accepts the same arguments as SingleFlight.do(), fn must return
+        an awaitable.
+        """
+        task = self._tasks.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            task = self._tasks[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+            self.calls += 1
+
+        # One caller being cancelled must not cancel the others.
+        return await asyncio.shield(task)
@@ -1,10 +1,62 @@
 import string
-from typing import Dict, Optional
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+# Positions of each placeholder in a compiled template, keyed by name.
+Slots = Mapping[str, Tuple[int, ...]]
+
+# Shared by every template without placeholders.
+_NO_SLOTS: Slots = MappingProxyType({})
+
+
+def compile_template(template: str) -> Tuple[Tuple[str, ...], Slots]:
+    """Split a template string into literal segments and placeholder slots.
+
+    Uses the same syntax as string.Template.
+
+    Arguments:
+        template: A string using string.Template syntax.
+
+    Returns:
+        tuple: The segments of the template and the slots of the
+            placeholders. Placeholders keep their original text until
+            they are substituted.
+    """
+    parts: List[str] = []
+    slots: Dict[str, List[int]] = {}
+    literal = ''
+    position = 0
+
+    for match in string.Template.pattern.finditer(template):
+        literal += template[position:match.start()]
+        position = match.end()
+
+        name = match.group('named') or match.group('braced')
+        if name is None:
+            # '$$' becomes '$', an invalid placeholder is left as-is.
+            escaped = match.group('escaped') is not None
+            literal += '$' if escaped else match.group()
+            continue
+
+        parts.append(literal)
+        literal = ''
+        slots.setdefault(name, []).append(len(parts))
+        parts.append(match.group())
+
+    parts.append(literal + template[position:])
+
+    if not slots:
+        return tuple(parts), _NO_SLOTS
+    return tuple(parts), {k: tuple(v) for k, v in slots.items()}
 
 
 class StringTemplate:
     """Create a string template to support partial string formatting.
 
+    The template is compiled once into literal segments and placeholder
+    slots. Rendering only joins the segments, and the rendered string is
+    cached.
+
     StringTemplate can compare to strings and other StringTemplate objects.
 
     Example:
@@ -14,22 +66,90 @@ class StringTemplate:
         >>> True
     """
 
+    __slots__ = ('_parts', '_slots', '_rendered')
+
     def __init__(self, template: str):
-        self.template = string.Template(template)
-        self.partial_substituted_str: str = ''
+        self._parts, self._slots = compile_template(template)
+        self._rendered: Optional[str] = None
+
+    @classmethod
+    def _from_parts(
+        cls, parts: Tuple[str, ...], slots: Slots,
+    ) -> 'StringTemplate':
+        new = cls.__new__(cls)
+        new._parts = parts
+        new._slots = slots
+        new._rendered = None
+        return new
+
+    @property
+    def placeholders(self) -> Tuple[str, ...]:
+        """Names of the placeholders that have not been substituted."""
+        return tuple(self._slots)
 
     def __eq__(self, other: object) -> bool:
         """Strings and StringTemplate can do an equality comparison."""
         return self.__repr__() == other
 
     def __repr__(self) -> str:
-        """Return self.template.safe_substitute()."""
-        return self.template.safe_substitute()
+        """Return the template with all known values substituted."""
+        if self._rendered is None:
+            self._rendered = ''.join(self._parts)
+        return self._rendered
 
     def __str__(self) -> str:
-        """Return self.template.safe_substitute()."""
+        """Return the template with all known values substituted."""
         return self.__repr__()
 
+    def _substitute(
+        self, mapping: Mapping[str, Any],
+    ) -> Tuple[Tuple[str, ...], Slots]:
+        parts = list(self._parts)
+        slots: Dict[str, Tuple[int, ...]] = {}
+
+        for name, positions in self._slots.items():
+            if name not in mapping:
+                slots[name] = positions
+                continue
+
+            value = str(mapping[name])
+            for i in positions:
+                parts[i] = value
+
+        return tuple(parts), slots or _NO_SLOTS
+
+    def partial(
+        self, mapping: Optional[Mapping[str, Any]] = None, **kwargs: Any,
+    ) -> 'StringTemplate':
+        """Get a new StringTemplate with some placeholders substituted.
+
+        The original StringTemplate is not modified.
+
+        Example:
+            s = StringTemplate('${hello} ${world}')
+            s.partial(world='World') == '${hello} World'
+            >>> True
+        """
+        mapping = {**mapping, **kwargs} if mapping else kwargs
+        if not self._slots or not mapping:
+            return self._from_parts(self._parts, self._slots)
+
+        return self._from_parts(*self._substitute(mapping))
+
+    def render(
+        self, mapping: Optional[Mapping[str, Any]] = None, **kwargs: Any,
+    ) -> str:
+        """Get the template as a string with placeholders substituted.
+
+        The original StringTemplate is not modified.
+        """
+        mapping = {**mapping, **kwargs} if mapping else kwargs
+        if not self._slots or not mapping:
+            return self.__repr__()
+
+        parts, _ = self._substitute(mapping)
+        return ''.join(parts)
+
     def format(self, mapping: Optional[Dict[str, str]]=None, **kwargs: str) -> str:  # NOQA A003
         """Format a string in such a way that a partial is allowed.
 
@@ -41,10 +161,9 @@ class StringTemplate:
             s == '${hello} World'
             >>> True
         """
-        mapping = mapping or {}
+        mapping = {**mapping, **kwargs} if mapping else kwargs
+        if self._slots and mapping:
+            self._parts, self._slots = self._substitute(mapping)
+            self._rendered = None
 
-        self.partial_substituted_str = self.template.safe_substitute(
-            mapping, **kwargs,
-        )
-        self.template = string.Template(self.partial_substituted_str)
         return self.__repr__()
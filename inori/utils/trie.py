@@ -0,0 +1,76 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .sanitize import safe_illegal_character, safe_keyword
+
+
+def split_path(path: str) -> List[str]:
+    """Split a path into its pieces, ignoring empty ones."""
+    return [i for i in path.split('/') if i != '']
+
+
+def attribute_name(piece: str) -> str:
+    """Get the attribute name a Route is stored under for a piece."""
+    return safe_illegal_character(safe_keyword(piece))
+
+
+def is_parameter(piece: str) -> bool:
+    """Check if a piece is a template parameter, ie: ${fruitId}."""
+    return piece.startswith('${') and piece.endswith('}')
+
+
+class PathNode:
+    """Node of a trie of path pieces, for Routes not created yet.
+
+    Only the pieces and a flag are held, Route objects are created from
+    the nodes when they are first used.
+
+    Attributes:
+        children: Nodes for the next pieces, keyed by piece.
+        trailing_slash: Value given to the Route created from the node.
+    """
+
+    __slots__ = ('children', 'trailing_slash', '_names')
+
+    def __init__(self, trailing_slash: bool = False):
+        self.children: Dict[str, PathNode] = {}
+        self.trailing_slash = trailing_slash
+        self._names: Optional[Dict[str, str]] = None
+
+    def insert(self, pieces: Iterable[str], trailing_slash: bool) -> None:
+        """Add a path to the trie.
+
+        Arguments:
+            pieces: The pieces of the path.
+            trailing_slash: Same as Client.add_route(). Applies to the first
+                piece and to parameters, if their nodes are new.
+        """
+        node = self
+        for index, piece in enumerate(pieces):
+            child = node.children.get(piece)
+            if child is None:
+                flag = trailing_slash and (index == 0 or is_parameter(piece))
+                child = node.children[piece] = PathNode(flag)
+                node._names = None
+            node = child
+
+    def find(self, name: str) -> Optional[str]:
+        """Get the piece stored under an attribute name."""
+        if self._names is None:
+            self._names = {
+                attribute_name(piece): piece
+                for piece in self.children if not is_parameter(piece)
+            }
+        return self._names.get(name)
+
+    def pop(self, piece: str) -> 'PathNode':
+        """Remove the node for a piece."""
+        self._names = None
+        return self.children.pop(piece)
+
+    def __iter__(self) -> Iterator[Tuple[str, 'PathNode']]:
+        """Iterate over the pieces and their nodes."""
+        return iter(self.children.items())
+
+    def __len__(self) -> int:
+        """Count the nodes below this one."""
+        return sum(1 + len(child) for child in self.children.values())
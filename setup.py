@@ -37,6 +37,10 @@ setup(
         'requests>=2.26.0',
         'shibari>=0.0.2',
     ],
+    extras_require={
+        'async': ['httpx>=0.23.0'],
+        'json': ['orjson>=3.6.0'],
+    },
     classifiers=[
         "Programming Language :: Python :: 3.8",
         "Programming Language :: Python :: 3.9",
@@ -1,4 +1,48 @@
 from inori import Client, Route
+from inori.metrics import Metrics
+from inori.transport import Transport
+
+import pytest
+
+import requests
+
+# Settings of Client.settings_, free to use as Route names.
+SETTINGS = [
+    'cache',
+    'single_flight',
+    'retry',
+    'retry_budget',
+    'circuit_breaker',
+    'rate_limit',
+    'metrics',
+    'profiler',
+    'transport',
+    'codec',
+]
+
+# Attributes the Client uses itself.
+RESERVED = [
+    'base_uri',
+    'auth',
+    'headers',
+    'request_kwargs',
+    'logger',
+    'logging',
+    'hooks',
+    'new_session',
+    'add_route',
+    'add_routes',
+    'route_class',
+]
+
+# Methods of the Client that a Route can hide.
+SHADOWED = [
+    'config',
+    'resolve',
+    'gather',
+    'from_manifest',
+    'for_app',
+]
 
 
 def test_returned_object(client):
@@ -217,3 +261,100 @@ def test_dash_in_nested_callable_route(client):
 
     route = client.foo_bar.baz_bin(zam=555)
     assert route.url == expected_url
+
+
+@pytest.mark.parametrize('name', SETTINGS)
+def test_setting_names(client, name):
+    """
+    When I add a route named like a Client setting
+    Then the Route is created
+    And the setting is left as it was
+    """
+    setting = getattr(client.settings_, name)
+
+    client.add_route(f'{name}/${{itemId}}')
+
+    route = getattr(client, name)
+    assert isinstance(route, Route)
+    assert route(itemId='1').url == f'https://foo.com/v1/{name}/1'
+    assert getattr(client.settings_, name) is setting
+
+
+def test_setting_name_request():
+    """
+    Given the Client collects metrics
+    When I request a route named metrics
+    Then the request is sent and measured
+    """
+    class Recorder(Transport):
+        def send(self, client, http_method, url, headers, **kwargs):
+            response = requests.Response()
+            response.status_code = 200
+            response.url = url
+            response._content = b''
+            return response
+
+    client = Client('https://foo.com/v1/')
+    client.settings_.metrics = Metrics()
+    client.settings_.transport = Recorder()
+
+    response = client.add_route('metrics').get()
+
+    assert response.url == 'https://foo.com/v1/metrics'
+    routes = client.settings_.metrics.snapshot()['routes']
+    assert [i['route'] for i in routes] == ['https://foo.com/v1/metrics']
+
+
+@pytest.mark.parametrize('name', RESERVED)
+def test_reserved_names(client, name):
+    """
+    When I add a route named like an attribute of the Client
+    Then ValueError is raised
+    And the attribute is left as it was
+    """
+    value = getattr(client, name)
+
+    with pytest.raises(ValueError):
+        client.add_route(f'{name}/${{itemId}}')
+
+    assert getattr(client, name) == value
+
+
+@pytest.mark.parametrize('name', SHADOWED)
+def test_shadowed_names(client, name):
+    """
+    When I add a route named like a method the Client does not use itself
+    Then the Route hides the method
+    """
+    client.add_route(f'{name}/${{itemId}}')
+
+    route = getattr(client, name)
+    assert isinstance(route, Route)
+    assert route(itemId='1').url == f'https://foo.com/v1/{name}/1'
+    assert client.add_route(name) is route
+
+
+@pytest.mark.parametrize('name', SHADOWED)
+def test_shadowed_names_add_routes(client, name):
+    """
+    When I add many routes, one named like a method of the Client
+    Then the Route hides the method
+    """
+    client.add_routes([f'{name}/${{itemId}}', f'{name}/latest'])
+
+    route = getattr(client, name)
+    assert isinstance(route, Route)
+    assert route.latest.url == f'https://foo.com/v1/{name}/latest'
+
+
+def test_session_name(client):
+    """
+    When I add a route named session
+    Then the Route is created
+    And the Routes still share the Client's session
+    """
+    client.add_route('session/${sessionId}')
+
+    route = client.session(sessionId='1')
+    assert route.url == 'https://foo.com/v1/session/1'
+    assert route.session is client.add_route('fruits').session
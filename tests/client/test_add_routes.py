@@ -0,0 +1,128 @@
+import copy
+
+from inori import Client, Route
+
+import pytest
+
+
+def test_routes_not_created(client):
+    """
+    When I add routes in bulk
+    Then no Route object is created
+    """
+    client.add_routes(['bar/${barId}', 'baz'])
+
+    assert 'bar' not in client.__dict__
+    assert 'baz' not in client.__dict__
+
+
+def test_route_created_on_access(client):
+    client.add_routes(['bar/${barId}/items'])
+
+    assert isinstance(client.bar, Route)
+    assert client.bar is client.bar
+    assert 'bar' in client.__dict__
+
+    # Children are created when they are first read.
+    assert client.bar._pending is not None
+    assert list(client.bar.callables) == ['barId']
+    assert client.bar._pending is None
+
+
+def test_nested_routes(client):
+    client.add_routes(['bar/${barId}/items', 'bar/latest'])
+
+    route = client.bar(barId='1').items
+
+    assert route.url == 'https://foo.com/v1/bar/1/items'
+    assert client.bar.latest.url == 'https://foo.com/v1/bar/latest'
+    assert client.bar.latest._parent is client.bar
+
+
+def test_unknown_attribute(client):
+    client.add_routes(['bar'])
+
+    assert getattr(client, 'baz', None) is None
+    assert getattr(client.bar, 'baz', None) is None
+
+
+def test_keyword_names(client):
+    client.add_routes(['import/all-things'])
+
+    route = client._import.all_things
+
+    assert route.url == 'https://foo.com/v1/import/all-things'
+
+
+def test_trailing_slash(client):
+    client.add_routes(['bar/${barId}'], trailing_slash=True)
+
+    assert client.bar(barId='1').url == 'https://foo.com/v1/bar//1/'
+
+
+def test_add_route_after_add_routes(client):
+    """
+    Given routes were added in bulk
+    When I add a route below them
+    Then the existing Routes are reused
+    """
+    client.add_routes(['bar/${barId}/items'])
+    route = client.add_route('bar/${barId}/items/${itemId}')
+
+    assert route is client.bar.callables['barId'].items.callables['itemId']
+
+
+def test_add_routes_after_add_route(client):
+    client.add_route('bar')
+    client.add_routes(['bar/${barId}'])
+
+    assert client.bar(barId='1').url == 'https://foo.com/v1/bar/1'
+
+
+def test_deepcopy(client):
+    client.add_routes(['bar/baz'])
+
+    new = copy.deepcopy(client.bar)
+
+    assert new.baz.url == 'https://foo.com/v1/bar/baz'
+    assert new.baz._parent is new
+
+
+def test_deepcopy_bound(client):
+    """
+    When I copy a Route bound with arguments
+    Then the copy and its children keep the arguments
+    """
+    client.add_routes(['users/${userId}/profile'])
+
+    new = copy.deepcopy(client.users(userId=1))
+
+    assert new.url == 'https://foo.com/v1/users/1'
+    assert new.profile.url == 'https://foo.com/v1/users/1/profile'
+    assert new.prev_kwargs == {'userId': 1}
+    assert new._origin is not client.users(userId=1)._origin
+
+
+def test_route_paths_are_lazy():
+    class MyClient(Client):
+        route_paths = ['bar/${barId}']
+
+    client = MyClient('https://foo.com/v1/')
+
+    assert 'bar' not in client.__dict__
+    assert client.bar(barId='2').url == 'https://foo.com/v1/bar/2'
+
+
+def test_reserved_name(client):
+    with pytest.raises(ValueError):
+        client.add_routes(['headers/${headerId}'])
+
+    assert not client._pending.children
+
+
+def test_reserved_route_paths():
+    class MyClient(Client):
+        route_paths = ['add_route']
+
+    with pytest.raises(ValueError):
+        MyClient('https://foo.com/v1/')
@@ -0,0 +1,119 @@
+import asyncio
+
+from inori import AsyncClient, AsyncRoute
+
+import pytest
+
+pytest.importorskip('httpx')
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_add_route_async_route():
+    client = AsyncClient('https://foo.com/v1/')
+    client.add_route('bar/${barId}/baz')
+
+    assert isinstance(client.bar, AsyncRoute)
+    assert isinstance(client.bar(barId=1).baz, AsyncRoute)
+
+
+def test_get(async_stub_server):
+    async def main():
+        async with async_stub_server() as server:
+            async with AsyncClient(server.url) as client:
+                client.add_route('bar/${barId}')
+                response = await client.bar(barId=5).get()
+
+        return response.json()
+
+    result = run(main())
+
+    assert result['method'] == 'GET'
+    assert result['path'] == '/bar/5'
+
+
+def test_post_json(async_stub_server):
+    async def main():
+        async with async_stub_server() as server:
+            async with AsyncClient(server.url) as client:
+                client.add_route('bar')
+                response = await client.bar.post(json={'a': 1})
+
+        return response.json()
+
+    result = run(main())
+
+    assert result['method'] == 'POST'
+    assert result['body'] == '{"a":1}'
+
+
+def test_async_header_functions(async_stub_server):
+    """
+    Given the Client and Route have coroutine header functions
+    When a request is made
+    Then the awaited results are sent as headers
+    """
+    async def main():
+        async with async_stub_server() as server:
+            async with AsyncClient(server.url) as client:
+                route = client.add_route('bar')
+
+                @client.headers('X-Client')
+                async def client_header(client, request_metadata):
+                    return 'client'
+
+                @route.headers('X-Route')
+                async def route_header(route, request_metadata):
+                    return 'route'
+
+                response = await route.get(headers={'X-Local': 'local'})
+
+        return response.json()['headers']
+
+    result = run(main())
+
+    assert result['x-client'] == 'client'
+    assert result['x-route'] == 'route'
+    assert result['x-local'] == 'local'
+
+
+def test_async_hooks(async_stub_server):
+    recorded = []
+
+    async def record(metadata):
+        recorded.append(metadata['status_code'])
+
+    async def main():
+        async with async_stub_server() as server:
+            async with AsyncClient(server.url) as client:
+                client.hooks['response'].append(record)
+                client.add_route('bar')
+                await client.bar.get()
+
+    run(main())
+
+    assert recorded == [200]
+
+
+def test_concurrent_requests_share_pool(async_stub_server):
+    """
+    When many requests are in flight at once
+    Then no more connections are opened than the pool allows
+    """
+    async def main():
+        async with async_stub_server() as server:
+            async with AsyncClient(server.url, max_connections=5) as client:
+                client.add_route('bar/${barId}')
+                responses = await asyncio.gather(
+                    *(client.bar(barId=i).get() for i in range(50)),
+                )
+
+            return server.connections, responses
+
+    connections, responses = run(main())
+
+    assert connections <= 5
+    paths = [r.json()['path'] for r in responses]
+    assert paths == [f'/bar/{i}' for i in range(50)]
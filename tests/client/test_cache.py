@@ -0,0 +1,229 @@
+import time
+from unittest import mock
+
+from inori.cache import Cache, DiskStore, MemoryStore, parse_cache_control
+
+import pytest
+
+import requests
+
+
+def make_response(status_code=200, headers=None, content=b'{"a": 1}'):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers = requests.structures.CaseInsensitiveDict(headers or {})
+    response._content = content
+    response.url = 'https://foo.com/v1/bar'
+    return response
+
+
+class CachingSession:
+    """Answer with the response headers in `next_headers`.
+
+    Conditional requests matching the ETag get a 304.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.calls = []
+        self.next_headers = {}
+
+    def mount(self, prefix, adapter):
+        pass
+
+    def request(self, http_method, url, headers, **kwargs):
+        self.calls.append(headers)
+
+        etag = self.next_headers.get('ETag')
+        if etag and headers.get('If-None-Match') == etag:
+            return make_response(304, self.next_headers, b'')
+
+        return make_response(200, self.next_headers)
+
+
+@pytest.fixture()
+def session(client):
+    with mock.patch('requests.Session', CachingSession):
+        client.settings_.cache = Cache()
+        yield client._get_session()
+
+
+def test_parse_cache_control():
+    result = parse_cache_control('max-age=60, no-cache, private="x"')
+    assert result == {'max-age': '60', 'no-cache': None, 'private': 'x'}
+
+
+def test_max_age_hit(client, session):
+    session.next_headers = {'Cache-Control': 'max-age=60'}
+    route = client.add_route('bar')
+
+    first = route.get()
+    second = route.get()
+
+    assert len(session.calls) == 1
+    assert second.json() == first.json()
+    assert second.from_cache is True
+    assert client.settings_.cache.stats() == {
+        'hits': 1, 'misses': 1, 'revalidations': 0, 'evictions': 0,
+    }
+
+
+def test_no_store(client, session):
+    session.next_headers = {'Cache-Control': 'no-store, max-age=60'}
+    route = client.add_route('bar')
+
+    route.get()
+    route.get()
+
+    assert len(session.calls) == 2
+
+
+def test_post_not_cached(client, session):
+    session.next_headers = {'Cache-Control': 'max-age=60'}
+    route = client.add_route('bar')
+
+    route.post()
+    route.post()
+
+    assert len(session.calls) == 2
+
+
+def test_expires(client, session):
+    future = time.strftime(
+        '%a, %d %b %Y %H:%M:%S GMT', time.gmtime(time.time() + 60),
+    )
+    session.next_headers = {'Expires': future}
+    route = client.add_route('bar')
+
+    route.get()
+    route.get()
+
+    assert len(session.calls) == 1
+
+
+def test_etag_revalidation(client, session):
+    """
+    Given a stale entry has an ETag
+    When the same request is made
+    Then a conditional request is sent
+    And a 304 response is answered from the cache
+    """
+    session.next_headers = {'Cache-Control': 'no-cache', 'ETag': '"v1"'}
+    route = client.add_route('bar')
+
+    route.get()
+    response = route.get()
+
+    assert session.calls[1]['If-None-Match'] == '"v1"'
+    assert response.status_code == 200
+    assert response.content == b'{"a": 1}'
+    assert client.settings_.cache.revalidations == 1
+
+
+def test_vary(client, session):
+    session.next_headers = {'Cache-Control': 'max-age=60', 'Vary': 'Accept'}
+    route = client.add_route('bar')
+
+    route.get(headers={'Accept': 'application/json'})
+    route.get(headers={'Accept': 'application/json'})
+    route.get(headers={'Accept': 'text/xml'})
+
+    assert len(session.calls) == 2
+
+
+def test_params_in_key(client, session):
+    session.next_headers = {'Cache-Control': 'max-age=60'}
+    route = client.add_route('bar')
+
+    route.get(params={'a': 1})
+    route.get(params={'a': 2})
+
+    assert len(session.calls) == 2
+
+
+def test_route_opt_out(client, session):
+    session.next_headers = {'Cache-Control': 'max-age=60'}
+    route = client.add_route('bar/${barId}')
+    route.settings_.use_cache = False
+
+    client.bar(barId=1).get()
+    client.bar(barId=1).get()
+
+    assert len(session.calls) == 2
+
+
+def test_route_opt_in(client, session):
+    """
+    Given the cache is off by default
+    Then only Routes opting in use it
+    """
+    client.settings_.cache = Cache(default=False)
+    session.next_headers = {'Cache-Control': 'max-age=60'}
+    client.add_route('bar').settings_.use_cache = True
+    client.add_route('baz')
+
+    for _ in range(2):
+        client.bar.get()
+        client.baz.get()
+
+    assert len(session.calls) == 3
+    assert client.settings_.cache.hits == 1
+
+
+@pytest.mark.parametrize('key', ['data', 'json', 'files'])
+def test_body_not_cached(client, session, key):
+    """
+    Given a GET request with a body
+    Then it is never answered from the cache
+    """
+    session.next_headers = {'Cache-Control': 'max-age=60'}
+    route = client.add_route('search')
+
+    route.get(**{key: {'q': '1'}})
+    route.get(**{key: {'q': '2'}})
+
+    assert len(session.calls) == 2
+    assert client.settings_.cache.stats()['hits'] == 0
+
+
+def test_memory_store_eviction():
+    """
+    Given the store's budget fits one entry
+    When three entries are stored
+    Then the least recently used are evicted
+    """
+    store = MemoryStore(max_bytes=50)
+    cache = Cache(store)
+    response = make_response(
+        headers={'Cache-Control': 'max-age=60'}, content=b'x' * 8,
+    )
+
+    for i in range(3):
+        url = f'https://foo.com/{i}'
+        cache.fetch(lambda headers: response, 'GET', url, {})
+
+    assert len(store) == 1
+    assert cache.evictions == 2
+    assert store.get(Cache.key('GET', 'https://foo.com/2')) is not None
+
+
+def test_disk_store(tmp_path):
+    store = DiskStore(str(tmp_path))
+    cache = Cache(store)
+    response = make_response(headers={'Cache-Control': 'max-age=60'})
+
+    cache.fetch(lambda headers: response, 'GET', 'https://foo.com/', {})
+    result = cache.fetch(None, 'GET', 'https://foo.com/', {})
+
+    assert result.json() == {'a': 1}
+    assert cache.hits == 1
+
+
+def test_disk_store_eviction(tmp_path):
+    store = DiskStore(str(tmp_path), max_bytes=1)
+    cache = Cache(store)
+    response = make_response(headers={'Cache-Control': 'max-age=60'})
+
+    cache.fetch(lambda headers: response, 'GET', 'https://foo.com/', {})
+
+    assert store.evictions == 1
+    assert store.get(Cache.key('GET', 'https://foo.com/')) is None
@@ -0,0 +1,240 @@
+import asyncio
+import json
+import socket
+
+from inori import AsyncClient, Client
+from inori.inprocess import ASGITransport, WSGITransport, is_asgi
+
+import pytest
+
+
+def describe(method, path, query, headers, body):
+    return json.dumps({
+        'method': method,
+        'path': path,
+        'query': query,
+        'headers': headers,
+        'body': body.decode(),
+    }).encode()
+
+
+def wsgi_app(environ, start_response):
+    if environ['PATH_INFO'] == '/fail':
+        raise RuntimeError('Boom')
+
+    length = int(environ.get('CONTENT_LENGTH') or 0)
+    headers = {
+        k[5:].lower().replace('_', '-'): v
+        for k, v in environ.items() if k.startswith('HTTP_')
+    }
+    if 'CONTENT_TYPE' in environ:
+        headers['content-type'] = environ['CONTENT_TYPE']
+
+    content = describe(
+        environ['REQUEST_METHOD'],
+        environ['PATH_INFO'],
+        environ['QUERY_STRING'],
+        headers,
+        environ['wsgi.input'].read(length),
+    )
+
+    status = '200 OK'
+    if environ['PATH_INFO'] == '/missing':
+        status = '404 Not Found'
+
+    start_response(status, [
+        ('Content-Type', 'application/json'),
+        ('Set-Cookie', 'a=1'),
+        ('Set-Cookie', 'b=2'),
+    ])
+    return [content]
+
+
+async def asgi_app(scope, receive, send):
+    body = b''
+    while True:
+        message = await receive()
+        body += message.get('body', b'')
+        if not message.get('more_body'):
+            break
+
+    content = describe(
+        scope['method'],
+        scope['path'],
+        scope['query_string'].decode(),
+        {k.decode(): v.decode() for k, v in scope['headers']},
+        body,
+    )
+
+    await send({
+        'type': 'http.response.start',
+        'status': 201,
+        'headers': [(b'content-type', b'application/json')],
+    })
+    await send({
+        'type': 'http.response.body', 'body': content[:5], 'more_body': True,
+    })
+    await send({'type': 'http.response.body', 'body': content[5:]})
+
+
+class ASGIApp:
+    async def __call__(self, scope, receive, send):
+        await asgi_app(scope, receive, send)
+
+
+@pytest.fixture()
+def no_network(monkeypatch):
+    def connect(*args):
+        raise AssertionError('The network was used.')
+
+    monkeypatch.setattr(socket.socket, 'connect', connect)
+
+
+@pytest.fixture(params=['wsgi', 'asgi'])
+def client(request, no_network):
+    app = wsgi_app if request.param == 'wsgi' else asgi_app
+    client = Client.for_app(app)
+    client.add_route('fruits/${fruitId}')
+    client.add_route('missing')
+    yield client
+    client.settings_.transport.close()
+
+
+def test_transport():
+    wsgi = Client.for_app(wsgi_app).settings_.transport
+    asgi = Client.for_app(asgi_app).settings_.transport
+    assert isinstance(wsgi, WSGITransport)
+    assert isinstance(asgi, ASGITransport)
+
+
+def test_is_asgi():
+    assert is_asgi(asgi_app)
+    assert is_asgi(ASGIApp())
+    assert not is_asgi(wsgi_app)
+
+
+def test_get(client):
+    client.headers['X-Foo'] = 'bar'
+
+    response = client.fruits(fruitId='é').get(params={'a': 1})
+    result = response.json()
+
+    assert response.url == 'http://testserver/fruits/%C3%A9?a=1'
+    assert result['method'] == 'GET'
+    assert result['query'] == 'a=1'
+    assert result['headers']['x-foo'] == 'bar'
+    assert result['headers']['host'] == 'testserver'
+
+
+def test_path_decoded(client):
+    result = client.fruits(fruitId='é').get().json()
+
+    if isinstance(client.settings_.transport, WSGITransport):
+        # PEP 3333: the bytes of the path, as latin-1.
+        assert result['path'] == '/fruits/é'.encode().decode('latin-1')
+    else:
+        assert result['path'] == '/fruits/é'
+
+
+def test_post(client):
+    response = client.fruits(fruitId='1').post(json={'name': 'apple'})
+    result = response.json()
+
+    assert json.loads(result['body']) == {'name': 'apple'}
+    assert result['headers']['content-type'] == 'application/json'
+
+
+def test_hooks(client):
+    recorded = []
+    client.hooks['request'].append(lambda m: recorded.append(m['route']))
+    client.hooks['response'].append(
+        lambda m: recorded.append(m['status_code']),
+    )
+
+    client.fruits(fruitId='1').get()
+
+    route, status_code = recorded
+    assert route == 'http://testserver/fruits/1'
+    assert status_code in (200, 201)
+
+
+def test_auth(client):
+    client.auth = ('user', 'pass')
+
+    result = client.fruits(fruitId='1').get().json()
+
+    assert result['headers']['authorization'] == 'Basic dXNlcjpwYXNz'
+
+
+def test_stream(client):
+    with client.fruits(fruitId='1').stream('GET') as response:
+        body = b''.join(response.iter_content(4))
+
+    assert json.loads(body)['method'] == 'GET'
+
+
+def test_base_uri(no_network):
+    client = Client.for_app(wsgi_app, 'https://api.internal:8443/v1/')
+    client.add_route('fruits')
+
+    result = client.fruits.get().json()
+
+    assert result['path'] == '/v1/fruits'
+    assert result['headers']['host'] == 'api.internal:8443'
+
+
+def test_wsgi_status(no_network):
+    client = Client.for_app(wsgi_app)
+    client.add_route('missing')
+
+    response = client.missing.get()
+
+    assert response.status_code == 404
+    assert response.reason == 'Not Found'
+    assert response.headers['Set-Cookie'] == 'a=1, b=2'
+
+
+def test_wsgi_error(no_network):
+    client = Client.for_app(wsgi_app)
+    client.add_route('fail')
+
+    with pytest.raises(RuntimeError):
+        client.fail.get()
+
+
+def test_asgi_status(no_network):
+    client = Client.for_app(ASGIApp())
+    client.add_route('fruits')
+
+    response = client.fruits.get()
+
+    assert response.status_code == 201
+    assert response.reason == 'Created'
+
+
+def test_unsupported_kwargs(client):
+    with pytest.raises(TypeError):
+        client.fruits(fruitId='1').post(files={'a': b'b'})
+
+
+def test_async_client():
+    pytest.importorskip('httpx')
+
+    async def main():
+        async with AsyncClient.for_app(asgi_app) as client:
+            client.add_route('fruits/${fruitId}')
+            client.headers['X-Foo'] = 'bar'
+            response = await client.fruits(fruitId='1').post(json={'a': 1})
+            return response.status_code, response.json()
+
+    status, result = asyncio.run(main())
+
+    assert status == 201
+    assert result['path'] == '/fruits/1'
+    assert result['headers']['x-foo'] == 'bar'
+    assert json.loads(result['body']) == {'a': 1}
+
+
+def test_async_client_wsgi():
+    with pytest.raises(TypeError):
+        AsyncClient.for_app(wsgi_app)
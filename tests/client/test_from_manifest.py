@@ -0,0 +1,65 @@
+import json
+
+from inori import Client
+from inori.manifest import load_manifest, template_path
+
+import pytest
+
+
+OPENAPI = {
+    'openapi': '3.0.0',
+    'servers': [{'url': 'https://foo.com/v1'}],
+    'paths': {
+        '/pets': {},
+        '/pets/{pet-id}': {},
+        '/pets/{pet-id}/toys': {},
+    },
+}
+
+
+def test_template_path():
+    assert template_path('/pets/{pet-id}/toys') == '/pets/${pet_id}/toys'
+
+
+def test_openapi():
+    client = Client.from_manifest(OPENAPI)
+
+    assert client.base_uri == 'https://foo.com/v1/'
+    assert client.pets(pet_id='1').toys.url == 'https://foo.com/v1/pets/1/toys'
+
+
+def test_swagger():
+    manifest = load_manifest({
+        'swagger': '2.0',
+        'host': 'foo.com',
+        'basePath': '/v1',
+        'schemes': ['http'],
+        'paths': {'/pets': {}},
+    })
+
+    assert manifest.base_uri == 'http://foo.com/v1/'
+    assert manifest.paths == ['/pets']
+
+
+def test_route_list():
+    client = Client.from_manifest(
+        ['pets/${petId}'], base_uri='https://bar.com/',
+    )
+
+    assert client.pets(petId='1').url == 'https://bar.com/pets/1'
+
+
+def test_file(tmp_path):
+    path = tmp_path / 'manifest.json'
+    path.write_text(json.dumps({
+        'base_uri': 'https://foo.com/v2/', 'paths': ['pets'],
+    }))
+
+    client = Client.from_manifest(str(path))
+
+    assert client.pets.url == 'https://foo.com/v2/pets'
+
+
+def test_missing_base_uri():
+    with pytest.raises(ValueError):
+        Client.from_manifest({'paths': {'/pets': {}}})
@@ -1,7 +1,12 @@
+import logging
+from unittest import mock
+
 from inori import Route
+from inori.utils.metadata import Metadata
 
 
 def test_log_request(client):
+    client.logger.setLevel(logging.INFO)
     fake_url = Route(client, "1/2/3").url
     fake_headers = {"auth": "001"}
     fake_data = {"doit": "true"}
@@ -27,6 +32,7 @@ def test_log_request(client):
 
 
 def test_log_response(client):
+    client.logger.setLevel(logging.INFO)
     fake_url = Route(client, "1/2/3").url
 
     metadata = {
@@ -44,3 +50,52 @@ def test_log_response(client):
 
     result = client.logging.log_response(metadata)
     assert result == expected_result
+
+
+def test_log_disabled(client):
+    """
+    Given the logger is not enabled for INFO
+    When a response is logged
+    Then nothing is formatted
+    And the body is not read
+    """
+    metadata = Metadata(
+        {'http_method': 'FAKE', 'route': '1/2/3', 'status_code': 200},
+        text=mock.Mock(side_effect=AssertionError('Body was read')),
+    )
+
+    assert client.logging.log_response(metadata) is None
+    assert not metadata.is_loaded('text')
+
+
+def test_log_response_truncated(client):
+    client.logger.setLevel(logging.INFO)
+    client.logging.max_body_length = 5
+
+    metadata = Metadata(
+        {'http_method': 'FAKE', 'route': '1/2/3', 'status_code': 200},
+        text=lambda: 'Hello World',
+    )
+
+    expected_result = (
+        '\nFAKE response from 1/2/3'
+        '\n Status Code 200'
+        '\n Body: Hello... (11 characters)'
+    )
+
+    result = client.logging.log_response(metadata)
+    assert result == expected_result
+
+
+@mock.patch('requests.Session', mock.Mock())
+def test_request_body_not_read(client):
+    """
+    Given logging is disabled
+    When a request is made
+    Then the response body is not decoded
+    """
+    route = client.add_route('bar')
+
+    route.get()
+
+    assert not client.metadata_recorder.response_metadata.is_loaded('text')
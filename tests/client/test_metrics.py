@@ -0,0 +1,169 @@
+import asyncio
+from unittest import mock
+
+from inori import AsyncClient, Client
+from inori.metrics import Histogram, Metrics, pool_stats
+
+import pytest
+
+import requests
+
+
+class MeasuredSession:
+    def __init__(self, *args, **kwargs):
+        self.status_code = 200
+        self.content = b'12345'
+        self.error = None
+
+    def mount(self, prefix, adapter):
+        pass
+
+    def request(self, http_method, url, headers, **kwargs):
+        if self.error is not None:
+            raise self.error
+
+        return mock.Mock(
+            status_code=self.status_code,
+            headers={},
+            content=self.content,
+            request=mock.Mock(body=kwargs.get('data')),
+        )
+
+
+@pytest.fixture()
+def client():
+    with mock.patch('requests.Session', MeasuredSession):
+        client = Client('https://foo.com/v1/')
+        client.add_route('fruits/${fruitId}')
+        client.settings_.metrics = Metrics()
+        yield client
+
+
+def series(client, route, method='GET'):
+    for i in client.settings_.metrics.snapshot()['routes']:
+        if i['route'] == route and i['method'] == method:
+            return i
+
+
+def test_histogram():
+    histogram = Histogram([0.1, 1])
+    for value in (0.05, 0.1, 0.5, 2):
+        histogram.observe(value)
+
+    assert histogram.cumulative() == [(0.1, 2), (1, 3), (float('inf'), 4)]
+    assert histogram.sum == pytest.approx(2.65)
+    assert histogram.count == 4
+
+
+def test_keyed_by_template(client):
+    client.fruits(fruitId=1).get()
+    client.fruits(fruitId=2).get()
+    client.fruits(fruitId=3).post(data='abc')
+
+    template = 'https://foo.com/v1/fruits/${fruitId}'
+    routes = client.settings_.metrics.snapshot()['routes']
+    measured = {(i['route'], i['method']) for i in routes}
+    assert measured == {(template, 'GET'), (template, 'POST')}
+
+    get = series(client, 'https://foo.com/v1/fruits/${fruitId}')
+    assert get['requests'] == 2
+    assert get['statuses'] == {'2xx': 2}
+    assert get['bytes_in'] == 10
+    assert get['latency']['count'] == 2
+
+    post = series(client, 'https://foo.com/v1/fruits/${fruitId}', 'POST')
+    assert post['bytes_out'] == 3
+
+
+def test_status_classes(client):
+    client.fruits.get()
+    client._get_session().status_code = 404
+    client.fruits.get()
+    client._get_session().status_code = 503
+    client.fruits.get()
+
+    measured = series(client, 'https://foo.com/v1/fruits')
+    assert measured['statuses'] == {'2xx': 1, '4xx': 1, '5xx': 1}
+
+
+def test_errors(client):
+    client._get_session().error = requests.ConnectionError()
+
+    with pytest.raises(requests.ConnectionError):
+        client.fruits.get()
+
+    measured = series(client, 'https://foo.com/v1/fruits')
+    assert measured['requests'] == 1
+    assert measured['errors'] == {'ConnectionError': 1}
+    assert measured['statuses'] == {}
+    assert client.settings_.metrics.in_flight == 0
+
+
+def test_disabled_by_default():
+    with mock.patch('requests.Session', MeasuredSession):
+        client = Client('https://foo.com/v1/')
+        client.add_route('fruits')
+
+        assert client.settings_.metrics is None
+        assert client.fruits.get().status_code == 200
+
+
+def test_prometheus(client):
+    client.fruits(fruitId=1).get()
+
+    text = client.settings_.metrics.prometheus()
+    labels = 'route="https://foo.com/v1/fruits/${fruitId}",method="GET"'
+
+    assert '# TYPE inori_requests_total counter' in text
+    assert f'inori_requests_total{{{labels},status="2xx"}} 1' in text
+    assert f'inori_response_bytes_total{{{labels}}} 5' in text
+    assert f'inori_request_duration_seconds_count{{{labels}}} 1' in text
+    assert (
+        f'inori_request_duration_seconds_bucket{{{labels},le="+Inf"}} 1'
+    ) in text
+    assert 'inori_requests_in_flight 0' in text
+
+
+def test_prometheus_escapes_labels():
+    metrics = Metrics()
+    with metrics.measure('a"b', 'GET') as observation:
+        observation.response = mock.Mock(
+            status_code=200, headers={'Content-Length': '0'},
+        )
+
+    assert 'route="a\\"b"' in metrics.prometheus()
+
+
+def test_requests_pool_stats():
+    session = requests.Session()
+    session.get_adapter('https://foo.com').poolmanager.connection_from_url(
+        'https://foo.com',
+    )
+
+    assert pool_stats(session) == {
+        'https://foo.com:443': {'in_use': 0, 'max_size': 10, 'opened': 0},
+    }
+
+
+def test_async(async_stub_server):
+    pytest.importorskip('httpx')
+
+    async def main():
+        async with async_stub_server() as server:
+            async with AsyncClient(server.url) as client:
+                client.add_route('fruits/${fruitId}')
+                client.settings_.metrics = Metrics()
+
+                await client.fruits(fruitId=1).get()
+                await client.fruits(fruitId=2).get()
+
+                return client.settings_.metrics.snapshot()
+
+    snapshot = asyncio.run(main())
+
+    (measured,) = snapshot['routes']
+    assert measured['route'].endswith('/fruits/${fruitId}')
+    assert measured['requests'] == 2
+    assert measured['statuses'] == {'2xx': 2}
+    assert measured['bytes_in'] > 0
+    assert snapshot['in_flight'] == 0
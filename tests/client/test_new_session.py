@@ -1,3 +1,5 @@
+from inori import Client
+
 import requests
 
 
@@ -8,3 +10,42 @@ def test_new_session(client):
     """
     result = client.new_session()
     assert isinstance(result, requests.Session)
+
+
+def test_new_session_pool_settings():
+    """
+    Given a Client has pool settings
+    When I call Client.new_session
+    Then the session's adapters use the pool settings
+    """
+    client = Client(
+        'https://foo.com/v1/', pool_maxsize=25, pool_block=True,
+    )
+    session = client.new_session()
+
+    adapter = session.get_adapter('https://foo.com/v1/')
+    assert adapter._pool_maxsize == 25
+    assert adapter._pool_block is True
+
+
+def test_session_shared(client):
+    """
+    Given a Client has multiple Routes
+    Then every Route uses the same session
+    """
+    a = client.add_route('bar')
+    b = client.add_route('baz/${bazId}')
+
+    assert a.session is client._get_session()
+    assert b.session is client._get_session()
+    assert client.baz(bazId=1).session is client._get_session()
+
+
+def test_session_auth():
+    """
+    Given a Client has auth
+    Then the shared session uses the auth
+    """
+    client = Client('https://foo.com/v1/', auth=('user', 'pass'))
+
+    assert client._get_session().auth == ('user', 'pass')
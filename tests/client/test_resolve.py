@@ -0,0 +1,78 @@
+from inori import Route
+
+
+def test_resolve_callable(client):
+    """
+    When I resolve a URL
+    Then I get the Route with the values found in the URL
+    """
+    client.add_route('fruits/${fruitId}/seeds')
+
+    route = client.resolve('https://foo.com/v1/fruits/8/seeds')
+
+    assert isinstance(route, Route)
+    assert route._origin is client.fruits.callables['fruitId'].seeds
+    assert route.prev_kwargs == {'fruitId': '8'}
+    assert route.url == 'https://foo.com/v1/fruits/8/seeds'
+
+
+def test_resolve_path(client):
+    client.add_route('fruits/${fruitId}')
+
+    route = client.resolve('/fruits/8?fields=name')
+
+    assert route.url == 'https://foo.com/v1/fruits/8'
+
+
+def test_resolve_path_with_base_path(client):
+    client.add_route('fruits')
+
+    assert client.resolve('/v1/fruits') is client.fruits
+
+
+def test_resolve_prefers_children(client):
+    client.add_route('fruits/${fruitId}')
+    client.add_route('fruits/latest')
+
+    assert client.resolve('fruits/latest') is client.fruits.latest
+    assert client.resolve('fruits/7').prev_kwargs == {'fruitId': '7'}
+
+
+def test_resolve_backtracks(client):
+    """
+    Given a child only matches part of a URL
+    Then a callable is tried
+    """
+    client.add_route('fruits/latest')
+    client.add_route('fruits/${fruitId}/seeds')
+
+    route = client.resolve('fruits/latest/seeds')
+
+    assert route.prev_kwargs == {'fruitId': 'latest'}
+
+
+def test_resolve_multiple_values(client):
+    client.add_route('fruits/${fruitId}/seeds/${seedId}')
+
+    route = client.resolve('fruits/1/seeds/a%20b')
+
+    assert route.prev_kwargs == {'fruitId': '1', 'seedId': 'a b'}
+
+
+def test_resolve_lazy_routes(client):
+    client.add_routes(['fruits/${fruitId}/seeds', 'vegetables'])
+
+    route = client.resolve('fruits/1/seeds')
+
+    assert route.url == 'https://foo.com/v1/fruits/1/seeds'
+    assert 'vegetables' not in client.__dict__
+
+
+def test_resolve_no_match(client):
+    client.add_route('fruits/${fruitId}')
+
+    assert client.resolve('vegetables') is None
+    assert client.resolve('fruits/1/seeds') is None
+    assert client.resolve('https://bar.com/v1/fruits') is None
+    assert client.resolve('https://foo.com/v2/fruits') is None
+    assert client.resolve('') is None
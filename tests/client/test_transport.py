@@ -0,0 +1,214 @@
+import http.server
+import json
+import socket
+
+from inori import Client
+from inori.metrics import Metrics
+from inori.transport import (
+    RequestsTransport, SlimResponse, Transport, Urllib3Transport,
+    encode_params,
+)
+
+import pytest
+
+import requests
+
+
+class EchoHandler(http.server.BaseHTTPRequestHandler):
+    """Answer with the method, path, headers and body of the request."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def respond(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length)
+
+        status = 404 if self.path.startswith('/missing') else 200
+        content = json.dumps({
+            'method': self.command,
+            'path': self.path,
+            'headers': {k.lower(): v for k, v in self.headers.items()},
+            'body': body.decode(),
+        }).encode()
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.send_header('Link', '</items?page=2>; rel="next"')
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = do_POST = do_PUT = do_DELETE = respond  # NOQA N815
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def server(local_server):
+    return local_server(EchoHandler).url
+
+
+@pytest.fixture()
+def client(server):
+    client = Client(server)
+    client.settings_.transport = Urllib3Transport()
+    client.add_route('items/${itemId}')
+    client.add_route('missing')
+    yield client
+    client.settings_.transport.close()
+
+
+def test_default_transport():
+    client = Client('https://foo.com/v1/')
+
+    assert isinstance(client.settings_.transport, RequestsTransport)
+
+
+def test_custom_transport():
+    class Recorder(Transport):
+        def send(self, client, http_method, url, headers, **kwargs):
+            self.sent = (http_method, url, headers, kwargs)
+            return requests.Response()
+
+    client = Client('https://foo.com/v1/')
+    client.add_route('items')
+    client.settings_.transport = Recorder()
+    client.headers['X-Foo'] = 'bar'
+
+    client.items.get(params={'a': 1})
+
+    assert client.settings_.transport.sent == (
+        'GET', 'https://foo.com/v1/items', {'X-Foo': 'bar'},
+        {'params': {'a': 1}},
+    )
+
+
+def test_get(client):
+    client.headers['X-Foo'] = 'bar'
+
+    response = client.items(itemId='1').get(params={'a': 1, 'b': None})
+    result = response.json()
+
+    assert isinstance(response, SlimResponse)
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'application/json'
+    assert result['path'] == '/items/1?a=1'
+    assert result['headers']['x-foo'] == 'bar'
+    assert result['headers']['user-agent'].startswith('inori/')
+
+
+def test_body(client):
+    route = client.items(itemId='1')
+
+    assert route.post(json={'a': 1}).json()['body'] == '{"a": 1}'
+    assert route.post(data={'a': 'b'}).json()['body'] == 'a=b'
+    assert route.post(data='é').json()['body'] == 'é'
+
+
+def test_iterator_body(client):
+    body = iter([b'ab', b'cd'])
+
+    result = client.items(itemId='1').post(
+        data=body, headers={'Content-Length': '4'},
+    ).json()
+
+    assert result['body'] == 'abcd'
+
+
+def test_auth(client):
+    client.auth = ('user', 'pass')
+
+    result = client.items(itemId='1').get().json()
+
+    assert result['headers']['authorization'] == 'Basic dXNlcjpwYXNz'
+
+
+def test_get_json(client):
+    assert client.items(itemId='1').get_json()['method'] == 'GET'
+
+
+def test_stream(client):
+    with client.items(itemId='1').stream('GET') as response:
+        body = b''.join(response.iter_content(8))
+
+    assert json.loads(body)['path'] == '/items/1'
+
+
+def test_response_attributes(client):
+    response = client.items(itemId='1').get()
+
+    assert bytes(response.view[:1]) == b'{'
+    assert response.encoding == 'utf-8'
+    assert json.loads(response.text)['method'] == 'GET'
+    assert response.links['next']['url'] == '/items?page=2'
+    assert response.ok
+
+
+def test_raise_for_status(client):
+    response = client.missing.get()
+
+    assert not response.ok
+    with pytest.raises(requests.HTTPError) as error:
+        response.raise_for_status()
+    assert error.value.response is response
+
+
+def test_connection_error():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        host, port = s.getsockname()
+
+    client = Client(f'http://{host}:{port}/')
+    client.settings_.transport = Urllib3Transport()
+    client.add_route('items')
+
+    with pytest.raises(requests.ConnectionError):
+        client.items.get(timeout=1)
+
+
+def test_unsupported_kwargs(client):
+    with pytest.raises(TypeError):
+        client.items(itemId='1').post(files={'a': b'b'})
+
+
+def test_pool_metrics(client):
+    client.settings_.metrics = Metrics()
+
+    client.items(itemId='1').get()
+
+    pools = client.settings_.metrics.snapshot()['pools']
+    assert [i['max_size'] for i in pools.values()] == [10]
+
+
+@pytest.mark.parametrize('kwargs, expected', [
+    ({'data': b'abcd'}, 4),
+    ({'data': 'é'}, 2),
+    ({'data': {'a': '1', 'b': '2'}}, 7),
+    ({'json': {'a': 1}}, 8),
+    ({}, 0),
+])
+def test_bytes_out_metrics(client, kwargs, expected):
+    """
+    Given a transport whose responses do not keep the request
+    When a request with a body is measured
+    Then the size of the body is counted
+    """
+    client.settings_.metrics = Metrics()
+
+    client.items(itemId='1').put(**kwargs)
+
+    routes = client.settings_.metrics.snapshot()['routes']
+    assert [i['bytes_out'] for i in routes] == [expected]
+
+
+@pytest.mark.parametrize(
+    'url, params, expected', [
+        ('http://a/', None, 'http://a/'),
+        ('http://a/', {'b': [1, 2]}, 'http://a/?b=1&b=2'),
+        ('http://a/?c=3', [('b', 'x y')], 'http://a/?c=3&b=x+y'),
+        ('http://a/', 'b=1', 'http://a/?b=1'),
+    ],
+)
+def test_encode_params(url, params, expected):
+    assert encode_params(url, params) == expected
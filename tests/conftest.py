@@ -1,4 +1,9 @@
+import asyncio
+import http.server
+import json
+import threading
 from typing import Dict
+from unittest import mock
 
 from inori import Client
 
@@ -47,3 +52,160 @@ class TestClient(Client):
 @pytest.fixture()
 def client():
     return TestClient('https://foo.com/v1/')
+
+
+class Clock:
+    """Stand-in for time.monotonic that only moves when told to."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture()
+def patch_clock():
+    """Replace a time.monotonic with a Clock until the end of the test.
+
+    Example:
+        >>> clock = patch_clock('inori.ratelimit.time.monotonic')
+        >>> clock.now += 1
+    """
+    patches = []
+
+    def patch(target):
+        clock = Clock()
+        patches.append(mock.patch(target, clock))
+        patches[-1].start()
+        return clock
+
+    yield patch
+
+    for p in patches:
+        p.stop()
+
+
+@pytest.fixture()
+def local_server():
+    """Start HTTP servers on free local ports, stopped after the test.
+
+    Each server answers with a handler class, in its own thread. The
+    keyword arguments are set as attributes of the server, for the
+    handler to read as self.server.
+
+    Example:
+        >>> server = local_server(EchoHandler, bodies=[])
+        >>> client = Client(server.url)
+    """
+    servers = []
+
+    def start(handler, **attributes):
+        server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        for name, value in attributes.items():
+            setattr(server, name, value)
+
+        thread = threading.Thread(
+            target=server.serve_forever, args=(0.05,), daemon=True,
+        )
+        thread.start()
+
+        host, port = server.server_address
+        server.url = f'http://{host}:{port}/'
+        servers.append(server)
+        return server
+
+    yield start
+
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+class AsyncStubServer:
+    """HTTP/1.1 server on the running event loop.
+
+    Every response is a JSON echo of the request.
+
+    connections: Number of TCP connections accepted.
+    """
+
+    def __init__(self):
+        self.connections = 0
+        self.server = None
+
+    @property
+    def url(self):
+        host, port = self.server.sockets[0].getsockname()[:2]
+        return f'http://{host}:{port}/'
+
+    async def __aenter__(self):
+        """Start serving on a free local port."""
+        self.server = await asyncio.start_server(
+            self.handle, '127.0.0.1', 0,
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        """Stop serving."""
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while await self.respond(reader, writer):
+                pass
+        finally:
+            writer.close()
+
+    async def read_chunked(self, reader):
+        body = b''
+        while True:
+            size = int((await reader.readline()).strip(), 16)
+            body += await reader.readexactly(size)
+            await reader.readline()
+            if size == 0:
+                return body
+
+    async def respond(self, reader, writer):
+        request_line = await reader.readline()
+        if not request_line:
+            return False
+
+        method, path, _ = request_line.decode().split(' ', 2)
+
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode().strip()
+            if not line:
+                break
+            name, value = line.split(':', 1)
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get('transfer-encoding') == 'chunked':
+            body = await self.read_chunked(reader)
+        else:
+            length = int(headers.get('content-length', 0))
+            body = await reader.readexactly(length) if length else b''
+
+        content = json.dumps({
+            'method': method,
+            'path': path,
+            'headers': headers,
+            'body': body.decode(),
+        }).encode()
+
+        head = (
+            'HTTP/1.1 200 OK\r\n'
+            'Content-Type: application/json\r\n'
+            f'Content-Length: {len(content)}\r\n\r\n'
+        )
+        writer.write(head.encode() + content)
+        await writer.drain()
+        return True
+
+
+@pytest.fixture()
+def async_stub_server():
+    return AsyncStubServer
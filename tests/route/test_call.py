@@ -52,3 +52,48 @@ def test_trailing_slash_added():
     client = Client('https://foo.com/v1/')
     route = client.add_route('bar', trailing_slash=True)
     assert route.url == 'https://foo.com/v1/bar/'
+
+
+def test_call_returns_view(client):
+    """
+    When a Route is called
+    Then the result refers back to the callable Route
+    And the callable Route is unchanged
+    """
+    route = client.add_route('bar/${barId}')
+
+    result = client.bar(barId=1)
+
+    assert result._origin is route
+    assert result.headers is route.headers
+    assert route.url == 'https://foo.com/v1/bar/${barId}'
+
+
+def test_call_children_are_bound(client):
+    """
+    When a Route is called
+    Then the children of the result are bound with the same arguments
+    """
+    child = client.add_route('bar/${barId}/baz')
+
+    result = client.bar(barId=1).baz
+
+    assert result._origin is child
+    assert result.prev_kwargs == {'barId': 1}
+    assert child.url == 'https://foo.com/v1/bar/${barId}/baz'
+
+
+def test_call_missing_child(client):
+    client.add_route('bar/${barId}')
+
+    with pytest.raises(AttributeError):
+        client.bar(barId=1).baz
+
+
+def test_call_kwargs_immutable(client):
+    client.add_route('bar/${barId}')
+
+    result = client.bar(barId=1)
+
+    with pytest.raises(TypeError):
+        result.prev_kwargs['barId'] = 2
@@ -0,0 +1,268 @@
+import asyncio
+import http.server
+import json
+import os
+import re
+
+from inori import AsyncClient, Client, Route
+from inori.download import (
+    Download, DownloadError, DownloadState, FileWriter, RemoteFile, Segment,
+    parse_content_range, plan_segments,
+)
+
+import pytest
+
+
+CONTENT = bytes(range(256)) * 400
+
+
+class RangeHandler(http.server.BaseHTTPRequestHandler):
+    """Serve CONTENT, honouring Range and If-Range like a file server."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_HEAD(self):  # NOQA N802
+        self.send_response(200)
+        self.send_file_headers(len(self.server.content))
+        self.end_headers()
+
+    def do_GET(self):  # NOQA N802
+        self.server.requests.append(dict(self.headers))
+        content = self.server.content
+
+        requested = self.requested_range() or ''
+        match = re.fullmatch(r'bytes=(\d+)-(\d+)', requested)
+        if match is None:
+            self.send_response(200)
+            self.send_file_headers(len(content))
+            self.end_headers()
+            self.wfile.write(content)
+            return
+
+        start, end = int(match.group(1)), int(match.group(2))
+        self.send_response(206)
+        size = len(content)
+        self.send_header('Content-Range', f'bytes {start}-{end}/{size}')
+        self.send_file_headers(end - start + 1)
+        self.end_headers()
+        self.wfile.write(content[start:end + 1])
+
+    def requested_range(self):
+        if not self.server.ranges:
+            return None
+        if_range = self.headers.get('If-Range')
+        if if_range is not None and if_range != self.server.etag:
+            return None
+        return self.headers.get('Range')
+
+    def send_file_headers(self, length):
+        self.send_header('Content-Length', str(length))
+        self.send_header('ETag', self.server.etag)
+        if self.server.ranges:
+            self.send_header('Accept-Ranges', 'bytes')
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def server(local_server):
+    return local_server(
+        RangeHandler, content=CONTENT, etag='"v1"', ranges=True, requests=[],
+    )
+
+
+@pytest.fixture()
+def client(server):
+    client = Client(server.url)
+    client.add_route('artifact')
+    yield client
+    client._get_session().close()
+
+
+def ranges(server):
+    return sorted(i['Range'] for i in server.requests)
+
+
+def test_segmented(client, server, tmp_path):
+    path = str(tmp_path / 'artifact.bin')
+
+    result = client.artifact.download_to(path, min_segment_size=25000)
+
+    assert result == path
+    assert ranges(server) == [
+        'bytes=0-25599', 'bytes=25600-51199',
+        'bytes=51200-76799', 'bytes=76800-102399',
+    ]
+    assert {i['If-Range'] for i in server.requests} == {'"v1"'}
+    assert {i['Accept-Encoding'] for i in server.requests} == {'identity'}
+    with open(path, 'rb') as f:
+        assert f.read() == CONTENT
+    assert not os.path.exists(path + '.inori-download')
+
+
+def test_resume(client, server, tmp_path):
+    path = tmp_path / 'artifact.bin'
+    path.write_bytes(CONTENT[:1000] + b'\0' * (len(CONTENT) - 1000))
+
+    size = len(CONTENT)
+    state = DownloadState(
+        server.url + 'artifact', size, '"v1"', None,
+        [Segment(0, 50000, done=1000), Segment(50001, size - 1, done=0)],
+    )
+    state.save(str(path) + '.inori-download')
+
+    client.artifact.download_to(str(path))
+
+    assert ranges(server) == ['bytes=1000-50000', f'bytes=50001-{size - 1}']
+    assert path.read_bytes() == CONTENT
+
+
+def test_resume_other_version(client, server, tmp_path):
+    path = tmp_path / 'artifact.bin'
+    path.write_bytes(b'\0' * len(CONTENT))
+
+    state = DownloadState(
+        server.url + 'artifact', len(CONTENT), '"v0"', None,
+        [Segment(0, len(CONTENT) - 1, done=1000)],
+    )
+    state.save(str(path) + '.inori-download')
+
+    client.artifact.download_to(str(path), segments=1)
+
+    assert ranges(server) == [f'bytes=0-{len(CONTENT) - 1}']
+    assert path.read_bytes() == CONTENT
+
+
+def test_changed_during_download(client, server, tmp_path):
+    path = str(tmp_path / 'artifact.bin')
+    remote = RemoteFile({
+        'Content-Length': str(len(CONTENT)),
+        'Accept-Ranges': 'bytes',
+        'ETag': '"v1"',
+    })
+    download = Download(path, server.url, remote, min_segment_size=25000)
+
+    server.etag = '"v2"'
+    with pytest.raises(DownloadError):
+        client.artifact._download_segment(
+            download, download.pending()[0], 1024, {}, {},
+        )
+    download.close(False)
+
+    with open(path + '.inori-download') as f:
+        assert json.load(f)['segments'][0] == [0, 25599, 0]
+
+
+def test_error_keeps_state(client, server, tmp_path):
+    path = str(tmp_path / 'artifact.bin')
+
+    def change(metadata):
+        if metadata['http_method'] == 'GET':
+            server.etag = '"v2"'
+
+    client.hooks['request'].append(change)
+
+    with pytest.raises(DownloadError):
+        client.artifact.download_to(path, min_segment_size=25000)
+
+    assert os.path.exists(path + '.inori-download')
+
+
+def test_no_ranges(client, server, tmp_path):
+    server.ranges = False
+    path = tmp_path / 'artifact.bin'
+
+    client.artifact.download_to(str(path))
+
+    assert [i.get('Range') for i in server.requests] == [None]
+    assert path.read_bytes() == CONTENT
+
+
+def test_async_download(server, tmp_path):
+    pytest.importorskip('httpx')
+    path = str(tmp_path / 'artifact.bin')
+
+    async def main():
+        async with AsyncClient(server.url) as client:
+            client.add_route('artifact')
+            await client.artifact.download_to(path, min_segment_size=40000)
+
+    asyncio.run(main())
+
+    assert len(server.requests) == 2
+    with open(path, 'rb') as f:
+        assert f.read() == CONTENT
+
+
+@pytest.mark.parametrize(
+    'size, segments, expected', [
+        (0, 4, []),
+        (10, 4, [(0, 9)]),
+        (4000, 4, [(0, 999), (1000, 1999), (2000, 2999), (3000, 3999)]),
+        (2500, 4, [(0, 1249), (1250, 2499)]),
+    ],
+)
+def test_plan_segments(size, segments, expected):
+    planned = plan_segments(size, segments, min_segment_size=1000)
+
+    assert [(i.start, i.end) for i in planned] == expected
+
+
+def test_segment():
+    segment = Segment(100, 199, done=40)
+
+    assert segment.size == 100
+    assert segment.range_header() == 'bytes=140-199'
+    assert not segment.complete
+
+
+def test_remote_file_weak_etag():
+    remote = RemoteFile({
+        'Content-Length': '10',
+        'ETag': 'W/"v1"',
+        'Last-Modified': 'Wed, 21 Oct 2015 07:28:00 GMT',
+    })
+
+    assert remote.validator == 'Wed, 21 Oct 2015 07:28:00 GMT'
+    assert not remote.segmentable
+
+
+def test_parse_content_range():
+    assert parse_content_range('bytes 0-99/200') == (0, 99)
+    assert parse_content_range('bytes 0-99/*') == (0, 99)
+    assert parse_content_range('bytes */200') is None
+    assert parse_content_range(None) is None
+
+
+def test_file_writer(tmp_path):
+    path = tmp_path / 'out.bin'
+
+    writer = FileWriter(str(path), 8)
+    writer.write(4, b'efgh')
+    writer.write(0, memoryview(b'abcd'))
+    writer.close()
+
+    assert path.read_bytes() == b'abcdefgh'
+
+
+def test_file_writer_keeps_content(tmp_path):
+    path = tmp_path / 'out.bin'
+    path.write_bytes(b'abcd\0\0\0\0')
+
+    writer = FileWriter(str(path), 8, truncate=False)
+    writer.write(4, b'efgh')
+    writer.close()
+
+    assert path.read_bytes() == b'abcdefgh'
+
+
+def test_download_child(client, server):
+    """
+    When a Route has a download sub-resource
+    Then it is a child Route, not a method
+    """
+    client.add_route('artifact/download')
+
+    assert isinstance(client.artifact.download, Route)
+    assert client.artifact.download.url == f'{server.url}artifact/download'
@@ -0,0 +1,183 @@
+import asyncio
+import json
+import sys
+from unittest import mock
+
+from inori import AsyncClient, Client
+from inori.codec import (
+    JSONCodec, decode_response, fastest_codec, get_codec,
+)
+
+import pytest
+
+import requests
+
+
+class JSONSession:
+    def __init__(self, *args, **kwargs):
+        self.calls = []
+
+    def mount(self, prefix, adapter):
+        pass
+
+    def request(self, http_method, url, headers, **kwargs):
+        self.calls.append((headers, kwargs))
+
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b'{"fruits": ["apple", "\\u00e9"]}'
+        return response
+
+
+@pytest.fixture()
+def client():
+    with mock.patch('requests.Session', JSONSession):
+        client = Client('https://foo.com/v1/')
+        client.add_route('fruits')
+        yield client
+
+
+def test_default_codec():
+    assert get_codec().name == 'json'
+    assert Client('https://foo.com/v1/').settings_.codec.name == 'json'
+
+
+def test_async_default_codec():
+    client = AsyncClient('https://foo.com/v1/')
+
+    assert client.settings_.codec.encode({'a': 'é'}) == '{"a":"é"}'.encode()
+
+
+def test_fastest_codec():
+    pytest.importorskip('orjson')
+
+    assert fastest_codec().name == 'orjson'
+
+
+def test_client_codec_by_name():
+    pytest.importorskip('orjson')
+
+    assert Client(
+        'https://foo.com/v1/', codec='orjson',
+    ).settings_.codec.name == 'orjson'
+
+
+def test_fastest_codec_fallback():
+    with mock.patch.dict(sys.modules, {'orjson': None, 'ujson': None}):
+        assert fastest_codec().name == 'json'
+
+
+def test_unsupported_codec():
+    with pytest.raises(ValueError):
+        get_codec('yaml')
+
+
+def test_missing_codec():
+    with mock.patch.dict(sys.modules, {'ujson': None}):
+        with pytest.raises(ImportError):
+            get_codec('ujson')
+
+
+@pytest.mark.parametrize('name', ['json', 'orjson'])
+def test_codec_round_trip(name):
+    pytest.importorskip(name)
+    codec = get_codec(name)
+
+    encoded = codec.encode({'a': [1, 'é']})
+
+    assert isinstance(encoded, bytes)
+    assert codec.decode(encoded) == {'a': [1, 'é']}
+
+
+def test_get_json(client):
+    assert client.fruits.get_json() == {'fruits': ['apple', 'é']}
+
+
+def test_request_json(client):
+    assert client.fruits.request_json('POST') == {'fruits': ['apple', 'é']}
+
+
+def test_decoded_once():
+    decode = mock.Mock(return_value={'a': 1})
+    codec = JSONCodec('mock', decode, json.dumps)
+    response = requests.Response()
+    response._content = b'{"a": 1}'
+
+    decode_response(response, codec)
+    decode_response(response, codec)
+
+    decode.assert_called_once_with(b'{"a": 1}')
+
+
+def test_client_codec(client):
+    client.settings_.codec = JSONCodec(
+        'custom', lambda data: 'decoded', lambda value: b'encoded',
+    )
+
+    assert client.fruits.get_json() == 'decoded'
+
+    client.fruits.post(json={'a': 1})
+    headers, kwargs = client._get_session().calls[-1]
+    assert kwargs['data'] == b'encoded'
+    assert 'json' not in kwargs
+
+
+def test_json_body_encoded(client):
+    client.fruits.post(json={'a': 1})
+
+    headers, kwargs = client._get_session().calls[-1]
+    assert json.loads(kwargs['data']) == {'a': 1}
+    assert headers['Content-Type'] == 'application/json'
+
+
+def test_json_body_like_requests(client):
+    client.fruits.post(json={1: 'a'})
+
+    headers, kwargs = client._get_session().calls[-1]
+    assert kwargs['data'] == b'{"1": "a"}'
+
+
+def test_json_body_nan(client):
+    with pytest.raises(requests.exceptions.InvalidJSONError):
+        client.fruits.post(json={'n': float('nan')})
+
+
+def test_orjson_non_str_keys():
+    pytest.importorskip('orjson')
+
+    assert get_codec('orjson').encode({1: 'a'}) == b'{"1":"a"}'
+
+
+def test_json_body_keeps_content_type(client):
+    client.fruits.post(
+        json={'a': 1}, headers={'content-type': 'application/vnd+json'},
+    )
+
+    headers, kwargs = client._get_session().calls[-1]
+    assert headers == {'content-type': 'application/vnd+json'}
+
+
+def test_json_body_ignored_with_data(client):
+    client.fruits.post(json={'a': 1}, data='raw')
+
+    headers, kwargs = client._get_session().calls[-1]
+    assert kwargs == {'data': 'raw'}
+    assert headers == {}
+
+
+def test_async_json(async_stub_server):
+    pytest.importorskip('httpx')
+
+    async def main():
+        async with async_stub_server() as server:
+            async with AsyncClient(server.url) as client:
+                client.add_route('fruits')
+                return await client.fruits.request_json(
+                    'POST', json={'name': 'é'},
+                )
+
+    result = asyncio.run(main())
+
+    assert result['method'] == 'POST'
+    assert json.loads(result['body']) == {'name': 'é'}
+    assert result['headers']['content-type'] == 'application/json'
@@ -0,0 +1,156 @@
+import asyncio
+import threading
+import time
+from unittest import mock
+
+from inori import AsyncClient
+
+import pytest
+
+
+class MockSession:
+    """Return the url as the response. Fail for urls ending in 'bad'."""
+
+    def __init__(self, *args, **kwargs):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def mount(self, prefix, adapter):
+        pass
+
+    def request(self, http_method, url, headers, **kwargs):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+        time.sleep(0.01)
+
+        with self.lock:
+            self.in_flight -= 1
+
+        if url.endswith('bad'):
+            raise ConnectionError(url)
+
+        return mock.Mock(url=url, kwargs=kwargs, status_code=200)
+
+
+@mock.patch('requests.Session', MockSession)
+def test_map_ordered(client):
+    client.add_route('items/${itemId}')
+
+    batch = client.items.map('GET', [{'itemId': i} for i in range(20)])
+    results = batch.results()
+
+    assert [r.index for r in results] == list(range(20))
+    urls = [r.response.url for r in results]
+    assert urls == [f'https://foo.com/v1/items/{i}' for i in range(20)]
+    assert batch.stats.total == 20
+    assert batch.stats.throughput > 0
+
+
+@mock.patch('requests.Session', MockSession)
+def test_map_max_concurrency(client):
+    client.add_route('items/${itemId}')
+
+    batch = client.items.map(
+        'GET', [{'itemId': i} for i in range(20)], max_concurrency=3,
+    )
+    batch.results()
+
+    assert 1 < client._get_session().max_in_flight <= 3
+
+
+@mock.patch('requests.Session', MockSession)
+def test_map_as_completed(client):
+    client.add_route('items/${itemId}')
+
+    batch = client.items.map(
+        'GET', [{'itemId': i} for i in range(10)], ordered=False,
+    )
+
+    assert sorted(r.index for r in batch) == list(range(10))
+
+
+@mock.patch('requests.Session', MockSession)
+def test_map_errors_captured(client):
+    """
+    When one request fails
+    Then the other requests are still made
+    And the exception is stored in the Result
+    """
+    client.add_route('items/${itemId}')
+
+    items = [{'itemId': 1}, {'itemId': 'bad'}, {'itemId': 3}]
+    batch = client.items.map('GET', items)
+    results = batch.results()
+
+    assert [r.ok for r in results] == [True, False, True]
+    assert isinstance(results[1].exception, ConnectionError)
+    assert batch.stats.failed == 1
+    assert batch.stats.succeeded == 2
+
+
+@mock.patch('requests.Session', MockSession)
+def test_map_request_kwargs(client):
+    """
+    When an item has keys that are not callables of the Route
+    Then they are sent as request kwargs
+    """
+    client.add_route('items/${itemId}/${subId}')
+
+    items = [{'itemId': 1, 'subId': 2, 'json': {'a': 1}}]
+    result = client.items.map('POST', items).results()[0]
+
+    assert result.response.url == 'https://foo.com/v1/items/1/2'
+    # json= bodies are encoded with the Client's codec.
+    assert result.response.kwargs == {'data': b'{"a": 1}'}
+
+
+@mock.patch('requests.Session', MockSession)
+def test_gather(client):
+    client.add_route('foo')
+    client.add_route('bar')
+
+    results = client.gather([client.foo.get, client.bar.get]).results()
+
+    urls = [r.response.url for r in results]
+    assert urls == ['https://foo.com/v1/foo', 'https://foo.com/v1/bar']
+
+
+def test_async_map(async_stub_server):
+    pytest.importorskip('httpx')
+
+    async def main():
+        async with async_stub_server() as server:
+            async with AsyncClient(server.url) as client:
+                client.add_route('items/${itemId}')
+                batch = client.items.map(
+                    'GET', [{'itemId': i} for i in range(10)],
+                    max_concurrency=4,
+                )
+                results = await batch.results()
+
+        return batch, results
+
+    batch, results = asyncio.run(main())
+
+    paths = [r.response.json()['path'] for r in results]
+    assert paths == [f'/items/{i}' for i in range(10)]
+    assert batch.stats.total == 10
+
+
+def test_async_gather(async_stub_server):
+    pytest.importorskip('httpx')
+
+    async def main():
+        async with async_stub_server() as server:
+            async with AsyncClient(server.url) as client:
+                client.add_route('foo')
+                batch = client.gather([client.foo.get, client.foo.post])
+                return [r async for r in batch]
+
+    results = asyncio.run(main())
+
+    methods = [r.response.json()['method'] for r in results]
+    assert methods == ['GET', 'POST']
@@ -0,0 +1,219 @@
+import asyncio
+import time
+from unittest import mock
+
+from inori import AsyncClient
+from inori.pagination import (
+    Cursor, LinkHeader, OffsetLimit, PageNumber, get_field, prefetch,
+)
+
+import pytest
+
+ITEMS = list(range(25))
+
+
+class FakeResponse:
+    def __init__(self, url, params, data, links=None):
+        self.url = url
+        self.params = params
+        self.data = data
+        self.links = links or {}
+        self.status_code = 200
+        self.headers = {}
+
+    def json(self):
+        return self.data
+
+
+class PagedSession:
+    """Serve ITEMS, 10 at a time, for every pagination style."""
+
+    def __init__(self, *args, **kwargs):
+        self.calls = []
+
+    def mount(self, prefix, adapter):
+        pass
+
+    def request(self, http_method, url, headers, params=None, **kwargs):
+        params = dict(params or {})
+        self.calls.append((url, params))
+
+        if 'offset' in params:
+            start = params['offset']
+            return FakeResponse(url, params, ITEMS[start:start + 10])
+
+        if 'page' in params:
+            start = (params['page'] - 1) * 10
+            return FakeResponse(url, params, ITEMS[start:start + 10])
+
+        start = int(params.get('cursor') or url.partition('start=')[2] or 0)
+        end = start + 10
+        next_value = end if end < len(ITEMS) else None
+        data = {'items': ITEMS[start:end], 'meta': {'next': next_value}}
+
+        links = {}
+        if next_value:
+            links['next'] = {'url': f'https://foo.com/v1/bar?start={end}'}
+
+        return FakeResponse(url, params, data, links)
+
+
+@pytest.fixture()
+def route(client):
+    with mock.patch('requests.Session', PagedSession):
+        yield client.add_route('bar')
+
+
+def test_get_field():
+    assert get_field({'a': {'b': 1}}, 'a.b') == 1
+    assert get_field({'a': 1}, 'a.b') is None
+    assert get_field([1], None) == [1]
+
+
+def test_offset_limit(route):
+    result = list(route.paginate(OffsetLimit(limit=10)))
+
+    assert result == ITEMS
+    offsets = [params['offset'] for _, params in route.session.calls]
+    assert offsets == [0, 10, 20]
+
+
+def test_page_number(route):
+    result = list(route.paginate(PageNumber()))
+
+    assert result == ITEMS
+    pages = [params['page'] for _, params in route.session.calls]
+    assert pages == [1, 2, 3, 4]
+
+
+def test_cursor(route):
+    result = list(route.paginate(Cursor('meta.next')))
+
+    assert result == ITEMS
+    cursors = [params.get('cursor') for _, params in route.session.calls]
+    assert cursors == [None, 10, 20]
+
+
+def test_link_header(route):
+    result = list(route.paginate(LinkHeader(items_field='items')))
+
+    assert result == ITEMS
+    urls = [url for url, _ in route.session.calls]
+    assert urls == [
+        'https://foo.com/v1/bar',
+        'https://foo.com/v1/bar?start=10',
+        'https://foo.com/v1/bar?start=20',
+    ]
+
+
+@pytest.mark.parametrize('link', [
+    'https://foo.com/v1/bar?start=10',
+    '/v1/bar?start=10',
+    'bar?start=10',
+    '?start=10',
+])
+def test_link_header_relative(link):
+    """
+    Given a Link header with a relative next URL
+    Then the next URL is resolved against the URL of the page
+    """
+    response = FakeResponse(
+        'https://foo.com/v1/bar?start=0', {}, {'items': [1]},
+        {'next': {'url': link}},
+    )
+
+    items, kwargs = LinkHeader('items').page(response, {'params': {'a': 1}})
+
+    assert items == [1]
+    assert kwargs == {
+        'params': None, 'url': 'https://foo.com/v1/bar?start=10',
+    }
+
+
+def test_pages(route):
+    pages = list(route.paginate(OffsetLimit(limit=10), pages=True))
+
+    assert [page.number for page in pages] == [0, 1, 2]
+    assert [len(page.items) for page in pages] == [10, 10, 5]
+
+
+def test_prefetch(route):
+    result = list(route.paginate(Cursor('meta.next'), prefetch=2))
+
+    assert result == ITEMS
+
+
+def test_lazy(route):
+    """
+    When only the first items are consumed
+    Then only the first page is requested
+    """
+    iterator = route.paginate(PageNumber())
+    next(iterator)
+
+    assert len(route.session.calls) == 1
+
+
+def test_prefetch_bounded():
+    """
+    Given the consumer is not reading
+    Then no more than size values are fetched ahead
+    """
+    produced = []
+
+    def source():
+        for i in range(100):
+            produced.append(i)
+            yield i
+
+    iterator = prefetch(source(), 3)
+    assert next(iterator) == 0
+
+    # Wait for the producer to fill the buffer.
+    for _ in range(50):
+        if len(produced) >= 5:
+            break
+        time.sleep(0.01)
+
+    assert len(produced) <= 5
+    iterator.close()
+
+
+def test_prefetch_error():
+    def source():
+        yield 1
+        raise ValueError('Broken page')
+
+    iterator = prefetch(source(), 2)
+
+    assert next(iterator) == 1
+    with pytest.raises(ValueError):
+        next(iterator)
+
+
+def test_async_paginate():
+    httpx = pytest.importorskip('httpx')
+
+    def handler(request):
+        page = int(request.url.params['page'])
+        return httpx.Response(200, json=ITEMS[(page - 1) * 10:page * 10])
+
+    async def main():
+        client = AsyncClient('https://foo.com/v1/')
+        client._session = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler),
+        )
+        client.add_route('bar')
+
+        result = [i async for i in client.bar.paginate(PageNumber())]
+        prefetched = [
+            i async for i in client.bar.paginate(PageNumber(), prefetch=2)
+        ]
+        await client.aclose()
+
+        return result, prefetched
+
+    result, prefetched = asyncio.run(main())
+
+    assert result == ITEMS
+    assert prefetched == ITEMS
@@ -0,0 +1,132 @@
+import asyncio
+from unittest import mock
+
+from inori import AsyncClient
+from inori.codec import JSONCodec
+from inori.profiling import NO_PROFILE, PHASES, Profiler
+
+import pytest
+
+
+@mock.patch('requests.Session', mock.Mock())
+def test_phases_in_response_metadata(client):
+    client.settings_.profiler = Profiler()
+    client.add_route('fruits/${fruitId}')
+
+    client.fruits(fruitId=1).get()
+
+    profile = client.metadata_recorder.response_metadata['profile']
+    assert tuple(profile) == PHASES
+    assert all(isinstance(i, int) and i >= 0 for i in profile.values())
+
+
+@mock.patch('requests.Session', mock.Mock())
+def test_decode_phase(client):
+    """
+    When the JSON body of a response is decoded
+    Then the decode phase follows the response hooks
+    """
+    client.settings_.profiler = Profiler()
+    client.settings_.codec = JSONCodec(
+        'custom', lambda data: 'decoded', lambda value: b'encoded',
+    )
+    client.add_route('fruits')
+
+    assert client.fruits.get_json() == 'decoded'
+
+    profile = client.metadata_recorder.response_metadata['profile']
+    assert tuple(profile) == PHASES + ('decode',)
+
+    stats = client.settings_.profiler.stats()['https://foo.com/v1/fruits']
+    assert stats['decode']['count'] == 1
+    assert client.settings_.profiler.sampled == 1
+
+
+@mock.patch('requests.Session', mock.Mock())
+def test_aggregated_per_template(client):
+    client.settings_.profiler = Profiler()
+    client.add_route('fruits/${fruitId}')
+
+    client.fruits(fruitId=1).get()
+    client.fruits(fruitId=2).get()
+
+    stats = client.settings_.profiler.stats()
+    assert list(stats) == ['https://foo.com/v1/fruits/${fruitId}']
+
+    transport = stats['https://foo.com/v1/fruits/${fruitId}']['transport']
+    assert transport['count'] == 2
+    assert transport['max_ns'] <= transport['total_ns']
+    assert client.settings_.profiler.sampled == 2
+
+
+@mock.patch('requests.Session', mock.Mock())
+def test_disabled(client):
+    client.add_route('fruits')
+
+    client.fruits.get()
+
+    assert client.settings_.profiler is None
+    assert 'profile' not in client.metadata_recorder.response_metadata
+
+
+@mock.patch('requests.Session', mock.Mock())
+def test_sampling(client):
+    client.settings_.profiler = Profiler(sample_every=3)
+    client.add_route('fruits')
+
+    profiled = []
+    for _ in range(7):
+        client.fruits.get()
+        metadata = client.metadata_recorder.response_metadata
+        profiled.append('profile' in metadata)
+
+    assert profiled == [True, False, False, True, False, False, True]
+    assert client.settings_.profiler.sampled == 3
+
+
+def test_start_returns_null_profile():
+    profiler = Profiler(sample_every=2)
+
+    assert profiler.start('a') is not NO_PROFILE
+    assert profiler.start('a') is NO_PROFILE
+
+
+def test_invalid_sample_every():
+    with pytest.raises(ValueError):
+        Profiler(sample_every=0)
+
+
+def test_reset():
+    profiler = Profiler()
+    profiler.record('a', {'transport': 10})
+    profiler.reset()
+
+    assert profiler.stats() == {}
+    assert profiler.sampled == 0
+
+
+def test_async(async_stub_server):
+    pytest.importorskip('httpx')
+
+    async def main():
+        async with async_stub_server() as server:
+            async with AsyncClient(server.url) as client:
+                client.add_route('fruits/${fruitId}')
+                client.settings_.profiler = Profiler()
+
+                recorded = []
+
+                async def record(metadata):
+                    recorded.append(metadata['profile'])
+
+                client.hooks['response'].append(record)
+                await client.fruits(fruitId=1).get()
+
+                return recorded, client.settings_.profiler.stats()
+
+    recorded, stats = asyncio.run(main())
+
+    assert tuple(recorded[0]) == PHASES
+    ((route, phases),) = stats.items()
+    assert route.endswith('/fruits/${fruitId}')
+    assert phases['transport']['count'] == 1
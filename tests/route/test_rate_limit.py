@@ -0,0 +1,191 @@
+import asyncio
+from unittest import mock
+
+from inori import AsyncClient
+from inori.ratelimit import RateLimit, parse_reset
+
+import pytest
+
+
+class LimitedSession:
+    def __init__(self, *args, **kwargs):
+        self.headers = {}
+        self.status_code = 200
+
+    def mount(self, prefix, adapter):
+        pass
+
+    def request(self, http_method, url, headers, **kwargs):
+        return mock.Mock(
+            status_code=self.status_code, headers=self.headers, text='',
+        )
+
+
+@pytest.fixture()
+def clock(patch_clock):
+    return patch_clock('inori.ratelimit.time.monotonic')
+
+
+@pytest.fixture()
+def sleep():
+    with mock.patch('requests.Session', LimitedSession):
+        with mock.patch('inori.route.time.sleep') as sleep:
+            yield sleep
+
+
+def test_reserve(clock):
+    limit = RateLimit(10, burst=1)
+
+    assert limit.reserve() == 0
+    assert limit.reserve() == pytest.approx(0.1)
+    assert limit.reserve() == pytest.approx(0.2)
+
+    clock.now += 1
+    assert limit.reserve() == 0
+
+
+def test_stats(clock):
+    limit = RateLimit(2, burst=1)
+    limit.reserve()
+    limit.reserve()
+
+    assert limit.stats() == {
+        'acquired': 2, 'delayed': 1, 'waited': 0.5, 'max_wait': 0.5,
+    }
+
+
+def test_invalid_rate():
+    with pytest.raises(ValueError):
+        RateLimit(0)
+
+
+def test_retry_after(clock):
+    limit = RateLimit(100)
+    limit.update(429, {'Retry-After': '2'})
+
+    assert limit.reserve() == pytest.approx(2)
+
+
+def test_remaining_exhausted(clock):
+    limit = RateLimit(100)
+    limit.update(200, {'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': '5'})
+
+    assert limit.reserve() == pytest.approx(5)
+
+
+def test_remaining_low(clock):
+    """
+    When few requests remain before the limit resets
+    Then they are spread until the reset
+    """
+    limit = RateLimit(100)
+    limit.update(200, {'RateLimit-Remaining': '2', 'RateLimit-Reset': '10'})
+
+    assert limit.current_rate() == pytest.approx(0.2)
+    assert limit.reserve() == 0
+    assert limit.reserve() == pytest.approx(5)
+
+    clock.now += 10
+    assert limit.current_rate() == 100
+
+
+def test_adapt_disabled(clock):
+    limit = RateLimit(100, adapt=False)
+    limit.update(429, {'Retry-After': '2'})
+
+    assert limit.reserve() == 0
+
+
+def test_parse_reset():
+    assert parse_reset('30') == 30
+    assert parse_reset('1') == 1
+    assert parse_reset('1500000000') == 0
+    assert parse_reset('soon') is None
+    assert parse_reset(None) is None
+
+
+def test_route_subtree(client, clock, sleep):
+    """
+    Given a limit on the Client and one on a Route
+    Then the Route's limit applies to the Routes below it
+    And the Client's limit applies to every Route
+    """
+    client.settings_.rate_limit = RateLimit(500)
+    client.add_route('search/${query}/results')
+    client.add_route('items')
+    client.search.settings_.rate_limit = RateLimit(50)
+
+    client.search(query='foo').results.get()
+    client.search.get()
+    client.items.get()
+
+    assert client.search.settings_.rate_limit.acquired == 2
+    assert client.settings_.rate_limit.acquired == 3
+
+
+def test_route_named_rate_limit(client, clock, sleep):
+    """
+    Given a limit on the Client
+    When I add a route named rate_limit, ie: GitHub's /rate_limit
+    Then the route is limited by the Client's limit
+    """
+    limit = client.settings_.rate_limit = RateLimit(1)
+    client.add_route('rate_limit')
+
+    client.rate_limit.get()
+    client.rate_limit.get()
+
+    assert client.settings_.rate_limit is limit
+    assert limit.acquired == 2
+    sleep.assert_called_once_with(pytest.approx(1))
+
+
+def test_route_waits(client, clock, sleep):
+    client.add_route('search').settings_.rate_limit = RateLimit(1)
+
+    client.search.get()
+    client.search.get()
+
+    sleep.assert_called_once_with(pytest.approx(1))
+
+
+def test_route_adapts(client, clock, sleep):
+    """
+    When a response says the limit is exhausted
+    Then the most specific limit is paused
+    """
+    client.settings_.rate_limit = RateLimit(500)
+    client.add_route('search').settings_.rate_limit = RateLimit(50)
+    client._get_session().headers = {
+        'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': '3',
+    }
+
+    client.search.get()
+
+    assert client.search.settings_.rate_limit.reserve() == pytest.approx(3)
+    assert client.settings_.rate_limit.reserve() == 0
+
+
+def test_async_route(clock):
+    httpx = pytest.importorskip('httpx')
+
+    def handler(request):
+        return httpx.Response(
+            200, headers={'Retry-After': '1'},
+        )
+
+    async def main():
+        client = AsyncClient('https://foo.com/v1/')
+        client.settings_.rate_limit = RateLimit(1)
+        client._session = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler),
+        )
+        with mock.patch('inori.async_route.asyncio.sleep') as sleep:
+            await client.add_route('bar').get()
+            await client.bar.get()
+        await client.aclose()
+        return sleep
+
+    sleep = asyncio.run(main())
+
+    sleep.assert_called_once_with(pytest.approx(1))
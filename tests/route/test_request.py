@@ -17,6 +17,9 @@ class MockSession:
     def __init__(self, *args, **kwargs):
         pass
 
+    def mount(self, prefix, adapter):
+        pass
+
     def request(self, http_method, url, headers, **kwargs):
         return MockResponse(
             http_method, url, headers, 200, f'Mock Response: kwargs={kwargs}',
@@ -0,0 +1,254 @@
+import asyncio
+from unittest import mock
+
+from inori import AsyncClient
+from inori.retry import (
+    CircuitBreaker, CircuitOpenError, RetryBudget, RetryPolicy, Retrying,
+    parse_retry_after,
+)
+
+import pytest
+
+import requests
+
+
+class ScriptedSession:
+    """Answer with the status codes or exceptions in `script`, in order."""
+
+    def __init__(self, *args, **kwargs):
+        self.script = []
+        self.calls = 0
+
+    def mount(self, prefix, adapter):
+        pass
+
+    def request(self, http_method, url, headers, **kwargs):
+        self.calls += 1
+        outcome = self.script.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+
+        status_code, headers = outcome if isinstance(outcome, tuple) else (
+            outcome, {},
+        )
+        return mock.Mock(status_code=status_code, headers=headers, text='')
+
+
+@pytest.fixture()
+def session(client):
+    with mock.patch('requests.Session', ScriptedSession):
+        with mock.patch('inori.route.time.sleep') as sleep:
+            client._get_session().sleep = sleep
+            yield client._get_session()
+
+
+def test_retry_status(client, session):
+    client.settings_.retry = RetryPolicy(total=3)
+    session.script = [503, 502, 200]
+    route = client.add_route('bar')
+
+    response = route.get()
+
+    assert response.status_code == 200
+    assert session.calls == 3
+    assert session.sleep.call_count == 2
+
+
+def test_retry_hooks(client, session):
+    """
+    When an attempt is retried
+    Then the response hooks receive the attempt
+    """
+    recorded = []
+    client.hooks['response'].append(lambda m: recorded.append(dict(m)))
+    client.settings_.retry = RetryPolicy(
+        total=1, jitter=False, backoff_factor=1,
+    )
+    session.script = [503, 200]
+    client.add_route('bar').get()
+
+    assert recorded[0]['status_code'] == 503
+    assert recorded[0]['attempt'] == 1
+    assert recorded[0]['retry_in'] == 1
+    assert recorded[1]['status_code'] == 200
+
+
+def test_retry_exhausted(client, session):
+    client.settings_.retry = RetryPolicy(total=2)
+    session.script = [503, 503, 503]
+
+    response = client.add_route('bar').get()
+
+    assert response.status_code == 503
+    assert session.calls == 3
+
+
+def test_retry_not_idempotent(client, session):
+    client.settings_.retry = RetryPolicy(total=3)
+    session.script = [503]
+
+    response = client.add_route('bar').post()
+
+    assert response.status_code == 503
+    assert session.calls == 1
+
+
+def test_retry_exception(client, session):
+    client.settings_.retry = RetryPolicy(total=1)
+    session.script = [requests.ConnectionError(), requests.ConnectionError()]
+
+    with pytest.raises(requests.ConnectionError):
+        client.add_route('bar').get()
+
+    assert session.calls == 2
+
+
+def test_retry_after(client, session):
+    client.settings_.retry = RetryPolicy(total=1)
+    session.script = [(503, {'Retry-After': '2'}), 200]
+
+    client.add_route('bar').get()
+
+    session.sleep.assert_called_once_with(2.0)
+
+
+def test_route_retry_overrides_client(client, session):
+    client.settings_.retry = RetryPolicy(total=0)
+    route = client.add_route('bar/${barId}')
+    route.settings_.retry = RetryPolicy(total=1)
+    session.script = [503, 200]
+
+    response = client.bar(barId=1).get()
+
+    assert response.status_code == 200
+
+
+def test_retry_budget(client, session):
+    """
+    Given the retry budget is exhausted
+    Then failed requests are not retried
+    """
+    client.settings_.retry = RetryPolicy(total=3)
+    client.settings_.retry_budget = RetryBudget(
+        ratio=0, min_per_second=0, max_tokens=1,
+    )
+    session.script = [503, 503, 503]
+
+    response = client.add_route('bar').get()
+
+    assert response.status_code == 503
+    assert session.calls == 2
+    assert client.settings_.retry_budget.exhausted == 1
+
+
+def test_circuit_breaker_opens(client, session):
+    client.settings_.circuit_breaker = CircuitBreaker(failure_threshold=2)
+    session.script = [503, 503]
+    route = client.add_route('bar')
+
+    route.get()
+    route.get()
+
+    with pytest.raises(CircuitOpenError):
+        route.get()
+
+    assert session.calls == 2
+    assert route.settings_.circuit_breaker.state == CircuitBreaker.OPEN
+
+
+def test_circuit_breaker_per_route(client, session):
+    client.settings_.circuit_breaker = CircuitBreaker(failure_threshold=1)
+    session.script = [503, 200]
+
+    client.add_route('bar').get()
+    response = client.add_route('baz').get()
+
+    assert response.status_code == 200
+    assert client.bar.settings_.circuit_breaker is not (
+        client.baz.settings_.circuit_breaker
+    )
+
+
+def test_circuit_breaker_half_open():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+    breaker.before_call()
+    breaker.record(True)
+
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    # One trial request is allowed.
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record(False)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_circuit_breaker_trial_raises(client, session):
+    """A half-open trial raising an error that isn't retried must not
+    leave the circuit stuck half-open.
+    """
+    client.settings_.circuit_breaker = CircuitBreaker(
+        failure_threshold=1, recovery_timeout=0,
+    )
+    session.script = [503, requests.exceptions.ChunkedEncodingError(), 200]
+    route = client.add_route('bar')
+
+    route.get()
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        route.get()
+    response = route.get()
+
+    assert response.status_code == 200
+    assert session.calls == 3
+    assert route.settings_.circuit_breaker.state == CircuitBreaker.CLOSED
+
+
+def test_circuit_breaker_trial_cancelled():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+    breaker.record(True)
+    retrying = Retrying('GET', RetryPolicy(), breaker=breaker)
+
+    retrying.before()
+    retrying.abort(asyncio.CancelledError())
+
+    # The trial is released without counting a failure.
+    assert breaker.failures == 1
+    breaker.before_call()
+
+
+def test_parse_retry_after():
+    assert parse_retry_after('5') == 5.0
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
+    assert parse_retry_after('soon') is None
+    assert parse_retry_after(None) is None
+
+
+def test_backoff():
+    policy = RetryPolicy(backoff_factor=1, max_backoff=3, jitter=False)
+
+    assert [policy.backoff(i) for i in range(4)] == [1, 2, 3, 3]
+
+    policy.jitter = True
+    assert all(0 <= policy.backoff(2) <= 3 for _ in range(20))
+
+
+def test_async_retry():
+    httpx = pytest.importorskip('httpx')
+    statuses = [503, 200]
+
+    def handler(request):
+        return httpx.Response(statuses.pop(0))
+
+    async def main():
+        client = AsyncClient('https://foo.com/v1/')
+        client.settings_.retry = RetryPolicy(total=1, backoff_factor=0)
+        client._session = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler),
+        )
+        response = await client.add_route('bar').get()
+        await client.aclose()
+        return response
+
+    assert asyncio.run(main()).status_code == 200
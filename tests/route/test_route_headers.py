@@ -21,3 +21,79 @@ def test_function_headers(client):
     }
 
     assert client.metadata_recorder.request_metadata == expected
+
+
+@mock.patch('requests.Session', mock.Mock())
+def test_headers_changed_after_request(client):
+    route = client.add_route('bar/${barId}')
+    client.headers['Accept'] = 'text/plain'
+
+    client.bar.get()
+    assert client.metadata_recorder.request_metadata['headers'] == {
+        'Accept': 'text/plain',
+    }
+
+    client.headers['Accept'] = 'application/json'
+    route.headers['X-Route'] = 'bar'
+    client.bar(barId=1).get()
+
+    assert client.metadata_recorder.request_metadata['headers'] == {
+        'Accept': 'application/json',
+        'X-Route': 'bar',
+    }
+
+
+@mock.patch('requests.Session', mock.Mock())
+def test_headers_replaced_after_request(client):
+    client.add_route('bar')
+    client.headers['Accept'] = 'text/plain'
+    client.bar.get()
+
+    client.bar.headers = type(client.headers)({'Accept': 'text/csv'})
+    client.bar.get()
+
+    assert client.metadata_recorder.request_metadata['headers'] == {
+        'Accept': 'text/csv',
+    }
+
+
+@mock.patch('requests.Session', mock.Mock())
+def test_header_precedence(client):
+    route = client.add_route('bar')
+    called = []
+
+    @client.headers('Accept')
+    def client_accept(client, request_metadata):
+        called.append('client')
+        return 'client'
+
+    client.headers['X-Client'] = 'client'
+    route.headers['Accept'] = 'route'
+
+    @route.headers('X-Client')
+    def route_client(route, request_metadata):
+        return 'route'
+
+    client.bar.get(headers={'X-Local': 'local'})
+
+    assert client.metadata_recorder.request_metadata['headers'] == {
+        'Accept': 'route',
+        'X-Client': 'route',
+        'X-Local': 'local',
+    }
+    # Overridden Client header functions are not run.
+    assert called == []
+
+
+@mock.patch('requests.Session', mock.Mock())
+def test_headers_are_not_shared_between_requests(client):
+    client.add_route('bar')
+    client.headers['Accept'] = 'text/plain'
+
+    client.bar.get()
+    client.metadata_recorder.request_metadata['headers']['X-Hook'] = '1'
+    client.bar.get()
+
+    assert client.metadata_recorder.request_metadata['headers'] == {
+        'Accept': 'text/plain',
+    }
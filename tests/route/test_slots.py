@@ -0,0 +1,167 @@
+import warnings
+from unittest import mock
+
+from inori import AsyncRoute, Route
+from inori.retry import RetryPolicy
+
+import pytest
+
+
+def test_no_instance_dict(client):
+    route = client.add_route('bar')
+
+    assert not hasattr(route, '__dict__')
+    assert AsyncRoute.__slots__ == ()
+
+
+def test_shared_empty_containers(client):
+    """
+    Given Routes without callables or children
+    Then they share the same empty mappings
+    """
+    a = client.add_route('bar')
+    b = client.add_route('baz')
+
+    assert a.callables is b.callables
+    assert a.children is b.children
+    assert a.children == {}
+
+
+def test_children_stored_once(client):
+    client.add_route('bar/all-things')
+
+    assert list(client.bar.children) == ['all-things']
+    assert client.bar.all_things is client.bar.children['all-things']
+
+
+def test_children_keyed_by_piece(client):
+    """
+    Given a child whose piece of path is not a Python name
+    Then it is keyed by its piece, and reached by its attribute name
+    And a bound view reaches it too
+    """
+    client.add_route('bar/${barId}/all-things')
+
+    bound = client.bar(barId='1')
+    assert bound.children['all-things'].url == (
+        'https://foo.com/v1/bar/1/all-things'
+    )
+    assert bound.all_things.url == 'https://foo.com/v1/bar/1/all-things'
+
+
+@mock.patch('requests.Session', mock.Mock())
+def test_headers_created_on_use(client):
+    route = client.add_route('bar')
+    route.get()
+
+    assert route._headers is None
+
+    route.headers['Accept'] = 'text/plain'
+    assert route._headers == {'Accept': 'text/plain'}
+
+
+def test_bound_view_reads_template(client):
+    """
+    Given a bound view
+    When the template is changed
+    Then the bound view sees the change
+    """
+    route = client.add_route('bar/${barId}')
+    bound = client.bar(barId=1)
+
+    route.settings_.retry = RetryPolicy(total=1)
+    client.add_route('bar/${barId}/baz')
+
+    assert bound.settings_.retry is route.settings_.retry
+    assert bound.baz.url == 'https://foo.com/v1/bar/1/baz'
+
+
+def test_child_named_like_method(client):
+    """
+    When a piece of path has the name of a Route method
+    Then a warning is issued
+    And the method is not replaced
+    """
+    with pytest.warns(UserWarning, match="children\\['get'\\]"):
+        client.add_route('bar/get')
+
+    assert callable(client.bar.get)
+    assert isinstance(client.bar.children['get'], Route)
+
+
+@pytest.mark.parametrize('name', ['headers', 'children', 'session'])
+def test_child_named_like_attribute(client, name):
+    """
+    When a piece of path has the name of a Route attribute
+    Then a warning is issued
+    And the child is reached with Route.children
+    """
+    with pytest.warns(UserWarning):
+        client.add_route(f'bar/${{barId}}/{name}')
+
+    child = client.bar(barId='1').children[name]
+    assert child.url == f'https://foo.com/v1/bar/1/{name}'
+    assert getattr(client.bar(barId='1'), name) is not child
+
+
+CHILD_FIRST = [
+    'retry',
+    'rate_limit',
+    'use_cache',
+    'template',
+    'parent',
+    'stream',
+    'map',
+    'paginate',
+    'get_json',
+    'request_json',
+    'download_to',
+]
+
+
+@pytest.mark.parametrize('name', CHILD_FIRST)
+def test_child_hides_newer_name(client, name):
+    """
+    When a piece of path has the name of a newer Route method or setting
+    Then no warning is issued
+    And the child is an attribute of its Route
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        client.add_route(f'bar/${{barId}}/{name}')
+
+    child = getattr(client.bar(barId='1'), name)
+    assert isinstance(child, Route)
+    assert child.url == f'https://foo.com/v1/bar/1/{name}'
+
+
+def test_child_hides_method_lazy(client):
+    client.add_routes(['bar/stream'])
+
+    assert client.bar.stream.url == 'https://foo.com/v1/bar/stream'
+    assert callable(client.add_route('baz').stream)
+
+
+@mock.patch('requests.Session', mock.Mock())
+def test_child_hides_method_internal(client, tmp_path):
+    """
+    Given a child named stream
+    When the Route downloads a file
+    Then the Route's own stream() is used
+    """
+    response = client._get_session().request.return_value
+    response.status_code = 200
+    response.headers = {}
+    response.iter_content.return_value = [b'abc']
+    client.add_route('bar/stream')
+
+    client.bar.download_to(tmp_path / 'bar', segments=1)
+
+    assert (tmp_path / 'bar').read_bytes() == b'abc'
+
+
+def test_child_names_no_warning(client):
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        client.add_route('bar/${barId}/items')
+        client.add_routes(['baz/downloads'])
@@ -0,0 +1,72 @@
+import asyncio
+from unittest import mock
+
+from inori import AsyncClient
+from inori.route import STREAMED_BODY
+
+import pytest
+
+
+@mock.patch('requests.Session', mock.Mock())
+def test_stream_request_kwargs(client):
+    """
+    When a Route is streamed
+    Then the request is made with stream=True
+    """
+    route = client.add_route('bar')
+
+    with route.stream('GET') as response:
+        assert response is client._get_session().request.return_value
+
+    _, kwargs = client._get_session().request.call_args
+    assert kwargs['stream'] is True
+
+
+@mock.patch('requests.Session', mock.Mock())
+def test_stream_closes_response(client):
+    route = client.add_route('bar')
+
+    with route.stream('GET') as response:
+        pass
+
+    response.close.assert_called_once()
+
+
+@mock.patch('requests.Session', mock.Mock())
+def test_stream_hooks_skip_body(client):
+    """
+    When a Route is streamed
+    Then response hooks receive the status and headers
+    And the body is not read
+    """
+    route = client.add_route('bar')
+    response = client._get_session().request.return_value
+    type(response).text = mock.PropertyMock(
+        side_effect=AssertionError('Body was read'),
+    )
+
+    with route.stream('GET'):
+        pass
+
+    metadata = client.metadata_recorder.response_metadata
+    assert metadata['text'] == STREAMED_BODY
+    assert metadata['headers'] is response.headers
+    assert metadata['stream'] is True
+
+
+def test_async_stream(async_stub_server):
+    pytest.importorskip('httpx')
+
+    async def main():
+        async with async_stub_server() as server:
+            async with AsyncClient(server.url) as client:
+                client.add_route('bar')
+                async with client.bar.stream('GET') as response:
+                    body = b''.join([c async for c in response.aiter_bytes()])
+
+        return response, body
+
+    response, body = asyncio.run(main())
+
+    assert response.is_closed
+    assert b'"path": "/bar"' in body
@@ -0,0 +1,324 @@
+import asyncio
+import http.server
+import io
+import json
+import mmap
+
+from inori import AsyncClient, Client
+from inori.retry import RetryPolicy
+from inori.upload import (
+    AsyncUploadBody, BodySummary, UploadBody, iter_chunks, prepare_upload,
+    rewinder, summarize,
+)
+
+import pytest
+
+
+class EchoHandler(http.server.BaseHTTPRequestHandler):
+    """Answer with the size, framing and body of the request."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):  # NOQA N802
+        if self.headers.get('Transfer-Encoding') == 'chunked':
+            body = self.read_chunked()
+        else:
+            body = self.rfile.read(int(self.headers['Content-Length']))
+        self.server.bodies.append(body)
+
+        content = json.dumps({
+            'content_length': self.headers.get('Content-Length'),
+            'chunked': self.headers.get('Transfer-Encoding') == 'chunked',
+            'body': body.decode(),
+        }).encode()
+
+        # /flaky fails the first request, so that it is retried.
+        failed = self.path == '/flaky' and len(self.server.bodies) == 1
+        self.send_response(503 if failed else 200)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def read_chunked(self):
+        body = b''
+        while True:
+            size = int(self.rfile.readline().strip(), 16)
+            body += self.rfile.read(size)
+            self.rfile.readline()
+            if size == 0:
+                return body
+
+    do_PUT = do_POST  # NOQA N815
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def server(local_server):
+    return local_server(EchoHandler, bodies=[])
+
+
+@pytest.fixture()
+def client(server):
+    client = Client(server.url)
+    client.add_route('upload')
+    client.add_route('flaky')
+    yield client
+    client._get_session().close()
+
+
+def test_generator(client):
+    def chunks():
+        yield b'abc'
+        yield b'def'
+
+    result = client.upload.post(data=chunks()).json()
+
+    assert result['chunked'] is True
+    assert result['body'] == 'abcdef'
+
+
+def test_file(client, tmp_path):
+    path = tmp_path / 'artifact.bin'
+    path.write_bytes(b'x' * 100000)
+
+    with open(path, 'rb') as f:
+        result = client.upload.post(data=f).json()
+
+    assert result['content_length'] == '100000'
+    assert len(result['body']) == 100000
+
+
+def test_mmap(client, tmp_path):
+    path = tmp_path / 'artifact.bin'
+    path.write_bytes(b'y' * 1000)
+
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as body:
+            result = client.upload.post(data=body).json()
+
+    assert result['content_length'] == '1000'
+    assert result['body'] == 'y' * 1000
+
+
+def test_progress_hooks(client):
+    recorded = []
+    client.hooks['upload'].append(lambda m: recorded.append(dict(m)))
+
+    body = io.BytesIO(b'z' * 150000)
+    result = client.upload.post(data=body).json()
+
+    assert result['content_length'] == '150000'
+    assert [i['sent'] for i in recorded] == [65536, 131072, 150000]
+    assert {i['total'] for i in recorded} == {150000}
+    assert recorded[0]['http_method'] == 'POST'
+
+
+def test_progress_hooks_unknown_size(client):
+    recorded = []
+    client.hooks['upload'].append(lambda m: recorded.append(dict(m)))
+
+    result = client.upload.post(data=iter([b'ab', b'cd'])).json()
+
+    assert result['chunked'] is True
+    progress = [(i['sent'], i['total']) for i in recorded]
+    assert progress == [(2, None), (4, None)]
+
+
+def test_metadata_summary(client):
+    recorded = []
+    client.hooks['request'].append(lambda m: recorded.append(m['data']))
+
+    client.upload.post(data=io.BytesIO(b'a' * 10))
+    client.upload.post(data=b'small')
+    client.upload.post(data={'form': 'field'})
+
+    assert recorded == [
+        BodySummary('BytesIO', 10),
+        b'small',
+        {'form': 'field'},
+    ]
+
+
+def test_summarize():
+    assert summarize(None) is None
+    assert summarize('text') == 'text'
+    assert summarize(b'a' * 70000) == BodySummary('bytes', 70000)
+    assert str(summarize(bytearray(3))) == '<bytearray: 3 bytes>'
+    assert str(summarize(iter([]))) == '<list_iterator: unknown size>'
+
+
+def test_summarize_file(tmp_path):
+    path = tmp_path / 'artifact.bin'
+    path.write_bytes(b'a' * 10)
+
+    with open(path, 'rb') as f:
+        f.read(4)
+        assert summarize(f) == BodySummary('BufferedReader', 6)
+
+
+def test_iter_chunks_does_not_copy():
+    body = bytearray(b'abcdef')
+    chunks = list(iter_chunks(body, chunk_size=4))
+
+    assert [bytes(i) for i in chunks] == [b'abcd', b'ef']
+    assert all(isinstance(i, memoryview) for i in chunks)
+
+
+def test_prepare_upload():
+    body = b'abc'
+    assert prepare_upload(body) is body
+    assert isinstance(prepare_upload(mmap.mmap(-1, 4)), memoryview)
+    assert isinstance(prepare_upload(body, lambda s, t: None), UploadBody)
+    assert prepare_upload({'a': 1}, lambda s, t: None) == {'a': 1}
+
+
+def test_prepare_upload_async_iterator():
+    async def chunks():
+        yield b'a'
+
+    with pytest.raises(TypeError):
+        prepare_upload(chunks())
+
+
+def test_async_upload(async_stub_server):
+    pytest.importorskip('httpx')
+    recorded = []
+
+    async def record(metadata):
+        recorded.append(metadata['sent'])
+
+    async def chunks():
+        yield b'abc'
+        yield b'def'
+
+    async def main():
+        async with async_stub_server() as server:
+            async with AsyncClient(server.url) as client:
+                client.add_route('upload')
+                client.hooks['upload'].append(record)
+
+                first = await client.upload.post(content=chunks())
+                second = await client.upload.post(content=mmap.mmap(-1, 5))
+                return first.json(), second.json()
+
+    streamed, mapped = asyncio.run(main())
+
+    assert streamed['body'] == 'abcdef'
+    assert mapped['body'] == '\x00' * 5
+    assert mapped['headers']['content-length'] == '5'
+    assert recorded == [3, 6, 5]
+
+
+def test_async_upload_body():
+    sent = []
+    body = AsyncUploadBody(b'abcdef', lambda s, t: sent.append((s, t)), 4)
+
+    async def read():
+        return [chunk async for chunk in body]
+
+    assert asyncio.run(read()) == [b'abcd', b'ef']
+    assert sent == [(4, 6), (6, 6)]
+
+
+def test_retry_generator(client, server):
+    """
+    Given a request is retried on 503
+    When the body is a generator
+    Then it is sent once, not resent empty
+    """
+    client.settings_.retry = RetryPolicy(total=2, backoff_factor=0)
+
+    def chunks():
+        yield b'abc'
+        yield b'def'
+
+    response = client.flaky.put(data=chunks(), timeout=5)
+
+    assert response.status_code == 503
+    assert server.bodies == [b'abcdef']
+
+
+@pytest.mark.parametrize('hooked', [False, True])
+def test_retry_file(client, server, hooked):
+    """
+    Given a request is retried on 503
+    When the body is a file
+    Then the retried body matches the original
+    """
+    client.settings_.retry = RetryPolicy(total=2, backoff_factor=0)
+    recorded = []
+    if hooked:
+        client.hooks['upload'].append(lambda m: recorded.append(m['sent']))
+
+    body = io.BytesIO(b'0123456789')
+    body.seek(2)
+
+    response = client.flaky.put(data=body, timeout=5)
+
+    assert response.status_code == 200
+    assert server.bodies == [b'23456789', b'23456789']
+    assert recorded == ([8, 8] if hooked else [])
+
+
+def test_retry_mmap(client, server):
+    client.settings_.retry = RetryPolicy(total=2, backoff_factor=0)
+    client.hooks['upload'].append(lambda m: None)
+
+    with mmap.mmap(-1, 5) as body:
+        body.write(b'abcde')
+        response = client.flaky.put(data=body, timeout=5)
+
+    assert response.status_code == 200
+    assert server.bodies == [b'abcde', b'abcde']
+
+
+def test_rewinder():
+    def chunks():
+        yield b'a'
+
+    body = io.BytesIO(b'abc')
+    body.seek(1)
+    rewind = rewinder(body)
+    body.read()
+    rewind()
+
+    assert body.read() == b'bc'
+    assert rewinder(chunks()) is None
+    assert rewinder(UploadBody(chunks())) is None
+    assert rewinder(b'abc') is not None
+    with pytest.raises(ValueError):
+        UploadBody(chunks()).rewind()
+
+
+def test_async_retry():
+    httpx = pytest.importorskip('httpx')
+    bodies = []
+    statuses = [503, 200, 503]
+
+    async def handler(request):
+        bodies.append(await request.aread())
+        return httpx.Response(statuses.pop(0))
+
+    async def chunks():
+        yield b'abc'
+        yield b'def'
+
+    async def main():
+        client = AsyncClient('https://foo.com/v1/')
+        client.settings_.retry = RetryPolicy(total=2, backoff_factor=0)
+        client._session = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler),
+        )
+        client.add_route('flaky')
+
+        with mmap.mmap(-1, 5) as body:
+            body.write(b'abcde')
+            mapped = await client.flaky.put(content=body)
+        streamed = await client.flaky.put(content=chunks())
+        await client.aclose()
+        return mapped.status_code, streamed.status_code
+
+    assert asyncio.run(main()) == (200, 503)
+    assert bodies == [b'abcde', b'abcde', b'abcdef']
@@ -0,0 +1,291 @@
+import asyncio
+import copy
+import threading
+import time
+
+from inori.utils.headerdict import HeaderDict, MemoizedHeader, MergedHeaders
+
+import pytest
+
+
+@pytest.fixture()
+def clock(patch_clock):
+    return patch_clock('inori.utils.headerdict.time.monotonic')
+
+
+def test_decorator_without_ttl():
+    headers = HeaderDict()
+
+    @headers('Accept')
+    def accept(owner, metadata):
+        return 'application/json'
+
+    assert not isinstance(headers['Accept'], MemoizedHeader)
+
+
+def test_memoized(clock):
+    headers = HeaderDict()
+    calls = []
+
+    @headers('Authorization', ttl=60)
+    def token(owner, metadata):
+        calls.append(1)
+        return f'Bearer {len(calls)}'
+
+    assert headers.run_functions(None, {}) == {'Authorization': 'Bearer 1'}
+    assert headers.run_functions(None, {}) == {'Authorization': 'Bearer 1'}
+    assert len(calls) == 1
+
+    clock.now += 61
+    assert headers.run_functions(None, {}) == {'Authorization': 'Bearer 2'}
+
+
+def test_cache_key(clock):
+    headers = HeaderDict()
+
+    @headers('X-Owner', cache_key=lambda owner, metadata: owner)
+    def owner_header(owner, metadata):
+        return f'{owner}-{time.monotonic()}'
+
+    first = headers.run_functions('a', {})
+    clock.now += 1000
+
+    assert headers.run_functions('a', {}) == first
+    assert headers.run_functions('b', {}) == {'X-Owner': 'b-2000.0'}
+
+
+def test_refresh_in_background(clock):
+    """
+    When a value is close to expiring
+    Then the cached value is returned
+    And a new one is computed in the background
+    """
+    values = iter(['old', 'new'])
+    refreshed = threading.Event()
+
+    def function(owner, metadata):
+        value = next(values)
+        if value == 'new':
+            refreshed.set()
+        return value
+
+    header = MemoizedHeader(function, ttl=10, refresh_at=0.5)
+
+    assert header(None, {}) == 'old'
+    clock.now += 6
+    assert header(None, {}) == 'old'
+
+    assert refreshed.wait(1)
+    for _ in range(100):
+        if header.refreshes:
+            break
+        time.sleep(0.01)
+
+    assert header(None, {}) == 'new'
+    assert header.refreshes == 1
+
+
+def test_refresh_error_keeps_value(clock):
+    calls = []
+
+    def function(owner, metadata):
+        calls.append(1)
+        if len(calls) > 1:
+            raise ValueError()
+        return 'value'
+
+    header = MemoizedHeader(function, ttl=10)
+    header(None, {})
+    clock.now += 9
+
+    assert header(None, {}) == 'value'
+    for _ in range(100):
+        if header.errors:
+            break
+        time.sleep(0.01)
+
+    assert header.errors == 1
+    assert header._entries[None][1] == 'value'
+
+
+def test_single_flight():
+    """
+    When many threads need a value at once
+    Then the function is called once
+    """
+    calls = []
+
+    def slow(owner, metadata):
+        calls.append(1)
+        time.sleep(0.1)
+        return 'value'
+
+    header = MemoizedHeader(slow, ttl=60)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(header(None, {})))
+        for _ in range(5)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == ['value'] * 5
+    assert len(calls) == 1
+
+
+def test_invalidate():
+    header = MemoizedHeader(lambda owner, metadata: object(), ttl=60)
+    first = header(None, {})
+    header.invalidate()
+
+    assert header(None, {}) is not first
+
+
+def test_max_entries(clock):
+    """
+    Given values cached per key
+    When more keys than max_entries are used
+    Then the least recently used value is removed
+    """
+    header = MemoizedHeader(
+        lambda key, metadata: f'{key}-{time.monotonic()}',
+        cache_key=lambda key, metadata: key,
+        max_entries=2,
+    )
+    header('a', {})
+    header('b', {})
+    header('a', {})
+    header('c', {})
+
+    assert list(header._entries) == ['a', 'c']
+    assert header.evictions == 1
+
+
+def test_expired_entries_removed(clock):
+    """
+    Given values cached per key with a TTL
+    When a value is stored after the others expired
+    Then the expired values are removed
+    """
+    header = MemoizedHeader(
+        lambda key, metadata: key, ttl=60,
+        cache_key=lambda key, metadata: key,
+    )
+    for key in range(10):
+        header(key, {})
+
+    clock.now += 61
+    header('new', {})
+
+    assert list(header._entries) == ['new']
+    assert header.evictions == 0
+
+
+def test_async_refresh_task_kept(clock):
+    """
+    When a value is refreshed on the event loop
+    Then the task is kept until it is done
+    """
+    values = iter(['old', 'new'])
+
+    async def token(owner, metadata):
+        return next(values)
+
+    header = MemoizedHeader(token, ttl=60)
+
+    async def main():
+        await header(None, {})
+        clock.now += 50
+        assert await header(None, {}) == 'old'
+        assert len(header._tasks) == 1
+        await asyncio.gather(*header._tasks)
+        await asyncio.sleep(0)
+        return await header(None, {})
+
+    assert asyncio.run(main()) == 'new'
+    assert not header._tasks
+    assert header.refreshes == 1
+
+
+def test_async():
+    headers = HeaderDict()
+    calls = []
+
+    @headers('Authorization', ttl=60)
+    async def token(owner, metadata):
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return 'Bearer abc'
+
+    async def main():
+        return await asyncio.gather(*(
+            headers.run_functions_async(None, {}) for _ in range(5)
+        ))
+
+    results = asyncio.run(main())
+
+    assert results == [{'Authorization': 'Bearer abc'}] * 5
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize(
+    'change',
+    [
+        lambda h: h.__setitem__('b', '2'),
+        lambda h: h.__delitem__('a'),
+        lambda h: h.update(b='2'),
+        lambda h: h.setdefault('b', '2'),
+        lambda h: h.pop('a'),
+        lambda h: h.popitem(),
+        lambda h: h.clear(),
+        lambda h: h('b')(lambda route, metadata: '2'),
+    ],
+)
+def test_version_changes(change):
+    headers = HeaderDict(a='1')
+    version = headers.version
+
+    change(headers)
+
+    assert headers.version != version
+
+
+def test_copies_have_their_own_version():
+    headers = HeaderDict(a='1')
+
+    assert copy.deepcopy(headers).version != headers.version
+    assert copy.copy(headers).version != headers.version
+    assert copy.copy(headers) == headers
+
+
+def test_merged_headers():
+    client_headers = HeaderDict({'Accept': 'a', 'X-Client': 'c'})
+    route_headers = HeaderDict({'Accept': 'b'})
+    route_headers('X-Owner')(lambda route, metadata: route)
+
+    merged = MergedHeaders(client_headers, route_headers)
+
+    assert merged.static == {'X-Client': 'c', 'Accept': 'b'}
+    assert merged.client_functions == ()
+    evaluated = merged.evaluate('client', 'route', {}, {'X-Client': 'l'})
+    assert evaluated == {'Accept': 'b', 'X-Client': 'l', 'X-Owner': 'route'}
+    assert merged.is_current(client_headers, route_headers)
+
+    client_headers['X-New'] = 'n'
+    assert not merged.is_current(client_headers, route_headers)
+
+
+def test_merged_headers_async():
+    client_headers = HeaderDict()
+    route_headers = HeaderDict()
+
+    @client_headers('X-Token')
+    async def token(client, metadata):
+        return f'{client}-token'
+
+    merged = MergedHeaders(client_headers, route_headers)
+    result = asyncio.run(merged.evaluate_async('c', 'r', {}, {}))
+
+    assert result == {'X-Token': 'c-token'}
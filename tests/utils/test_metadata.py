@@ -0,0 +1,38 @@
+from inori.utils.metadata import Metadata
+
+
+def test_metadata_lazy_value():
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return 'Hello'
+
+    metadata = Metadata({'a': 1}, text=loader)
+
+    assert not metadata.is_loaded('text')
+    assert metadata['text'] == 'Hello'
+    assert metadata['text'] == 'Hello'
+    assert calls == [1]
+
+
+def test_metadata_set_replaces_loader():
+    metadata = Metadata(text=lambda: 'Hello')
+    metadata['text'] = 'Bye'
+
+    assert metadata['text'] == 'Bye'
+    assert len(metadata) == 1
+
+
+def test_metadata_equals_dict():
+    metadata = Metadata({'a': 1}, b=lambda: 2)
+
+    assert metadata == {'a': 1, 'b': 2}
+
+
+def test_metadata_delete():
+    metadata = Metadata({'a': 1}, b=lambda: 2)
+    del metadata['a']
+    del metadata['b']
+
+    assert len(metadata) == 0
@@ -0,0 +1,170 @@
+import asyncio
+import threading
+import time
+from unittest import mock
+
+from inori import AsyncClient
+from inori.utils.singleflight import SingleFlight
+
+import pytest
+
+
+def run_threads(count, target):
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(target()))
+        for _ in range(count)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def test_do_coalesces():
+    flight = SingleFlight()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.1)
+        return 'result'
+
+    results = run_threads(5, lambda: flight.do('key', slow))
+
+    assert results == ['result'] * 5
+    assert calls == [1]
+    assert flight.stats() == {'calls': 1, 'coalesced': 4}
+
+
+def test_do_sequential_not_coalesced():
+    flight = SingleFlight()
+
+    flight.do('key', lambda: 1)
+    flight.do('key', lambda: 2)
+
+    assert flight.calls == 2
+    assert flight.coalesced == 0
+
+
+def test_do_error_shared():
+    flight = SingleFlight()
+
+    def broken():
+        time.sleep(0.1)
+        raise ValueError('Broken')
+
+    def call():
+        try:
+            flight.do('key', broken)
+        except ValueError as e:
+            return e
+
+    results = run_threads(3, call)
+
+    assert all(isinstance(r, ValueError) for r in results)
+    assert flight.calls == 1
+
+
+def test_do_async_coalesces():
+    flight = SingleFlight()
+    calls = []
+
+    async def slow():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return 'result'
+
+    async def main():
+        return await asyncio.gather(
+            *(flight.do_async('key', slow) for _ in range(5)),
+        )
+
+    assert asyncio.run(main()) == ['result'] * 5
+    assert calls == [1]
+    assert flight.coalesced == 4
+
+
+def test_key_headers():
+    flight = SingleFlight(headers=['Accept'])
+
+    a = flight.key('GET', 'https://foo.com/', {'Accept': 'a', 'X-Id': '1'})
+    b = flight.key('GET', 'https://foo.com/', {'Accept': 'a', 'X-Id': '2'})
+    c = flight.key('GET', 'https://foo.com/', {'Accept': 'b'})
+
+    assert a == b
+    assert a != c
+
+
+def test_accepts():
+    flight = SingleFlight()
+
+    assert flight.accepts('GET', {})
+    assert not flight.accepts('POST', {})
+    assert not flight.accepts('GET', {'stream': True})
+
+
+@pytest.mark.parametrize('key', ['data', 'json', 'content', 'files'])
+def test_accepts_body(key):
+    assert not SingleFlight().accepts('GET', {key: {'q': 1}})
+
+
+def test_async_route_bodies_not_shared():
+    """
+    Given two concurrent GET requests with different json bodies
+    Then they are not coalesced
+    """
+    httpx = pytest.importorskip('httpx')
+
+    async def handler(request):
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, content=await request.aread())
+
+    async def main():
+        client = AsyncClient('https://foo.com/v1/')
+        client.settings_.single_flight = SingleFlight()
+        client._session = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler),
+        )
+        client.add_route('search')
+
+        responses = await asyncio.gather(
+            client.search.get(json={'q': 1}),
+            client.search.get(json={'q': 2}),
+        )
+        await client.aclose()
+        return [r.json() for r in responses], client.settings_.single_flight
+
+    results, flight = asyncio.run(main())
+
+    assert results == [{'q': 1}, {'q': 2}]
+    assert flight.stats() == {'calls': 0, 'coalesced': 0}
+
+
+class SlowSession:
+    def __init__(self, *args, **kwargs):
+        self.calls = 0
+
+    def mount(self, prefix, adapter):
+        pass
+
+    def request(self, http_method, url, headers, **kwargs):
+        self.calls += 1
+        time.sleep(0.1)
+        return mock.Mock(status_code=200, url=url)
+
+
+@pytest.mark.parametrize('method, expected', [('get', 1), ('post', 5)])
+def test_route_single_flight(client, method, expected):
+    with mock.patch('requests.Session', SlowSession):
+        client.settings_.single_flight = SingleFlight()
+        client.add_route('config/${env}')
+
+        def call():
+            return getattr(client.config(env='prod'), method)()
+
+        results = run_threads(5, call)
+
+    assert client._get_session().calls == expected
+    assert len({id(r) for r in results}) == expected
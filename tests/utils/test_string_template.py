@@ -1,3 +1,5 @@
+import string
+
 from inori.utils.string_template import StringTemplate
 
 
@@ -32,3 +34,39 @@ def test_string_template_formatted_then_str():
     s.format(hello='Hello')
 
     assert 'Hello ${world}' == str(s)
+
+
+def test_string_template_partial_immutable():
+    s = StringTemplate('${hello} ${world}')
+    result = s.partial(hello='Hello')
+
+    assert 'Hello ${world}' == result
+    assert '${hello} ${world}' == s
+
+
+def test_string_template_render():
+    s = StringTemplate('${hello} ${world}')
+
+    assert 'Hello World' == s.render(hello='Hello', world='World')
+    assert '${hello} ${world}' == s
+
+
+def test_string_template_repeated_placeholder():
+    s = StringTemplate('${a}/${b}/${a}')
+
+    assert '1/${b}/1' == s.partial(a=1)
+
+
+def test_string_template_placeholders():
+    s = StringTemplate('${hello} $world')
+
+    assert ('hello', 'world') == s.placeholders
+    assert ('world',) == s.partial(hello='Hello').placeholders
+
+
+def test_string_template_matches_safe_substitute():
+    """Compiled templates render the same as string.Template."""
+    text = 'a/$$/${x}/$y/$/${z'
+    expected = string.Template(text).safe_substitute(x='1', y='2')
+
+    assert expected == StringTemplate(text).render(x='1', y='2')